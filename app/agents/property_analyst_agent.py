@@ -3,13 +3,7 @@ from agno.agent import Agent
 from agno.skills import Skills, LocalSkills, SkillValidationError
 from agno.tools.calculator import CalculatorTools
 
-from app.tools.property_analyst_tools import (
-    generate_property_image,
-    generate_biomass_image,
-    generate_soil_texture_image,
-    get_pasture_stats,
-    get_topographic_stats
-    )
+from app.tools.property_analyst_tools import property_analyst_toolkit
 from app.utils.interfaces.property_record import RuralProperty
 from app.configs.models import model
 
@@ -38,6 +32,7 @@ def get_instructions(run_context: RunContext):
                 
         <instructions>
         - Sempre informe o ano de referência das análise. Use 2024 como ano de referência para os dados mais atualizados.
+        - Para comparar a pastagem entre anos, use `get_pasture_time_series` uma única vez com todos os anos, em vez de chamar `get_pasture_stats` para cada ano.
         - Seja o mais conciso possível, explicando os resultados de forma simples para o pequeno produtore rural.
         - Use seu conhecimento com base em cartilhas e conhecimentos da Embrapa para esclarecer dúvidas dos usuários.
         - Gere imagens apenas quando explicitamente pedido pelo usuário.
@@ -79,11 +74,7 @@ property_analyst_agent = Agent(
     debug_mode=True,
     tools=[
         CalculatorTools(exclude_tools=["is_prime", "factorial"]),
-        get_pasture_stats,
-        get_topographic_stats,
-        generate_property_image,
-        generate_biomass_image,
-        generate_soil_texture_image
+        property_analyst_toolkit
     ],
     skills=skills,
     use_instruction_tags=False,
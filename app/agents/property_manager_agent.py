@@ -10,6 +10,7 @@ from app.tools.property_crud_tools import (
     register_feature_by_url,
     register_feature_by_car,
     register_feature_by_coordinate,
+    register_features_in_bulk,
     select_car_from_list,
     confirm_car_selection,
     reject_car_selection
@@ -77,6 +78,7 @@ def get_instructions(run_context: RunContext):
             - É proibido invocar as ferramentas `confirm_car_selection`, `select_car_from_list` e `reject_car_selection`. Nunca tente usá-las sob nenhuma hipótese.
             - Não use `register_feature_by_coordinate` caso o código CAR/SICAR já estiver registrado.
             - Se o código CAR/SICAR não estiver registrado, utilize `register_feature_by_coordinate` para registra-lo.
+            - Se o usuário enviar vários imóveis de uma vez (lista de CARs, de coordenadas ou arquivo CSV), utilize `register_features_in_bulk`.
             <instructions>
                                        
             <workflow>
@@ -109,6 +111,7 @@ property_manager_agent = Agent(
         register_feature_by_url,
         register_feature_by_car,
         register_feature_by_coordinate,
+        register_features_in_bulk,
         confirm_car_selection,
         select_car_from_list,
         reject_car_selection
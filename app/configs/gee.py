@@ -0,0 +1,44 @@
+import os
+
+from pathlib import Path
+
+# Tempo (em segundos) até os metadados dos assets do GEE (bandas, anos e versões) serem consultados novamente
+GEE_METADATA_TTL = float(os.environ.get('GEE_METADATA_TTL', 86400))
+
+# Quantidade de miniaturas geradas e baixadas em paralelo por `retrieve_feature_images`
+GEE_THUMBNAIL_WORKERS = int(os.environ.get('GEE_THUMBNAIL_WORKERS', 4))
+
+# Pool dedicado às análises do GEE nas ferramentas assíncronas (limita as análises simultâneas)
+GEE_WORKERS = int(os.environ.get('GEE_WORKERS', 4))
+
+# Tempo máximo (em segundos) de uma análise do GEE nas ferramentas assíncronas
+GEE_TIMEOUT = float(os.environ.get('GEE_TIMEOUT', 120))
+
+# Cache em disco dos mapas renderizados (PNG): diretório e tamanho máximo em MB
+GEE_IMAGE_CACHE_PATH = Path(os.environ.get('GEE_IMAGE_CACHE_PATH', Path.cwd() / 'tmp' / 'image-cache'))
+GEE_IMAGE_CACHE_SIZE = int(os.environ.get('GEE_IMAGE_CACHE_SIZE', 512))
+
+# Mosaicos Sentinel-2 exportados: lado (em graus) das células da grade e a ImageCollection de destino
+# (`sentinel_composite_scripts export`). Sem o asset, a mediana é calculada sobre as cenas do imóvel.
+GEE_SENTINEL_TILE_SIZE = float(os.environ.get('GEE_SENTINEL_TILE_SIZE', 1.0))
+GEE_SENTINEL_COMPOSITE_ASSET = os.environ.get('GEE_SENTINEL_COMPOSITE_ASSET') or None
+
+# Cota de requisições da conta de serviço do GEE (getInfo, getThumbURL, downloads) compartilhada
+# entre todos os usuários: fichas por segundo, rajada máxima e folga reservada às requisições interativas
+GEE_REQUESTS_PER_SECOND = float(os.environ.get('GEE_REQUESTS_PER_SECOND', 10))
+GEE_REQUEST_BURST = int(os.environ.get('GEE_REQUEST_BURST', 20))
+GEE_INTERACTIVE_RESERVE = float(os.environ.get('GEE_INTERACTIVE_RESERVE', 5))
+
+# Novas tentativas para erros transitórios do GEE (429, 5xx, tempo esgotado): tentativas e esperas (s)
+GEE_RETRY_ATTEMPTS = int(os.environ.get('GEE_RETRY_ATTEMPTS', 3))
+GEE_RETRY_BASE_DELAY = float(os.environ.get('GEE_RETRY_BASE_DELAY', 0.5))
+GEE_RETRY_MAX_DELAY = float(os.environ.get('GEE_RETRY_MAX_DELAY', 8))
+
+# Disjuntor do GEE: chamadas consecutivas com falha (após todas as tentativas) que interrompem as chamadas e tempo (s) até a chamada de teste
+GEE_BREAKER_THRESHOLD = int(os.environ.get('GEE_BREAKER_THRESHOLD', 5))
+GEE_BREAKER_RESET = float(os.environ.get('GEE_BREAKER_RESET', 30))
+
+# Backend das estatísticas de pastagem e topografia: 'gee' (padrão) ou 'local' (cópias COG dos
+# rasters do MapBiomas e do DEM no diretório abaixo, ver `raster_stats_scripts`)
+GEE_STATS_BACKEND = os.environ.get('GEE_STATS_BACKEND', 'gee').lower()
+GEE_LOCAL_RASTER_PATH = Path(os.environ.get('GEE_LOCAL_RASTER_PATH', Path.cwd() / 'data' / 'rasters'))
@@ -0,0 +1,59 @@
+import os
+
+from pathlib import Path
+
+# Diretório do dataset GeoParquet do CAR: o mesmo `--dataset` da ingestão (`sicar_dataset_scripts ingest`),
+# que grava as partições `uf=<UF>/cod_municipio=<IBGE>/`. Datasets sem partições (ex: `<UF>/*.parquet`)
+# continuam aceitos, mas as consultas por código CAR passam a ler o dataset inteiro.
+SICAR_DATASET_PATH = Path(os.environ.get('SICAR_DATASET_PATH', Path.cwd() / 'data' / 'car-br-dataset'))
+
+# Banco DuckDB persistente com a tabela indexada do CAR (gerado por `sicar_dataset_scripts build-database`)
+SICAR_DATABASE_PATH = Path(os.environ.get('SICAR_DATABASE_PATH', Path.cwd() / 'data' / 'car-br.duckdb'))
+
+SICAR_TABLE_NAME = 'car_properties'
+
+# Arquivo Arrow (IPC) com as geometrias em WKB, memory-mapped pelo backend STRtree
+SICAR_ARROW_PATH = Path(os.environ.get('SICAR_ARROW_PATH', Path.cwd() / 'data' / 'car-br.arrow'))
+
+# Backend das consultas por coordenada: 'duckdb' (padrão) ou 'strtree'
+SICAR_BACKEND = os.environ.get('SICAR_BACKEND', 'duckdb').lower()
+
+# Índice de grade (célula -> arquivos/row groups) para consultas por coordenada sem o banco indexado
+SICAR_GRID_INDEX_PATH = Path(os.environ.get('SICAR_GRID_INDEX_PATH', Path.cwd() / 'data' / 'car-br-grid.json'))
+SICAR_GRID_CELL_SIZE = float(os.environ.get('SICAR_GRID_CELL_SIZE', 0.1))
+
+# Quantidade de cursores dedicados às consultas do CAR e de threads de cada consulta no DuckDB (limita a concorrência)
+SICAR_THREADS = int(os.environ.get('SICAR_THREADS', 4))
+
+# Cache em memória das consultas por código CAR e por coordenada (quantidade de entradas e TTL em segundos)
+SICAR_CACHE_SIZE = int(os.environ.get('SICAR_CACHE_SIZE', 1024))
+SICAR_CACHE_TTL = float(os.environ.get('SICAR_CACHE_TTL', 3600))
+
+# Intervalo (em segundos) entre as verificações de um novo build do dataset (banco, Arrow, grade ou partições).
+# Ao detectar a mudança, o cache é esvaziado e o banco e os índices em memória são reabertos.
+SICAR_RELOAD_INTERVAL = float(os.environ.get('SICAR_RELOAD_INTERVAL', 30))
+
+# Quantidade máxima de itens (códigos CAR + coordenadas) aceitos por cadastro em lote
+SICAR_BULK_LIMIT = int(os.environ.get('SICAR_BULK_LIMIT', 200))
+
+# Tolerância (em metros) das geometrias simplificadas pré-calculadas no build do dataset
+SICAR_THUMBNAIL_TOLERANCE = float(os.environ.get('SICAR_THUMBNAIL_TOLERANCE', 20))
+SICAR_ANALYSIS_TOLERANCE = float(os.environ.get('SICAR_ANALYSIS_TOLERANCE', 5))
+
+# Comprimento de um grau de latitude. Um grau de longitude nunca é maior, então a
+# tolerância convertida por este valor limita o desvio em qualquer direção.
+METERS_PER_DEGREE = 111_320
+
+# Linhas por row group nos GeoParquet gerados pela ingestão (menor = bbox dos row groups mais justo)
+SICAR_ROW_GROUP_SIZE = int(os.environ.get('SICAR_ROW_GROUP_SIZE', 10_000))
+
+# Diretório local com a extensão spatial do DuckDB pré-instalada (ambientes sem internet).
+# Sem valor, usa o diretório padrão do DuckDB (~/.duckdb/extensions).
+SICAR_EXTENSION_DIRECTORY = os.environ.get('SICAR_EXTENSION_DIRECTORY') or None
+
+# Permite baixar a extensão spatial quando ela não estiver disponível localmente
+SICAR_EXTENSION_AUTOINSTALL = os.environ.get('SICAR_EXTENSION_AUTOINSTALL', 'true').lower() == 'true'
+
+# Busca dos imóveis mais próximos quando o ponto não cai em nenhum polígono (raio em metros)
+SICAR_NEAREST_RADIUS = float(os.environ.get('SICAR_NEAREST_RADIUS', 500))
+SICAR_NEAREST_LIMIT = int(os.environ.get('SICAR_NEAREST_LIMIT', 3))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text
+from sqlalchemy import Column, Integer, String, Text
 
 from app.database.session import Base
 
@@ -18,4 +18,14 @@ class AnalysisFeedback(Base):
     id = Column(Integer, primary_key=True, index=True)
     timestamp = Column(Text)
     original_question = Column(Text)
-    desired_analysis = Column(Text)
\ No newline at end of file
+    desired_analysis = Column(Text)
+
+class AnalysisResultCache(Base):
+    __tablename__ = 'analysis_result_cache'
+
+    geometry_hash = Column(String(64), primary_key=True)
+    product = Column(String(32), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    asset_version = Column(String(128), primary_key=True)
+    timestamp = Column(Text)
+    result = Column(Text)
@@ -0,0 +1,173 @@
+import time
+import queue
+import duckdb
+import threading
+
+from contextlib import contextmanager
+
+from agno.utils.log import log_info, log_warning
+
+from app.configs.sicar import (
+    SICAR_DATASET_PATH,
+    SICAR_DATABASE_PATH,
+    SICAR_TABLE_NAME,
+    SICAR_THREADS,
+    SICAR_EXTENSION_DIRECTORY,
+    SICAR_EXTENSION_AUTOINSTALL
+    )
+
+
+# Reavaliado a cada (re)abertura da conexão (ver `reset_sicar_connection`); leia-o como `sicar_session.USE_INDEXED_DATABASE`.
+USE_INDEXED_DATABASE = SICAR_DATABASE_PATH.exists()
+
+# Tempos (em ms) de cada etapa da inicialização, preenchidos no primeiro uso do banco
+startup_report: dict = {}
+
+_conn = None
+_conn_lock = threading.Lock()
+
+# Cada cursor é uma conexão própria sobre o mesmo banco. O pool limita quantas consultas
+# rodam ao mesmo tempo e evita recriar conexões a cada busca.
+_cursor_pool: queue.Queue = queue.Queue()
+
+
+def load_spatial_extension(conn: duckdb.DuckDBPyConnection) -> str:
+    """
+    Carrega a extensão spatial do DuckDB, priorizando a cópia local.
+
+    O download só é tentado quando a extensão não está no diretório local e
+    `SICAR_EXTENSION_AUTOINSTALL` está habilitado.
+
+    Args:
+        conn (duckdb.DuckDBPyConnection): Conexão onde a extensão será carregada.
+
+    Returns:
+        str: Origem da extensão ('local' ou 'download').
+    """
+    if SICAR_EXTENSION_DIRECTORY:
+        conn.execute(f"SET extension_directory = '{SICAR_EXTENSION_DIRECTORY.replace("'", "''")}'")
+
+    try:
+        conn.execute("LOAD spatial;")
+        return 'local'
+    except duckdb.Error as error:
+        if not SICAR_EXTENSION_AUTOINSTALL:
+            raise RuntimeError(
+                "Extensão spatial do DuckDB não encontrada localmente e o download está desabilitado. "
+                "Execute `python -m app.utils.scripts.sicar_dataset_scripts install-extension` ou configure SICAR_EXTENSION_DIRECTORY."
+            ) from error
+
+    conn.execute("INSTALL spatial; LOAD spatial;")
+    return 'download'
+
+
+def get_sicar_connection() -> duckdb.DuckDBPyConnection:
+    """
+    Retorna a conexão do CAR, inicializando-a no primeiro uso.
+
+    A abertura do banco e o carregamento da extensão spatial ficam fora do import, para que
+    os módulos de ferramentas carreguem rápido e sem acesso à rede.
+    """
+    global _conn, _cursor_pool
+
+    if _conn is not None:
+        return _conn
+
+    with _conn_lock:
+        if _conn is not None:
+            return _conn
+
+        start = time.perf_counter()
+
+        if USE_INDEXED_DATABASE:
+            conn = duckdb.connect(database=str(SICAR_DATABASE_PATH), read_only=True)
+        else:
+            conn = duckdb.connect(database=':memory:')
+
+        startup_report['connect_ms'] = (time.perf_counter() - start) * 1000
+
+        extension_start = time.perf_counter()
+        startup_report['extension_source'] = load_spatial_extension(conn)
+        startup_report['extension_ms'] = (time.perf_counter() - extension_start) * 1000
+
+        conn.execute("PRAGMA memory_limit='1GB'")
+        conn.execute(f"PRAGMA threads={SICAR_THREADS}")
+
+        if not USE_INDEXED_DATABASE:
+            # Sem o banco indexado, expõe os arquivos Parquet sob o mesmo nome de tabela (varredura completa).
+            log_warning(f"Banco do CAR não encontrado em {SICAR_DATABASE_PATH}. Execute `python -m app.utils.scripts.sicar_dataset_scripts build-database`.")
+
+            try:
+                dataset_glob = str(SICAR_DATASET_PATH / '**' / '*.parquet').replace("'", "''")
+                conn.execute(f"CREATE VIEW {SICAR_TABLE_NAME} AS SELECT * FROM read_parquet('{dataset_glob}')")
+            except duckdb.Error as e:
+                log_warning(f"Dataset do CAR indisponível em {SICAR_DATASET_PATH}: {e}")
+
+        cursor_pool = queue.Queue()
+
+        for _ in range(SICAR_THREADS):
+            cursor_pool.put(conn.cursor())
+
+        _cursor_pool = cursor_pool
+
+        startup_report['total_ms'] = (time.perf_counter() - start) * 1000
+
+        log_info(
+            f"Banco do CAR inicializado em {startup_report['total_ms']:.0f} ms "
+            f"(extensão spatial {startup_report['extension_source']}: {startup_report['extension_ms']:.0f} ms)."
+        )
+
+        _conn = conn
+
+    return _conn
+
+
+def reset_sicar_connection():
+    """
+    Fecha a conexão atual para que a próxima consulta reabra o banco (ex: após um novo build).
+
+    Aguarda as consultas em andamento devolverem seus cursores e fecha todos eles: o DuckDB
+    reaproveita a instância aberta de um mesmo arquivo, então o banco novo só é lido depois que
+    nenhuma conexão antiga restar. Sem o banco indexado, a view sobre os arquivos Parquet é
+    recriada na reabertura e passa a enxergar os arquivos atuais.
+    """
+    global _conn, USE_INDEXED_DATABASE
+
+    with _conn_lock:
+        if _conn is not None:
+            old_conn, old_pool = _conn, _cursor_pool
+            _conn = None
+
+            for _ in range(SICAR_THREADS):
+                old_pool.get().close()
+
+            # Quem ainda aguardava um cursor do pool antigo recebe `None` e tenta de novo na conexão nova
+            old_pool.put(None)
+            old_conn.close()
+
+        USE_INDEXED_DATABASE = SICAR_DATABASE_PATH.exists()
+
+
+@contextmanager
+def sicar_cursor():
+    """
+    Empresta um cursor do pool, bloqueando enquanto todos estiverem em uso.
+
+    O resultado da consulta deve ser consumido dentro do bloco `with`.
+    """
+    while True:
+        get_sicar_connection()
+
+        # O cursor volta ao pool de onde saiu, mesmo que a conexão seja reaberta durante a consulta
+        cursor_pool = _cursor_pool
+
+        if (cursor := cursor_pool.get()) is not None:
+            break
+
+        cursor_pool.put(None)
+
+    try:
+        yield cursor
+    finally:
+        cursor_pool.put(cursor)
+
@@ -21,6 +21,21 @@ def validate_selected_property_hook(run_context: RunContext, function_call: Call
     )
 
 
+async def avalidate_selected_property_hook(run_context: RunContext, function_call: Callable, arguments: Dict[str, Any]) -> Any:
+    """
+    Versão assíncrona de `validate_selected_property_hook`, para ferramentas assíncronas.
+    """
+    session_state = run_context.session_state
+
+    if session_state and 'registered_properties' in session_state:
+        return await function_call(**arguments)
+
+    return (
+        "Não foi possível completar a análise, pois não há uma propriedade selecionada.\n"
+        "Peça desculpas ao usuário. Peça que o usuário informe uma propriedade."
+    )
+
+
 def validate_rate_limit_hook(run_context: Any, function_call: Callable, arguments: Dict[str, Any]) -> Any:
     """
     Hook universal para evitar que análises e mídias pesadas sejam reprocessadas
@@ -4,6 +4,8 @@ from agno.os import AgentOS
 
 from app.interfaces.whatsapp import Whatsapp
 from app.agents.main_team import pasto_legal_team
+from app.utils.scripts.gee_scripts import asset_metadata
+from app.utils.scripts.sicar_scripts import prefetch_sicar_indexes
 
 interfaces = [Whatsapp(team=pasto_legal_team)]
 
@@ -14,5 +16,11 @@ pasto_legal_os = AgentOS(
 
 app = pasto_legal_os.get_app()
 
+# Carrega em segundo plano os metadados dos assets do GEE (bandas e anos) usados pelas ferramentas de análise
+asset_metadata.prefetch()
+
+# Constrói em segundo plano os índices em memória do CAR (árvore STRtree, se for o backend configurado)
+prefetch_sicar_indexes()
+
 if __name__ == "__main__":
     pasto_legal_os.serve(app="main:app", port=3000, reload=True) 
\ No newline at end of file
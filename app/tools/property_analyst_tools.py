@@ -1,19 +1,33 @@
-from io import BytesIO
+from functools import wraps
 
-from agno.tools import tool
-from agno.tools.function import ToolResult
+from agno.tools import Toolkit, tool
+from agno.tools.function import Function, ToolResult
 from agno.run import RunContext
 from agno.media import Image
+from agno.utils.log import log_error
 
-from app.hooks.tool_hooks import validate_selected_property_hook
+from app.hooks.tool_hooks import validate_selected_property_hook, avalidate_selected_property_hook
 from app.utils.scripts.gee_scripts import (
     retrieve_feature_images,
     retrieve_feature_biomass_image,
     retrieve_feature_soil_texture_image,
     query_pasture_statistics,
+    query_pasture_time_series,
     query_topographic_stats,
+    select_coords,
+    sentinel_period,
+    retrieve_cached_png,
+    asset_metadata,
+    stats_asset_version,
+    run_in_gee_executor,
+    IMAGE_ACCURACY_BUDGET,
+    STATISTICS_ACCURACY_BUDGET,
+    FEATURE_IMAGE_DIMENSIONS,
+    BIOMASS_IMAGE_DIMENSIONS,
+    SOIL_IMAGE_DIMENSIONS
     )
-from app.utils.interfaces.property_stats import PastureStats, TopographicStats 
+from app.utils.scripts.result_cache_scripts import cached_analysis, cached_yearly_analysis, stale_notice
+from app.utils.interfaces.property_stats import PastureStats, PastureTimeSeries, TopographicStats 
 from app.utils.interfaces.property_record import RuralProperty
 
 
@@ -36,14 +50,15 @@ def generate_property_image(run_context: RunContext, car_codes: list[str]) -> To
         selected_property = next((prop for prop in registered_properties if prop["car_code"] == ','.join(car_codes)), None)
         selected_property = RuralProperty.model_validate(selected_property)
 
-        img = retrieve_feature_images(coords=selected_property.get_coords())[0]
-
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
+        coords = select_coords(selected_property, IMAGE_ACCURACY_BUDGET)
+        png = retrieve_cached_png(
+            coords, product='rgb', period=sentinel_period(), dimensions=FEATURE_IMAGE_DIMENSIONS,
+            render=lambda: retrieve_feature_images(coords=coords)[0]
+        )
                 
         return ToolResult(
             content=f"O contorno vermelho indica a delimitação geográfica da propriedade rural.",
-            images=[Image(content=buffer.getvalue())]
+            images=[Image(content=png)]
         )
 
     except Exception as e:
@@ -67,14 +82,16 @@ def generate_biomass_image(run_context: RunContext, car_codes: list[str], year:
         selected_property = next((prop for prop in registered_properties if prop["car_code"] == ', '.join(car_codes)), None)
         selected_property = RuralProperty.model_validate(selected_property)
 
-        img = retrieve_feature_biomass_image(coords=selected_property.get_coords(), year=year)
-
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
+        coords = select_coords(selected_property, IMAGE_ACCURACY_BUDGET)
+        png = retrieve_cached_png(
+            coords, product='biomass', period=year, dimensions=BIOMASS_IMAGE_DIMENSIONS,
+            render=lambda: retrieve_feature_biomass_image(coords=coords, year=year),
+            version=lambda: asset_metadata.version('biomass')
+        )
                 
         return ToolResult(
             content=f"Legenda: Azul claro (Alta concentração) a Roxo escuro (Baixa concentração).",
-            images=[Image(content=buffer.getvalue())]
+            images=[Image(content=png)]
         )
 
     except Exception as e:
@@ -97,14 +114,15 @@ def generate_soil_texture_image(run_context: RunContext, car_codes: list[str]) -
         selected_property = next((prop for prop in registered_properties if prop["car_code"] == ', '.join(car_codes)), None)
         selected_property = RuralProperty.model_validate(selected_property)
 
-        img = retrieve_feature_soil_texture_image(coords=selected_property.get_coords())
-
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
+        coords = select_coords(selected_property, IMAGE_ACCURACY_BUDGET)
+        png = retrieve_cached_png(
+            coords, product='soil', period='static', dimensions=SOIL_IMAGE_DIMENSIONS,
+            render=lambda: retrieve_feature_soil_texture_image(coords=coords)
+        )
                 
         return ToolResult(
             content=f"Legenda: Afloramento (#707070), Muito Argiloso (#9B0F06), Argila (#BFA28C), Siltoso (#D8F467), Arenoso (#FFD400) e Médio (#F0CFA1).",
-            images=[Image(content=buffer.getvalue())]
+            images=[Image(content=png)]
         )
 
     except Exception as e:
@@ -142,7 +160,16 @@ def get_pasture_stats(run_context: RunContext, car_codes: list[str], year: int =
         selected_property = next((prop for prop in registered_properties if prop["car_code"] == ', '.join(car_codes)))
         selected_property = RuralProperty.model_validate(selected_property)
 
-        new_pasture_stats: PastureStats = query_pasture_statistics(coords=selected_property.get_coords(), year=year)
+        coords = select_coords(selected_property, STATISTICS_ACCURACY_BUDGET)
+
+        new_pasture_stats, stale_since = cached_analysis(
+            coords=coords,
+            product='pasture',
+            year=year,
+            asset_version=lambda: stats_asset_version('biomass', 'age', 'vigor', 'integration'),
+            model=PastureStats,
+            compute=lambda: query_pasture_statistics(coords=coords, year=year)
+            )
 
         #new_property_stats.list_pasture_stats.append(new_pasture_stats)
 
@@ -151,12 +178,50 @@ def get_pasture_stats(run_context: RunContext, car_codes: list[str], year: int =
         #properties_stats.append(new_property_stats.model_dump())
         #run_context.session_state["properties_stats"] = properties_stats
 
-        return ToolResult(content=str(new_pasture_stats))
+        return ToolResult(content=(stale_notice(stale_since) if stale_since else '') + str(new_pasture_stats))
     except Exception as e:
         print(f"ERROR: {e}", flush=True)
         return ToolResult(content=str(e))
     
 
+@tool(tool_hooks=[validate_selected_property_hook])
+def get_pasture_time_series(run_context: RunContext, car_codes: list[str], years: list[int]):
+    """
+    Recupera as estatísticas de biomassa, vigor, idade da pastagem e uso do solo de vários anos de uma só vez.
+
+    Use esta ferramenta para comparações temporais (ex: "como a pastagem mudou de 2010 a 2024?").
+    Chame-a UMA única vez com todos os anos desejados, em vez de chamar `get_pasture_stats` para cada ano.
+
+    params:
+        car_codes (list[str]): Lista de códigos CAR da propriedade.
+        years (list[int]): Anos a comparar (2000-2024). Para um intervalo, informe todos os anos dele.
+
+    Return:
+        Estatísticas de pastagem indexadas por ano.
+    """
+    try:
+        registered_properties = run_context.session_state["registered_properties"]
+        selected_property = next((prop for prop in registered_properties if prop["car_code"] == ', '.join(car_codes)))
+        selected_property = RuralProperty.model_validate(selected_property)
+
+        coords = select_coords(selected_property, STATISTICS_ACCURACY_BUDGET)
+
+        # Mesmo produto de `get_pasture_stats`: as duas ferramentas leem e gravam as mesmas linhas por ano
+        series, stale_since = cached_yearly_analysis(
+            coords=coords,
+            product='pasture',
+            years=years,
+            asset_version=lambda: stats_asset_version('biomass', 'age', 'vigor', 'integration'),
+            model=PastureStats,
+            compute=lambda missing: query_pasture_time_series(coords=coords, years=missing).series
+            )
+
+        return ToolResult(content=(stale_notice(stale_since) if stale_since else '') + str(PastureTimeSeries(series=series)))
+    except Exception as e:
+        log_error(f"Falha na série temporal de pastagem: {e}")
+        return ToolResult(content=str(e))
+    
+
 @tool(tool_hooks=[validate_selected_property_hook])
 def get_topographic_stats(run_context: RunContext, car_codes: list[str]):
     """
@@ -181,7 +246,15 @@ def get_topographic_stats(run_context: RunContext, car_codes: list[str]):
         selected_property = next((prop for prop in registered_properties if prop["car_code"] == ', '.join(car_codes)))
         selected_property = RuralProperty.model_validate(selected_property)
 
-        new_topographic_stats: TopographicStats = query_topographic_stats(coords=selected_property.get_coords())
+        coords = select_coords(selected_property, STATISTICS_ACCURACY_BUDGET)
+
+        new_topographic_stats, stale_since = cached_analysis(
+            coords=coords,
+            product='topography',
+            asset_version=lambda: stats_asset_version('dem'),
+            model=TopographicStats,
+            compute=lambda: query_topographic_stats(coords=coords)
+            )
 
         #new_property_stats.list_pasture_stats.append(new_pasture_stats)
 
@@ -190,7 +263,46 @@ def get_topographic_stats(run_context: RunContext, car_codes: list[str]):
         #properties_stats.append(new_property_stats.model_dump())
         #run_context.session_state["properties_stats"] = properties_stats
 
-        return ToolResult(content=str(new_topographic_stats))
+        return ToolResult(content=(stale_notice(stale_since) if stale_since else '') + str(new_topographic_stats))
     except Exception as e:
         print(f"ERROR: {e}", flush=True)
-        return ToolResult(content=str(e))
\ No newline at end of file
+        return ToolResult(content=str(e))
+
+
+def _async_variant(sync_tool: Function) -> Function:
+    """
+    Cria a variante assíncrona de uma ferramenta síncrona.
+
+    O corpo síncrono (chamadas bloqueantes ao `ee` e ao `requests`) roda no pool dedicado do GEE,
+    com timeout, mantendo o event loop livre para os demais usuários. Nome, descrição e
+    parâmetros são os mesmos da ferramenta original.
+    """
+    @wraps(sync_tool.entrypoint)
+    async def entrypoint(*args, **kwargs):
+        try:
+            return await run_in_gee_executor(sync_tool.entrypoint, *args, **kwargs)
+        except RuntimeError as e:
+            return ToolResult(content=str(e))
+
+    async_tool = sync_tool.model_copy(deep=True)
+    async_tool.entrypoint = entrypoint
+    async_tool.tool_hooks = [avalidate_selected_property_hook]
+
+    return async_tool
+
+
+PROPERTY_ANALYST_TOOLS = [
+    generate_property_image,
+    generate_biomass_image,
+    generate_soil_texture_image,
+    get_pasture_stats,
+    get_pasture_time_series,
+    get_topographic_stats
+]
+
+# `agent.run` usa as ferramentas síncronas e `agent.arun` as variantes assíncronas de mesmo nome
+property_analyst_toolkit = Toolkit(
+    name="property_analyst_tools",
+    tools=PROPERTY_ANALYST_TOOLS,
+    async_tools=[(_async_variant(sync_tool), sync_tool.name) for sync_tool in PROPERTY_ANALYST_TOOLS]
+)
@@ -1,24 +1,78 @@
 import re
 
 from io import BytesIO
-from typing import List, Tuple
+from typing import List, Tuple, Optional, Sequence
 
 from agno.run import RunContext
 from agno.tools import tool
 from agno.tools.function import ToolResult
-from agno.media import Image
+from agno.media import Image, File
 
 from app.utils.scripts.sicar_scripts import (
     fetch_property_by_coordinates_locally,
+    fetch_nearest_properties_locally,
     fetch_property_by_car_locally,
+    fetch_properties_by_car_bulk,
+    fetch_properties_by_coordinates_bulk,
     fetch_coordinates_by_url,
+    parse_bulk_csv,
+    parse_coordinate,
     clean_car_code
     )
+from app.configs.sicar import SICAR_BULK_LIMIT
 from app.utils.scripts.image_scripts import get_mosaic
-from app.utils.scripts.gee_scripts import retrieve_feature_images
+from app.utils.scripts.gee_scripts import retrieve_feature_images, select_coords, IMAGE_ACCURACY_BUDGET
 from app.utils.interfaces.property_record import RuralProperty
 
 
+def _suggest_nearest_properties(run_context: RunContext, latitude: float, longitude: float) -> Optional[ToolResult]:
+    """
+    Sugere os imóveis mais próximos quando a coordenada não cai dentro de nenhum polígono
+    (ex: estrada, rio ou divisa entre propriedades).
+
+    Returns:
+        Optional[ToolResult]: Opções com a distância até o ponto, ou `None` se não houver imóveis no raio de busca.
+    """
+    nearest = fetch_nearest_properties_locally(latitude=latitude, longitude=longitude)
+
+    if not nearest:
+        return None
+
+    # Imóveis já registrados ficam fora das opções; se todos já estiverem, retorna o registro do mais próximo
+    registered_map = {
+        prop["car_code"]: prop
+        for prop in run_context.session_state.get("registered_properties", [])
+    }
+    options = [(prop, distance) for prop, distance in nearest if prop.car_code not in registered_map]
+
+    if not options:
+        property_record = RuralProperty.model_validate(registered_map[nearest[0][0].car_code])
+        return ToolResult(content=str(property_record))
+
+    nearest = options
+    properties = [prop for prop, _ in nearest]
+    run_context.session_state["candidate_properties"] = [prop.model_dump() for prop in properties]
+
+    imgs = retrieve_feature_images([select_coords(prop, IMAGE_ACCURACY_BUDGET)[0] for prop in properties])
+    image = imgs[0] if len(imgs) == 1 else get_mosaic(imgs)
+
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+
+    options_text = []
+    for index, (prop, distance) in enumerate(nearest):
+        options_text.append(f"  > Opção {index + 1} - {prop.describe()} (a {distance:.0f} m do ponto)")
+    result_text = "\n".join(options_text)
+
+    return ToolResult(
+        content=(
+            "Informe ao usuário que a coordenada não está dentro de nenhuma propriedade, mas que as seguintes propriedades estão próximas.\n"
+            f"Pergunte se alguma delas é a correta:\n{result_text}"
+        ),
+        images=[Image(content=buffer.getvalue())]
+        )
+
+
 # TODO: Se o usuário informar uma URL de coordenadas de uma propriedade que já existe no sistema, validar se a propriedade existe por meio do CAR. Se existir então retornar menssagem que já existe.
 
 @tool(stop_after_tool_call=True)
@@ -38,7 +92,7 @@ def register_feature_by_coordinate(run_context: RunContext, latitude: float, lon
     properties = fetch_property_by_coordinates_locally(latitude=latitude, longitude=longitude)
 
     if not properties:
-        return (
+        return _suggest_nearest_properties(run_context, latitude=latitude, longitude=longitude) or (
             "Peça desculpas ao usuário e informe que nenhuma propriedade foi encontrada nesta coordenada.\n"
             "Peça que tente novamente e verificar se as coordenadas estão corretas."
         )
@@ -56,7 +110,7 @@ def register_feature_by_coordinate(run_context: RunContext, latitude: float, lon
 
     run_context.session_state["candidate_properties"] = [prop.model_dump() for prop in properties] 
 
-    imgs = retrieve_feature_images([prop.get_coords()[0] for prop in properties])
+    imgs = retrieve_feature_images([select_coords(prop, IMAGE_ACCURACY_BUDGET)[0] for prop in properties])
     
     if len(properties) == 1:
         img = imgs[0]
@@ -103,7 +157,8 @@ def register_feature_by_car(run_context: RunContext, car_codes: List[str], name:
         ToolResult: Resultado da busca contendo imagem e instruções para o próximo passo.
     """
     if len(car_codes) > 3:
-        return ToolResult(content=("Peça desculpas e informe que não é permitido unificar mais que 3 CARs por vezes."))
+        return ToolResult(content=("Peça desculpas e informe que não é permitido unificar mais que 3 CARs por vezes.\n"
+            "Se o usuário quiser cadastrar vários imóveis separadamente, use `register_features_in_bulk`."))
 
     clean_car_codes = [clean_car_code(car_code) for car_code in car_codes]
 
@@ -115,7 +170,7 @@ def register_feature_by_car(run_context: RunContext, car_codes: List[str], name:
             )
         )
         
-    properties = fetch_property_by_car_locally(car_codes=car_codes)
+    properties = fetch_property_by_car_locally(car_codes=clean_car_codes)
     _property = RuralProperty.unify(properties)
 
     if not properties:
@@ -128,7 +183,7 @@ def register_feature_by_car(run_context: RunContext, car_codes: List[str], name:
 
     run_context.session_state["candidate_properties"] = [_property.model_dump()] 
 
-    imgs = retrieve_feature_images(_property.get_coords())
+    imgs = retrieve_feature_images(select_coords(_property, IMAGE_ACCURACY_BUDGET))
 
     mosaic = get_mosaic(imgs)
 
@@ -155,6 +210,105 @@ def register_feature_by_car(run_context: RunContext, car_codes: List[str], name:
             )
 
 
+@tool(stop_after_tool_call=True)
+def register_features_in_bulk(
+    run_context: RunContext,
+    car_codes: List[str] = None,
+    coordinates: List[List[float]] = None,
+    files: Optional[Sequence[File]] = None
+    ):
+    """
+    Registra várias propriedades rurais de uma só vez, a partir de códigos CAR, coordenadas ou de um arquivo CSV.
+
+    Use esta ferramenta quando o usuário (ex: técnico ou cooperativa) enviar uma lista com vários imóveis para cadastro
+    ou um arquivo CSV com as colunas `car` e/ou `latitude`/`longitude`. Cada imóvel é registrado como uma propriedade separada.
+
+    Args:
+        car_codes (List[str]): Códigos de Cadastro Ambiental Rural (CAR) padrão SICAR. `None` caso não sejam informados.
+        coordinates (List[List[float]]): Pares [latitude, longitude] em graus decimais. `None` caso não sejam informados.
+
+    Returns:
+        ToolResult: Resumo único do cadastro em lote.
+    """
+    parsed_coordinates = [parse_coordinate(pair) for pair in coordinates or []]
+
+    car_codes, coordinates = list(car_codes or []), [pair for pair in parsed_coordinates if pair is not None]
+    invalid_rows = len(parsed_coordinates) - len(coordinates)
+
+    for file in files or []:
+        try:
+            csv_car_codes, csv_coordinates, csv_invalid_rows = parse_bulk_csv(file.get_content_bytes() or b'')
+        except UnicodeDecodeError:
+            return ToolResult(content="Peça desculpas e informe que o arquivo enviado não é um CSV válido (texto em UTF-8).")
+
+        car_codes.extend(csv_car_codes)
+        coordinates.extend(csv_coordinates)
+        invalid_rows += csv_invalid_rows
+
+    if not car_codes and not coordinates:
+        return ToolResult(content="Peça ao usuário que envie a lista de códigos CAR, de coordenadas ou um arquivo CSV com as colunas `car` ou `latitude` e `longitude`.")
+
+    if len(car_codes) + len(coordinates) > SICAR_BULK_LIMIT:
+        return ToolResult(content=f"Peça desculpas e informe que o cadastro em lote aceita no máximo {SICAR_BULK_LIMIT} itens por vez.")
+
+    clean_car_codes = [clean_car_code(car_code) for car_code in car_codes]
+    invalid_car_codes = [car_code for car_code, clean in zip(car_codes, clean_car_codes) if clean is None]
+    clean_car_codes = [clean for clean in clean_car_codes if clean is not None]
+
+    found_by_car = fetch_properties_by_car_bulk(car_codes=clean_car_codes) if clean_car_codes else {}
+    found_by_coordinate = fetch_properties_by_coordinates_bulk(coordinates=coordinates) if coordinates else []
+
+    registered_properties = run_context.session_state.get("registered_properties", [])
+    registered_codes = {prop["car_code"] for prop in registered_properties}
+
+    new_properties, already_registered = [], []
+    not_found = [car_code for car_code in clean_car_codes if car_code not in found_by_car]
+    empty_coordinates, ambiguous_coordinates = [], []
+
+    candidates = list(found_by_car.values())
+    for (latitude, longitude), properties in zip(coordinates, found_by_coordinate):
+        if not properties:
+            empty_coordinates.append(f"({latitude}, {longitude})")
+        elif len(properties) > 1:
+            ambiguous_coordinates.append(f"({latitude}, {longitude})")
+        else:
+            candidates.append(properties[0])
+
+    for prop in candidates:
+        if prop.car_code in registered_codes:
+            already_registered.append(prop.car_code)
+            continue
+
+        registered_codes.add(prop.car_code)
+        new_properties.append(prop)
+
+    registered_properties.extend(prop.model_dump() for prop in new_properties)
+    run_context.session_state["registered_properties"] = registered_properties
+
+    summary = [f"Propriedades registradas: {len(new_properties)}."]
+    summary.extend(f"  > {prop.describe()}" for prop in new_properties)
+
+    if already_registered:
+        summary.append(f"Já registradas anteriormente: {', '.join(sorted(set(already_registered)))}.")
+    if not_found:
+        summary.append(f"Códigos CAR não encontrados: {', '.join(not_found)}.")
+    if invalid_car_codes:
+        summary.append(f"Códigos fora do padrão SICAR: {', '.join(invalid_car_codes)}.")
+    if empty_coordinates:
+        summary.append(f"Coordenadas sem propriedade: {', '.join(empty_coordinates)}.")
+    if ambiguous_coordinates:
+        summary.append(
+            f"Coordenadas com mais de uma propriedade (não registradas): {', '.join(ambiguous_coordinates)}. "
+            "Sugira registrá-las individualmente com `register_feature_by_coordinate`."
+            )
+    if invalid_rows:
+        summary.append(f"Coordenadas ou linhas do CSV inválidas (malformadas ou fora do Brasil): {invalid_rows}.")
+
+    summary_text = "\n".join(summary)
+
+    return ToolResult(content=f"Informe ao usuário, de forma resumida, o resultado do cadastro em lote:\n{summary_text}")
+
+
 @tool(stop_after_tool_call=True,)
 def register_feature_by_url(run_context: RunContext, url: str) -> ToolResult:
     """
@@ -184,7 +338,7 @@ def register_feature_by_url(run_context: RunContext, url: str) -> ToolResult:
     properties = fetch_property_by_coordinates_locally(latitude=latitude, longitude=longitude)
 
     if not properties:
-        return (
+        return _suggest_nearest_properties(run_context, latitude=latitude, longitude=longitude) or (
             "Peça desculpas ao usuário e informe que nenhuma propriedade foi encontrada nesta coordenada.\n"
             "Peça que tente novamente e verificar se as coordenadas estão corretas."
         )
@@ -202,7 +356,7 @@ def register_feature_by_url(run_context: RunContext, url: str) -> ToolResult:
 
     run_context.session_state["candidate_properties"] = [prop.model_dump() for prop in properties] 
 
-    imgs = retrieve_feature_images([prop.get_coords()[0] for prop in properties])
+    imgs = retrieve_feature_images([select_coords(prop, IMAGE_ACCURACY_BUDGET)[0] for prop in properties])
     
     if len(properties) == 1:
         img = imgs[0]
@@ -0,0 +1,289 @@
+import os
+import time
+import hashlib
+import threading
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Cache em memória com política LRU, expiração por tempo (TTL) e contadores de acerto/falha.
+
+    Seguro para uso entre threads. Quando `version` é informado, o cache é esvaziado sempre que
+    o valor retornado mudar (por exemplo, após a reconstrução do dataset de origem). A versão é
+    consultada no máximo a cada `version_interval` segundos, fora do lock, e `on_version_change`
+    é chamado após a troca para que o chamador recarregue os recursos derivados dos dados.
+
+    Args:
+        maxsize (int): Quantidade máxima de entradas mantidas.
+        ttl (float): Tempo de vida de cada entrada, em segundos.
+        version (Callable[[], Hashable], optional): Função que identifica a versão dos dados de origem.
+        version_interval (float): Intervalo mínimo (em segundos) entre as consultas da versão.
+        on_version_change (Callable[[], None], optional): Chamado quando a versão muda.
+        copy (Callable[[Any], Any], optional): Copia os valores ao armazenar e ao retornar, para que
+            objetos mutáveis não sejam compartilhados entre os chamadores.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 3600,
+        version: Optional[Callable[[], Hashable]] = None,
+        version_interval: float = 0,
+        on_version_change: Optional[Callable[[], None]] = None,
+        copy: Optional[Callable[[Any], Any]] = None
+        ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version_interval = version_interval
+        self.hits = 0
+        self.misses = 0
+
+        self._version = version
+        self._on_version_change = on_version_change
+        self._copy = copy or (lambda value: value)
+        self._current_version = version() if version else None
+        self._next_version_check = time.monotonic() + version_interval
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _check_version(self):
+        if self._version is None:
+            return
+
+        now = time.monotonic()
+
+        with self._lock:
+            if now < self._next_version_check:
+                return
+
+            self._next_version_check = now + self.version_interval
+
+        version = self._version()
+
+        with self._lock:
+            changed = version != self._current_version
+
+            if changed:
+                self._entries.clear()
+                self._current_version = version
+
+        if changed and self._on_version_change is not None:
+            self._on_version_change()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Retorna o valor associado à chave, ou `default` se ausente ou expirado.
+        """
+        self._check_version()
+
+        with self._lock:
+            value, expires_at = self._entries.get(key, (_MISSING, 0))
+
+            if value is _MISSING or expires_at < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return self._copy(value)
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Armazena o valor, descartando a entrada menos usada recentemente se o limite for atingido.
+        """
+        value = self._copy(value)
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Retorna os contadores de uso do cache.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas idênticas concorrentes em uma única execução (single-flight).
+
+    A primeira chamada de uma chave executa a função; as que chegam enquanto ela está em
+    andamento aguardam e recebem o mesmo resultado (ou a mesma exceção). Nada é guardado
+    depois que a execução termina.
+    """
+
+    def __init__(self):
+        self.executions = 0
+        self.shared = 0
+
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        """
+        Executa `func(*args, **kwargs)`, ou aguarda a execução em andamento com a mesma chave.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+
+            if leader:
+                future = self._calls[key] = Future()
+                self.executions += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def stats(self) -> dict:
+        """
+        Retorna a quantidade de execuções e de chamadas que reaproveitaram uma execução em andamento.
+        """
+        with self._lock:
+            return {'executions': self.executions, 'shared': self.shared, 'in_flight': len(self._calls)}
+
+
+class DiskLRUCache:
+    """
+    Cache em disco de conteúdos binários (ex: PNGs) com limite de tamanho total e política LRU.
+
+    Cada entrada é um arquivo nomeado pelo hash da chave. O índice (ordem de uso e tamanhos) é
+    montado a partir do diretório no primeiro acesso, então o cache sobrevive a reinícios.
+
+    Args:
+        directory (Path): Diretório dos arquivos do cache.
+        max_bytes (int): Tamanho total máximo, em bytes.
+        suffix (str): Extensão dos arquivos.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, suffix: str = '.bin'):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: Optional[OrderedDict] = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: Hashable) -> Path:
+        return self.directory / (hashlib.sha256(repr(key).encode()).hexdigest() + self.suffix)
+
+    def _load_index(self):
+        if self._entries is not None:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        files = sorted(self.directory.glob(f'*{self.suffix}'), key=lambda path: path.stat().st_mtime)
+
+        self._entries = OrderedDict((path.name, path.stat().st_size) for path in files)
+        self._size = sum(self._entries.values())
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._entries:
+            name, size = self._entries.popitem(last=False)
+            (self.directory / name).unlink(missing_ok=True)
+            self._size -= size
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """
+        Retorna o conteúdo armazenado para a chave, ou `None` se ausente.
+        """
+        path = self._path(key)
+
+        with self._lock:
+            self._load_index()
+
+            if path.name not in self._entries:
+                self.misses += 1
+                return None
+
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                self._size -= self._entries.pop(path.name)
+                self.misses += 1
+                return None
+
+            # A data de modificação guarda a ordem de uso entre reinícios
+            os.utime(path)
+            self._entries.move_to_end(path.name)
+            self.hits += 1
+            return data
+
+    def set(self, key: Hashable, data: bytes):
+        """
+        Armazena o conteúdo, descartando as entradas menos usadas recentemente se o limite for excedido.
+        """
+        path = self._path(key)
+
+        with self._lock:
+            self._load_index()
+
+            # Escrita atômica: outro processo nunca lê um arquivo pela metade
+            temporary = path.with_suffix(f'.{threading.get_ident()}.tmp')
+            temporary.write_bytes(data)
+            os.replace(temporary, path)
+
+            self._size += len(data) - self._entries.pop(path.name, 0)
+            self._entries[path.name] = len(data)
+            self._evict()
+
+    def stats(self) -> dict:
+        """
+        Retorna os contadores de uso e a ocupação do cache.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries or {}),
+                'size_bytes': self._size,
+                'hit_rate': self.hits / total if total else 0.0
+            }
@@ -0,0 +1,43 @@
+import re
+
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class AssetMetadata(BaseModel):
+    """
+    Metadados de um asset do GEE: bandas, anos disponíveis e versão.
+    """
+    asset_id: str
+    bands: List[str]
+    year_bands: Dict[int, str] = Field(default_factory=dict)
+    version: Optional[int] = None
+
+    @classmethod
+    def from_bands(cls, asset_id: str, bands: List[str], version: Optional[int] = None) -> "AssetMetadata":
+        """
+        Monta os metadados identificando o ano no sufixo do nome das bandas (ex: 'biomass_2024').
+        """
+        year_bands = {int(match.group(1)): band for band in bands if (match := re.search(r'(\d{4})$', band))}
+
+        return cls(asset_id=asset_id, bands=bands, year_bands=year_bands, version=version)
+
+    @property
+    def min_year(self) -> Optional[int]:
+        return min(self.year_bands) if self.year_bands else None
+
+    @property
+    def max_year(self) -> Optional[int]:
+        return max(self.year_bands) if self.year_bands else None
+
+    def band(self, year: int) -> str:
+        """
+        Retorna o nome da banda do ano informado.
+
+        Raises:
+            ValueError: Se o ano não estiver disponível no asset.
+        """
+        if year not in self.year_bands:
+            raise ValueError(f"O ano deve estar entre {self.min_year} e {self.max_year}.")
+
+        return self.year_bands[year]
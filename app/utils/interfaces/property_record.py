@@ -1,7 +1,19 @@
+import shapely
+
+from enum import Enum
 from uuid import uuid4
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
+from app.configs.sicar import SICAR_THUMBNAIL_TOLERANCE, SICAR_ANALYSIS_TOLERANCE, METERS_PER_DEGREE
+
+
+class GeometryTier(str, Enum):
+    """Níveis de resolução da geometria do imóvel, do mais grosseiro ao original."""
+    THUMBNAIL = 'thumbnail'
+    ANALYSIS = 'analysis'
+    EXACT = 'exact'
+
 
 class SpatialFeatures(BaseModel):
     """Propriedades espaciais e territoriais do imóvel."""
@@ -22,6 +34,19 @@ class SpatialFeatures(BaseModel):
         description="Coordenadas geográficas do polígono do imóvel (padrão GeoJSON)."
     )
 
+    # Tiers derivados: ficam fora do `model_dump` (session_state) e são recalculados sob demanda
+    analysis_coordinates: Optional[List[List[List[List[float]]]]] = Field(
+        default=None,
+        exclude=True,
+        description="Coordenadas simplificadas dentro da tolerância de análise (SICAR_ANALYSIS_TOLERANCE)."
+    )
+
+    thumbnail_coordinates: Optional[List[List[List[List[float]]]]] = Field(
+        default=None,
+        exclude=True,
+        description="Coordenadas simplificadas para imagens de visualização (SICAR_THUMBNAIL_TOLERANCE)."
+    )
+
 
 class SicarMetadata(BaseModel):
     """Dados administrativos e de status do imóvel no SICAR."""
@@ -50,6 +75,20 @@ class SicarMetadata(BaseModel):
     )
 
 
+def _simplify_coordinates(coordinates: List[List[List[List[float]]]], tolerance: float) -> List[List[List[List[float]]]]:
+    """
+    Simplifica um MultiPolygon (padrão GeoJSON) preservando a topologia, com a tolerância em metros.
+    """
+    geometry = shapely.geometry.shape({'type': 'MultiPolygon', 'coordinates': coordinates})
+    geometry = geometry.simplify(tolerance / METERS_PER_DEGREE, preserve_topology=True)
+    polygons = getattr(geometry, 'geoms', [geometry])
+
+    return [
+        [[list(point) for point in ring.coords] for ring in (polygon.exterior, *polygon.interiors)]
+        for polygon in polygons
+    ]
+
+
 class RuralProperty(BaseModel):
     nickname: Optional[str] = Field(
         default=None,
@@ -83,7 +122,9 @@ class RuralProperty(BaseModel):
             car_code=', '.join([prop.car_code for prop in rural_properties]),
             spatial_features=SpatialFeatures(
                 total_area=sum([prop.spatial_features.total_area for prop in rural_properties]),
-                coordinates=[prop.get_coords()[0] for prop in rural_properties]
+                coordinates=[prop.get_coords()[0] for prop in rural_properties],
+                analysis_coordinates=[prop.get_coords(GeometryTier.ANALYSIS)[0] for prop in rural_properties],
+                thumbnail_coordinates=[prop.get_coords(GeometryTier.THUMBNAIL)[0] for prop in rural_properties]
                 )
             )
 
@@ -93,8 +134,26 @@ class RuralProperty(BaseModel):
             f"Área: {self.spatial_features.total_area} ha."
             )
     
-    def get_coords(self):
-        return self.spatial_features.coordinates
+    def get_coords(self, tier: GeometryTier = GeometryTier.EXACT):
+        """
+        Retorna as coordenadas no tier pedido.
+
+        Os tiers simplificados não são salvos no session_state; quando ausentes (ex: imóvel restaurado
+        da sessão ou dataset sem as colunas pré-calculadas), são gerados a partir da geometria original
+        com a mesma tolerância do build do dataset e mantidos no objeto.
+        """
+        spatial_features = self.spatial_features
+
+        if tier == GeometryTier.EXACT:
+            return spatial_features.coordinates
+
+        field = f'{tier.value}_coordinates'
+
+        if not getattr(spatial_features, field):
+            tolerance = SICAR_THUMBNAIL_TOLERANCE if tier == GeometryTier.THUMBNAIL else SICAR_ANALYSIS_TOLERANCE
+            setattr(spatial_features, field, _simplify_coordinates(spatial_features.coordinates, tolerance))
+
+        return getattr(spatial_features, field)
 
     def __str__(self):
         return (
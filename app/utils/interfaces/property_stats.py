@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -80,6 +80,21 @@ class PastureStats(BaseModel):
     )
 
 
+class PastureTimeSeries(BaseModel):
+    """
+    Série temporal das estatísticas de pastagem de uma propriedade (ferramenta `get_pasture_time_series`).
+
+    As áreas de cada ano são calculadas da mesma forma que em `get_pasture_stats`.
+    """
+    series: Dict[int, PastureStats] = Field(
+        default_factory=dict,
+        description=(
+            "Estatísticas de pastagem (biomassa, idade, vigor e uso do solo) indexadas pelo ano, em ordem crescente. "
+            "Usada para comparar a evolução da pastagem entre anos; as áreas de cada ano estão em hectares."
+        )
+    )
+
+
 class TopographicStats(BaseModel):
     elevation: Value = Field(
         ...,
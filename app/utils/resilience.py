@@ -0,0 +1,165 @@
+import time
+import random
+import threading
+
+from typing import Callable, Optional, TypeVar
+
+from agno.utils.log import log_warning
+
+
+T = TypeVar('T')
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Levantada quando o circuito está aberto e a chamada é recusada sem acessar o serviço.
+    """
+
+
+class CircuitBreaker:
+    """
+    Disjuntor (circuit breaker) para um serviço externo instável.
+
+    Após `failure_threshold` falhas consecutivas o circuito abre e as chamadas são recusadas
+    imediatamente com `CircuitOpenError`. Passado `reset_timeout`, uma única chamada de teste é
+    liberada (meio-aberto): se ela funcionar o circuito fecha, senão volta a abrir.
+
+    Seguro para uso entre threads.
+
+    Args:
+        name (str): Nome do serviço, usado nos logs e nas mensagens de erro.
+        failure_threshold (int): Falhas consecutivas que abrem o circuito.
+        reset_timeout (float): Tempo (em segundos) com o circuito aberto antes da chamada de teste.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.rejected = 0
+        self.openings = 0
+
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def before_call(self):
+        """
+        Verifica se a chamada pode seguir.
+
+        Raises:
+            CircuitOpenError: Se o circuito estiver aberto (ou meio-aberto com o teste em andamento).
+        """
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+                self._probing = False
+
+            if self._state == CLOSED:
+                return
+
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+
+            self.rejected += 1
+            raise CircuitOpenError(f"O serviço {self.name} está temporariamente indisponível.")
+
+    def record_success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def release(self):
+        """
+        Libera a chamada de teste sem alterar o estado (ex: erro que não indica falha do serviço).
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.openings += 1
+                    log_warning(f"Circuito do {self.name} aberto após {self._failures} falhas consecutivas.")
+
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        """
+        Retorna o estado do circuito, as falhas consecutivas, as aberturas e as chamadas recusadas.
+        """
+        with self._lock:
+            return {'state': self._state, 'failures': self._failures, 'openings': self.openings, 'rejected': self.rejected}
+
+
+def call_with_retry(
+    func: Callable[[], T],
+    is_transient: Callable[[Exception], bool],
+    attempts: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 8,
+    breaker: Optional[CircuitBreaker] = None
+    ) -> T:
+    """
+    Executa `func` com novas tentativas para erros transitórios, com espera exponencial e jitter.
+
+    A espera antes da tentativa `n` é sorteada entre 0 e `min(max_delay, base_delay * 2**n)` (full
+    jitter), para que vários clientes não repitam as chamadas ao mesmo tempo. Com `breaker`, a chamada
+    passa pelo disjuntor uma única vez e conta no máximo uma falha, quando todas as tentativas terminam
+    em erro transitório: o limite do disjuntor é medido em chamadas, não em tentativas. Erros não
+    transitórios (ex: parâmetros inválidos, cota local esgotada) não alteram o disjuntor.
+
+    Args:
+        func (Callable[[], T]): Chamada ao serviço.
+        is_transient (Callable[[Exception], bool]): Indica se o erro pode ser resolvido ao tentar novamente.
+        attempts (int): Quantidade máxima de tentativas.
+        base_delay (float): Espera base, em segundos.
+        max_delay (float): Espera máxima entre tentativas, em segundos.
+        breaker (CircuitBreaker, optional): Disjuntor do serviço.
+
+    Returns:
+        T: Resultado de `func`.
+    """
+    if breaker is not None:
+        breaker.before_call()
+
+    for attempt in range(attempts):
+        try:
+            result = func()
+        except Exception as error:
+            if not is_transient(error):
+                if breaker is not None:
+                    breaker.release()
+                raise
+
+            if attempt == attempts - 1:
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            log_warning(f"Erro transitório (tentativa {attempt + 1} de {attempts}); nova tentativa em {delay:.2f} s: {error}")
+            time.sleep(delay)
+        else:
+            if breaker is not None:
+                breaker.record_success()
+
+            return result
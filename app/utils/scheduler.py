@@ -0,0 +1,141 @@
+import time
+import threading
+import contextlib
+import contextvars
+
+from typing import Dict, Iterator, Optional
+from collections import deque
+
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+
+LANES = (INTERACTIVE, BACKGROUND)
+
+_current_lane = contextvars.ContextVar('scheduler_lane', default=INTERACTIVE)
+
+
+class RequestScheduler:
+    """
+    Limitador de requisições (token bucket) com filas de prioridade.
+
+    As permissões são concedidas em ordem de chegada dentro de cada fila, e a fila interativa
+    sempre é atendida antes da de segundo plano. Além disso, o segundo plano só consome fichas
+    acima de `reserve`, deixando uma folga para os usuários mesmo durante tarefas em lote.
+
+    Seguro para uso entre threads. A fila de cada chamada vem do contexto atual (ver `lane`); threads de
+    pools não herdam o contexto, então o trabalho deve ser submetido com `contextvars.copy_context().run`.
+
+    Args:
+        rate (float): Fichas repostas por segundo (requisições por segundo da cota).
+        burst (int): Quantidade máxima de fichas acumuladas (rajada permitida).
+        reserve (float): Fichas que a fila de segundo plano não pode consumir.
+    """
+
+    def __init__(self, rate: float, burst: int, reserve: float = 1):
+        self.rate = rate
+        self.burst = burst
+        self.reserve = min(reserve, burst - 1)
+
+        self.granted = {lane: 0 for lane in LANES}
+        self.timeouts = {lane: 0 for lane in LANES}
+        self.wait_seconds = {lane: 0.0 for lane in LANES}
+        self.max_queued = {lane: 0 for lane in LANES}
+
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._queues: Dict[str, deque] = {lane: deque() for lane in LANES}
+        self._condition = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def _can_grant(self, lane: str, ticket: object) -> bool:
+        if self._queues[lane][0] is not ticket:
+            return False
+
+        if lane == INTERACTIVE:
+            return self._tokens >= 1
+
+        return not self._queues[INTERACTIVE] and self._tokens >= 1 + self.reserve
+
+    @contextlib.contextmanager
+    def lane(self, lane: str) -> Iterator[None]:
+        """
+        Define a fila das requisições feitas dentro do bloco (ex: `with scheduler.lane(BACKGROUND):`).
+        """
+        if lane not in LANES:
+            raise ValueError(f"Fila desconhecida: {lane}")
+
+        token = _current_lane.set(lane)
+
+        try:
+            yield
+        finally:
+            _current_lane.reset(token)
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Aguarda uma ficha na fila do contexto atual.
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera, em segundos.
+
+        Raises:
+            TimeoutError: Se a ficha não for concedida dentro do tempo limite.
+        """
+        lane = _current_lane.get()
+        ticket = object()
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+
+        with self._condition:
+            queue = self._queues[lane]
+            queue.append(ticket)
+            self.max_queued[lane] = max(self.max_queued[lane], len(queue))
+
+            try:
+                while True:
+                    self._refill()
+
+                    if self._can_grant(lane, ticket):
+                        self._tokens -= 1
+                        break
+
+                    # Acorda quando a próxima ficha deve estar disponível (ou antes, se notificado)
+                    wait = max((1 - self._tokens % 1) / self.rate, 0.001)
+
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+
+                        if remaining <= 0:
+                            self.timeouts[lane] += 1
+                            raise TimeoutError(f"Cota de requisições esgotada (fila {lane}).")
+
+                        wait = min(wait, remaining)
+
+                    self._condition.wait(wait)
+            finally:
+                queue.remove(ticket)
+                self._condition.notify_all()
+
+            self.granted[lane] += 1
+            self.wait_seconds[lane] += time.monotonic() - start
+
+    def stats(self) -> dict:
+        """
+        Retorna a profundidade atual e máxima das filas, as permissões concedidas e o tempo total de espera.
+        """
+        with self._condition:
+            self._refill()
+
+            return {
+                'tokens': self._tokens,
+                'queued': {lane: len(queue) for lane, queue in self._queues.items()},
+                'max_queued': dict(self.max_queued),
+                'granted': dict(self.granted),
+                'timeouts': dict(self.timeouts),
+                'wait_seconds': dict(self.wait_seconds)
+            }
@@ -0,0 +1,125 @@
+"""
+Ponto único das requisições ao GEE, limitadas pela cota da conta de serviço compartilhada.
+
+Toda chamada que consome a cota (getInfo, getThumbURL e o download das miniaturas) passa pelo
+`gee_scheduler`. Requisições feitas dentro de `gee_scheduler.lane(BACKGROUND)` (ex: pré-carga de
+metadados, exportações) nunca passam à frente das interativas.
+
+Erros transitórios (429, 5xx, tempo esgotado) são repetidos com espera exponencial e jitter. Durante
+uma instabilidade, o `gee_breaker` abre e as chamadas falham imediatamente com `CircuitOpenError`, o
+que permite às ferramentas responder com o último resultado em cache.
+"""
+import re
+import ee
+import requests
+
+from typing import Any, Callable, TypeVar
+
+from app.utils.scheduler import RequestScheduler
+from app.utils.resilience import CircuitBreaker, CircuitOpenError, call_with_retry
+from app.configs.gee import (
+    GEE_REQUESTS_PER_SECOND,
+    GEE_REQUEST_BURST,
+    GEE_INTERACTIVE_RESERVE,
+    GEE_TIMEOUT,
+    GEE_RETRY_ATTEMPTS,
+    GEE_RETRY_BASE_DELAY,
+    GEE_RETRY_MAX_DELAY,
+    GEE_BREAKER_THRESHOLD,
+    GEE_BREAKER_RESET
+)
+
+
+T = TypeVar('T')
+
+gee_scheduler = RequestScheduler(rate=GEE_REQUESTS_PER_SECOND, burst=GEE_REQUEST_BURST, reserve=GEE_INTERACTIVE_RESERVE)
+
+gee_breaker = CircuitBreaker('Google Earth Engine', failure_threshold=GEE_BREAKER_THRESHOLD, reset_timeout=GEE_BREAKER_RESET)
+
+# Mensagens do EEException que indicam sobrecarga ou instabilidade do serviço (e não erro na consulta)
+TRANSIENT_EE_ERRORS = re.compile(
+    r'too many|quota|rate limit|\b429\b|\b50[0-4]\b|internal error|unavailable|timed out|deadline|temporarily',
+    re.IGNORECASE
+)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Indica se o erro do GEE pode ser resolvido ao tentar novamente.
+    """
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+
+    if isinstance(error, ee.EEException):
+        return bool(TRANSIENT_EE_ERRORS.search(str(error)))
+
+    return False
+
+
+def is_unavailable_error(error: Exception) -> bool:
+    """
+    Indica se o erro vem da indisponibilidade do GEE (circuito aberto, cota esgotada na fila ou erro
+    transitório após as novas tentativas), e não da consulta em si (ex: ano fora do asset).
+    """
+    return isinstance(error, (CircuitOpenError, TimeoutError)) or is_transient_error(error)
+
+
+def _call(func: Callable[[], T]) -> T:
+    """
+    Executa a requisição dentro da cota, com novas tentativas e protegida pelo disjuntor.
+    """
+    def attempt() -> T:
+        gee_scheduler.acquire(timeout=GEE_TIMEOUT)
+        return func()
+
+    return call_with_retry(
+        attempt,
+        is_transient=is_transient_error,
+        attempts=GEE_RETRY_ATTEMPTS,
+        base_delay=GEE_RETRY_BASE_DELAY,
+        max_delay=GEE_RETRY_MAX_DELAY,
+        breaker=gee_breaker
+    )
+
+
+def get_info(obj: ee.ComputedObject) -> Any:
+    """
+    Resolve o objeto no GEE (getInfo) após obter uma ficha da cota.
+    """
+    return _call(obj.getInfo)
+
+
+def start_task(task: ee.batch.Task) -> str:
+    """
+    Inicia uma tarefa em lote do GEE (ex: exportação) dentro da cota, com novas tentativas e o disjuntor.
+
+    Returns:
+        str: Identificador da tarefa.
+    """
+    _call(task.start)
+
+    return task.id
+
+
+def download_thumbnail(image: ee.Image, dimensions: int) -> bytes:
+    """
+    Gera a URL da miniatura PNG (getThumbURL) e baixa o conteúdo, cada etapa com uma ficha da cota.
+
+    Args:
+        image (ee.Image): Imagem já visualizada e recortada.
+        dimensions (int): Lado da miniatura, em pixels.
+
+    Returns:
+        bytes: Conteúdo PNG.
+    """
+    url = _call(lambda: image.getThumbURL({"dimensions": dimensions, "format": "png"}))
+
+    def download() -> bytes:
+        response = requests.get(url, timeout=60)
+        response.raise_for_status() # Levanta requests.exceptions.HTTPError em caso de falha HTTP
+        return response.content
+
+    return _call(download)
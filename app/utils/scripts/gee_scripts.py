@@ -1,107 +1,469 @@
 import os
 import ee
+import json
+import asyncio
+import inspect
+import contextvars
 import PIL
+import time
 import datetime
 import requests
+import threading
 import traceback
 
 from io import BytesIO
-from typing import List
+from PIL.PngImagePlugin import PngInfo
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from functools import lru_cache, partial, wraps
+from concurrent.futures import ThreadPoolExecutor
 
-from agno.utils.log import log_error
+from agno.utils.log import log_error, log_warning
 
-from app.utils.scripts.image_scripts import add_legend, add_legend_descriptor
-from app.utils.interfaces.property_stats import PropertyStats, PastureStats, TopographicStats
+from app.utils.cache import DiskLRUCache, SingleFlight
+from app.utils.scheduler import BACKGROUND
+from app.utils.scripts.result_cache_scripts import geometry_fingerprint
+from app.utils.scripts.gee_request_scripts import gee_scheduler, get_info, download_thumbnail
+from app.utils.scripts.sentinel_composite_scripts import sentinel_composites, rolling_period, year_period, period_name
+from app.utils.scripts.image_scripts import add_legend, add_legend_descriptor, get_placeholder_image
+from app.utils.interfaces.property_stats import PropertyStats, PastureStats, PastureTimeSeries, TopographicStats
+from app.utils.interfaces.property_record import RuralProperty, GeometryTier
+from app.utils.interfaces.asset_metadata import AssetMetadata
+from app.configs.gee import GEE_METADATA_TTL, GEE_THUMBNAIL_WORKERS, GEE_WORKERS, GEE_TIMEOUT, GEE_IMAGE_CACHE_PATH, GEE_IMAGE_CACHE_SIZE, GEE_STATS_BACKEND, GEE_LOCAL_RASTER_PATH
+from app.configs.sicar import SICAR_THUMBNAIL_TOLERANCE, SICAR_ANALYSIS_TOLERANCE
 
 
-if not (GEE_SERVICE_ACCOUNT := os.environ.get('GEE_SERVICE_ACCOUNT')):
-    raise ValueError("GEE_SERVICE_ACCOUNT environment variables must be set.")
-if not (GEE_KEY_FILE := os.environ.get('GEE_KEY_FILE')):
-    raise ValueError("GEE_KEY_FILE environment variables must be set.")
-if not (GEE_PROJECT := os.environ.get('GEE_PROJECT')):
-    raise ValueError("GEE_PROJECT environment variables must be set.")
+GEE_SERVICE_ACCOUNT = os.environ.get('GEE_SERVICE_ACCOUNT')
+GEE_KEY_FILE = os.environ.get('GEE_KEY_FILE')
+GEE_PROJECT = os.environ.get('GEE_PROJECT')
 
-try:
-    credentials = ee.ServiceAccountCredentials(GEE_SERVICE_ACCOUNT, GEE_KEY_FILE)
-    ee.Initialize(credentials, project=GEE_PROJECT)
-    GEE_CONNECTED_FLAG = True
-except Exception as e:
-    log_error(f"Authentication failed: {e}")
-    raise ValueError("GEE_PROJECT environment variables must be set.")
+# Pool limitado para gerar e baixar miniaturas em paralelo
+thumbnail_executor = ThreadPoolExecutor(max_workers=GEE_THUMBNAIL_WORKERS, thread_name_prefix='gee-thumbnail')
 
+# Pool dedicado às análises chamadas pelas ferramentas assíncronas (fora do executor padrão do event loop)
+executor = ThreadPoolExecutor(max_workers=GEE_WORKERS, thread_name_prefix='gee')
 
-def retrieve_sentinel_image(roi) -> PIL.Image:
-    sDate = ee.Date.fromYMD(datetime.date.today().year - 1, datetime.date.today().month, 1)
-    eDate= sDate.advance(1, 'year')
 
-    sentinel = (ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED')
-        .filterBounds(roi)
-        .filterDate(sDate, eDate)
-        .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE',10))
-        .median()
-    )
-    sentinel = sentinel.visualize(**{"bands": ["B4", "B3", "B2"], "min": 0, "max": 3000})
-    
-    return sentinel
+async def run_in_gee_executor(func, *args, timeout: Optional[float] = GEE_TIMEOUT, **kwargs):
+    """
+    Executa uma chamada síncrona do GEE no pool dedicado, sem bloquear o event loop.
+
+    Se a chamada for cancelada (ou estourar o timeout) enquanto ainda aguarda na fila do pool,
+    ela não chega a ser executada. Uma chamada já em andamento não pode ser interrompida: ela
+    termina na sua thread e o resultado é descartado. Até terminar, essa thread continua ocupando
+    uma das `GEE_WORKERS` vagas do pool, então timeouts seguidos reduzem a capacidade disponível.
+
+    A chamada roda em uma cópia do contexto atual, mantendo a fila do `gee_scheduler` (ex: BACKGROUND).
+
+    Args:
+        func (Callable): Função síncrona a executar.
+        timeout (Optional[float]): Tempo máximo de espera, em segundos (`None` para sem limite).
+
+    Raises:
+        RuntimeError: Se o tempo máximo for excedido.
+    """
+    loop = asyncio.get_running_loop()
+
+    try:
+        return await asyncio.wait_for(loop.run_in_executor(executor, contextvars.copy_context().run, partial(func, *args, **kwargs)), timeout=timeout)
+    except asyncio.TimeoutError:
+        log_warning(f"Análise do GEE excedeu {timeout} s: {getattr(func, '__name__', func)}")
+        raise RuntimeError(
+            "Peça desculpas e informe que a análise demorou mais que o esperado.\n"
+            "Peça ao usuário que tente novamente em alguns minutos."
+        )
+
+
+@lru_cache(maxsize=1)
+def initialize_earth_engine():
+    """
+    Autentica e inicializa o Earth Engine no primeiro uso.
+
+    Fica fora do import para que os módulos de ferramentas carreguem sem acesso à rede.
+    Em caso de falha nada é armazenado, e a próxima chamada tenta novamente.
+    """
+    if not GEE_SERVICE_ACCOUNT:
+        raise ValueError("GEE_SERVICE_ACCOUNT environment variables must be set.")
+    if not GEE_KEY_FILE:
+        raise ValueError("GEE_KEY_FILE environment variables must be set.")
+    if not GEE_PROJECT:
+        raise ValueError("GEE_PROJECT environment variables must be set.")
+
+    try:
+        credentials = ee.ServiceAccountCredentials(GEE_SERVICE_ACCOUNT, GEE_KEY_FILE)
+        ee.Initialize(credentials, project=GEE_PROJECT)
+    except Exception as e:
+        log_error(f"Authentication failed: {e}")
+        raise ValueError("GEE_PROJECT environment variables must be set.")
+
+
+def requires_earth_engine(func):
+    """Garante que o Earth Engine esteja inicializado antes da chamada."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        initialize_earth_engine()
+        return func(*args, **kwargs)
+    return wrapper
+
+# Execuções do GEE em andamento, compartilhadas entre chamadas idênticas concorrentes
+gee_flights = SingleFlight()
+
+
+def single_flight(func):
+    """
+    Compartilha uma única execução entre chamadas concorrentes idênticas: mesma operação,
+    mesma geometria (hash canônico de `coords`) e mesmos demais argumentos.
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+
+        arguments = dict(bound.arguments)
+        key = (func.__name__, geometry_fingerprint(arguments.pop('coords')), json.dumps(arguments, sort_keys=True, default=str))
+
+        return gee_flights.do(key, func, *args, **kwargs)
+    return wrapper
+
+# Erro máximo (em metros) aceito no contorno do imóvel em cada tipo de operação.
+IMAGE_ACCURACY_BUDGET = 30.0       # Imagens renderizadas com poucas centenas de pixels de lado
+STATISTICS_ACCURACY_BUDGET = 10.0  # Reduções sobre rasters de 30 m (MapBiomas, Copernicus DEM)
+
+
+def select_coords(rural_property: RuralProperty, accuracy_budget: float) -> List[List[List[List[float]]]]:
+    """
+    Seleciona as coordenadas do tier mais simplificado cujo erro cabe no orçamento de precisão.
+
+    Geometrias menores reduzem o payload das requisições ao GEE e o processamento de vértices no servidor.
+
+    Args:
+        rural_property (RuralProperty): Imóvel com as coordenadas de cada tier.
+        accuracy_budget (float): Erro máximo aceito, em metros.
+
+    Returns:
+        List: Coordenadas MultiPolygon (padrão GeoJSON) do tier escolhido.
+    """
+    for tier, tolerance in ((GeometryTier.THUMBNAIL, SICAR_THUMBNAIL_TOLERANCE), (GeometryTier.ANALYSIS, SICAR_ANALYSIS_TOLERANCE)):
+        if tolerance <= accuracy_budget:
+            return rural_property.get_coords(tier)
+
+    return rural_property.get_coords(GeometryTier.EXACT)
+
+
+# Assets do GEE consultados pelas ferramentas: nome -> (ID do asset, se é uma ImageCollection)
+GEE_ASSETS = {
+    'biomass': ('projects/mapbiomas-public/assets/brazil/lulc/collection10/mapbiomas_brazil_collection10_pasture_biomass_v2', False),
+    'age': ('projects/mapbiomas-public/assets/brazil/lulc/collection10/mapbiomas_brazil_collection10_pasture_age_v2', False),
+    'vigor': ('projects/mapbiomas-public/assets/brazil/lulc/collection10/mapbiomas_brazil_collection10_pasture_vigor_v3', False),
+    'integration': ('projects/mapbiomas-public/assets/brazil/lulc/collection10/mapbiomas_brazil_collection10_integration_v2', False),
+    'soil': ('projects/mapbiomas-public/assets/brazil/soil/collection3/mapbiomas_brazil_collection3_soil_textural_group_v1', True),
+    'dem': ('COPERNICUS/DEM/GLO30', True),
+}
+
+
+class AssetMetadataRegistry:
+    """
+    Cache (do processo) dos metadados dos assets do GEE.
+
+    Os metadados de todos os assets são resolvidos em um único getInfo() e renovados após o TTL.
+    Durante a renovação, e se ela falhar, as demais chamadas seguem com os metadados anteriores.
+
+    Args:
+        assets (Dict[str, Tuple[str, bool]]): Nome -> (ID do asset, se é uma ImageCollection).
+        ttl (float): Tempo de vida dos metadados, em segundos.
+    """
+
+    # Intervalo (em segundos) até uma nova tentativa quando a renovação falha
+    RETRY_INTERVAL = 60
+
+    def __init__(self, assets: Dict[str, Tuple[str, bool]], ttl: float):
+        self.assets = assets
+        self.ttl = ttl
+
+        self._metadata: Dict[str, AssetMetadata] = {}
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def _resolve(self) -> Dict[str, AssetMetadata]:
+        initialize_earth_engine()
+
+        query = {}
+
+        for name, (asset_id, is_collection) in self.assets.items():
+            asset = ee.ImageCollection(asset_id) if is_collection else ee.Image(asset_id)
+            image = ee.Image(asset.first()) if is_collection else asset
+
+            query[name] = ee.Dictionary({'bands': image.bandNames(), 'version': asset.get('system:version')})
+
+        info = get_info(ee.Dictionary(query))
+
+        return {
+            name: AssetMetadata.from_bands(asset_id, bands=info[name]['bands'], version=info[name].get('version'))
+            for name, (asset_id, _) in self.assets.items()
+        }
+
+    def refresh(self, blocking: bool = True):
+        """
+        Consulta os metadados no GEE se estiverem ausentes ou expirados.
+
+        Args:
+            blocking (bool): Se `False`, retorna imediatamente quando outra thread já estiver renovando.
+        """
+        if not self._lock.acquire(blocking=blocking):
+            return
+
+        try:
+            if time.monotonic() < self._expires_at:
+                return
+
+            try:
+                self._metadata = self._resolve()
+                self._expires_at = time.monotonic() + self.ttl
+            except Exception as error:
+                if not self._metadata:
+                    raise
+
+                log_warning(f"Falha ao renovar os metadados dos assets do GEE; mantendo os anteriores: {error}")
+                self._expires_at = time.monotonic() + min(self.ttl, self.RETRY_INTERVAL)
+        finally:
+            self._lock.release()
+
+    def get(self, name: str) -> AssetMetadata:
+        """
+        Retorna os metadados do asset, consultando o GEE apenas na primeira chamada e após o TTL.
+
+        Args:
+            name (str): Nome do asset em `GEE_ASSETS` (ex: 'biomass').
+
+        Returns:
+            AssetMetadata: Metadados do asset.
+        """
+        if time.monotonic() >= self._expires_at:
+            self.refresh(blocking=not self._metadata)
+
+        return self._metadata[name]
+
+    def version(self, *names: str) -> str:
+        """
+        Identificador combinado das versões dos assets informados (ex: para chaves de cache de resultados).
+
+        Args:
+            *names (str): Nomes dos assets em `GEE_ASSETS`.
+
+        Returns:
+            str: Versões separadas por '-'.
+        """
+        return '-'.join(str(self.get(name).version) for name in names)
+
+    def prefetch(self):
+        """
+        Resolve os metadados em segundo plano (ex: na inicialização do servidor), sem bloquear o chamador.
+        """
+        def _prefetch():
+            try:
+                with gee_scheduler.lane(BACKGROUND):
+                    self.refresh()
+            except Exception as error:
+                log_warning(f"Metadados dos assets do GEE não carregados na inicialização: {error}")
 
+        threading.Thread(target=_prefetch, name='gee-metadata', daemon=True).start()
 
+
+asset_metadata = AssetMetadataRegistry(GEE_ASSETS, ttl=GEE_METADATA_TTL)
+
+
+@lru_cache(maxsize=1)
+def get_local_raster_stats():
+    """
+    Carrega o backend local das estatísticas no primeiro uso (`GEE_STATS_BACKEND=local`).
+    """
+    from app.utils.scripts.raster_stats_scripts import LocalRasterStats
+
+    return LocalRasterStats(GEE_LOCAL_RASTER_PATH)
+
+
+def stats_asset_version(*names: str) -> str:
+    """
+    Versão dos dados usados pelo backend de estatísticas configurado (para as chaves do cache de resultados).
+
+    Args:
+        *names (str): Nomes dos assets em `GEE_ASSETS`.
+
+    Returns:
+        str: Versões separadas por '-' (prefixadas com 'local-' no backend local).
+    """
+    if GEE_STATS_BACKEND == 'local':
+        return 'local-' + get_local_raster_stats().version(*names)
+
+    return asset_metadata.version(*names)
+
+
+# Lado (em pixels) das imagens renderizadas pelo GEE
+FEATURE_IMAGE_DIMENSIONS = 256
+BIOMASS_IMAGE_DIMENSIONS = 512
+SOIL_IMAGE_DIMENSIONS = 256
+
+# Versão da renderização dos mapas (paletas, legendas, contorno). Incrementar invalida o cache de PNGs.
+IMAGE_STYLE_VERSION = 1
+
+image_cache = DiskLRUCache(GEE_IMAGE_CACHE_PATH, max_bytes=GEE_IMAGE_CACHE_SIZE * 1024 * 1024, suffix='.png')
+
+
+def sentinel_period() -> str:
+    """
+    Identifica a janela do mosaico Sentinel-2 recente (últimos 12 meses), no formato 'AAAA-MM_12m'.
+    """
+    return period_name(rolling_period())
+
+
+def retrieve_cached_png(
+    coords: List[List[List[List[float]]]],
+    product: str,
+    period: str,
+    dimensions: int,
+    render: Callable[[], PIL.Image],
+    version: Optional[Callable[[], str]] = None
+    ) -> bytes:
+    """
+    Retorna o PNG final de um mapa, renderizando no GEE apenas quando ele não está no cache em disco.
+
+    A chave é (hash da geometria, produto, período, dimensões, versão do estilo) e não depende do GEE.
+    Com `version`, a versão do asset usada na renderização fica gravada no próprio PNG: se a versão
+    atual for diferente o mapa é renderizado de novo e, se ela não puder ser resolvida (ex: GEE fora
+    do ar e metadados ainda não carregados), o PNG em disco é servido. Imagens de aviso (miniaturas
+    que falharam) não são guardadas.
+
+    Args:
+        coords: Coordenadas MultiPolygon (padrão GeoJSON) do mapa.
+        product (str): Nome do mapa (ex: 'rgb', 'biomass', 'soil').
+        period (str): Ano ou janela temporal dos dados do mapa.
+        dimensions (int): Lado da imagem solicitada ao GEE, em pixels.
+        render (Callable[[], PIL.Image]): Função que renderiza o mapa.
+        version (Callable[[], str], optional): Retorna a versão do asset do mapa.
+
+    Returns:
+        bytes: Conteúdo PNG do mapa.
+    """
+    key = (geometry_fingerprint(coords), product, str(period), dimensions, IMAGE_STYLE_VERSION)
+
+    try:
+        png = image_cache.get(key)
+    except OSError as e:
+        log_warning(f"Falha ao ler o cache de imagens: {e}")
+        png = None
+
+    current = None
+
+    if version is not None:
+        try:
+            current = version()
+        except Exception as e:
+            if png is None:
+                raise
+
+            log_warning(f"Versão do asset de '{product}' indisponível; servindo o mapa do cache em disco: {e}")
+            return png
+
+    if png is not None and (current is None or PIL.Image.open(BytesIO(png)).info.get('asset_version') == current):
+        return png
+
+    img = render()
+
+    pnginfo = PngInfo()
+
+    if current is not None:
+        pnginfo.add_text('asset_version', current)
+
+    buffer = BytesIO()
+    img.save(buffer, format="PNG", pnginfo=pnginfo)
+    png = buffer.getvalue()
+
+    if not img.info.get('placeholder'):
+        try:
+            image_cache.set(key, png)
+        except OSError as e:
+            log_warning(f"Falha ao gravar o cache de imagens: {e}")
+
+    return png
+
+
+def retrieve_sentinel_image(coords: List[List[List[List[float]]]], year: Optional[int] = None) -> ee.Image:
+    """
+    Imagem Sentinel-2 em cor verdadeira (RGB) usada como fundo dos mapas.
+
+    Args:
+        coords: Coordenadas MultiPolygon (padrão GeoJSON) da área.
+        year (int, optional): Ano civil do mosaico. Sem valor, usa os últimos 12 meses.
+
+    Returns:
+        ee.Image: Mosaico exportado da região ou mediana das cenas do imóvel (ver `SentinelCompositeService`).
+    """
+    period = rolling_period() if year is None else year_period(year)
+
+    return sentinel_composites.visualize(coords, period)
+
+
+@requires_earth_engine
 def retrieve_feature_images(coords: List[List[List[List[float]]]]) -> List[PIL.Image]:
     """
     Gera imagens de satélite individuais para cada polígono da propriedade rural.
+
+    As miniaturas são geradas e baixadas em paralelo (`GEE_THUMBNAIL_WORKERS`). Se apenas parte
+    delas falhar, as que falharam são substituídas por uma imagem de aviso na mesma posição.
     
     Args:
         coords: Lista de coordenadas representando o MultiPolygon da fazenda.
         
     Returns:
-        List[PIL.Image]: Uma lista de imagens (PIL.Image) correspondentes a cada polígono.
+        List[PIL.Image]: Uma lista de imagens (PIL.Image) correspondentes a cada polígono, na ordem de entrada.
     """
     try:
-        # 1. Cria a geometria total para otimizar a busca da imagem base
-        roi = ee.Geometry.MultiPolygon(coords)
-
-        today = datetime.date.today()
-        s_date = ee.Date.fromYMD(today.year - 1, today.month, 1)
-        e_date = s_date.advance(1, 'year')
-
-        # 2. Configura e processa a imagem base (feita apenas 1x para toda a fazenda)
-        base_collection = (
-            ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED')
-            .filterBounds(roi)
-            .filterDate(s_date, e_date)
-            .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE',10))
-            .median()
-        )
-        base_collection = base_collection.visualize(**{"bands": ["B4", "B3", "B2"], "min": 0, "max": 3000})
+        # 1. Mosaico base (feito apenas 1x para toda a fazenda)
+        base_collection = retrieve_sentinel_image(coords)
 
-        geometries = roi.geometries().getInfo()
+        # 2. Polígonos montados a partir das coordenadas locais (sem o getInfo() de roi.geometries())
+        features = [ee.Feature(ee.Geometry.Polygon(polygon)) for polygon in coords]
 
-        result_imgs = []
-
-        # 3. Itera diretamente sobre a lista Python (evita o .getInfo() que custa tempo e rede)
-        for geometry in geometries:
-            # Instancia apenas o polígono atual
-            feature = ee.Feature(geometry)
-
-            # 4. Desenha o contorno
+        def render(feature: ee.Feature) -> PIL.Image:
+            # 3. Desenha o contorno
             empty = ee.Image().byte()
             outline = empty.paint(ee.FeatureCollection([feature]), 1, 3)
             outline = outline.updateMask(outline)
             outline_rgb = outline.visualize(**{"palette":['FF0000']})
 
-            # 5. Mescla as imagens e recorta com a margem de 256m
+            # 4. Mescla as imagens e recorta com a margem de 256m
             final_image = base_collection.blend(outline_rgb).clip(feature.buffer(256).bounds())
 
-            # 6. Gera URL e faz download
-            url = final_image.getThumbURL({"dimensions": 256,"format": "png"})
+            # 5. Gera URL e faz download (dentro da cota do GEE)
+            content = download_thumbnail(final_image, FEATURE_IMAGE_DIMENSIONS)
+
+            # 6. Converte (load() decodifica ainda na thread do pool)
+            img_pil = PIL.Image.open(BytesIO(content))
+            img_pil.load()
+
+            return img_pil
 
-            response = requests.get(url, timeout=60)
-            response.raise_for_status() # Levanta requests.exceptions.HTTPError em caso de falha HTTP
+        # 7. Gera e baixa as miniaturas em paralelo, preservando a ordem dos polígonos (e a fila do scheduler)
+        futures = [thumbnail_executor.submit(contextvars.copy_context().run, render, feature) for feature in features]
 
-            # 7. Converte e armazena
-            img_pil = PIL.Image.open(BytesIO(response.content))
-            result_imgs.append(img_pil)
+        result_imgs, errors = [], []
 
-        return result_imgs
+        for index, future in enumerate(futures):
+            try:
+                result_imgs.append(future.result())
+            except Exception as error:
+                log_error(f"Falha na miniatura do polígono {index + 1}: {error}")
+                errors.append(error)
+                result_imgs.append(None)
+
+        # Só falha por completo se nenhuma imagem foi gerada; as demais viram um aviso no lugar
+        if len(errors) == len(result_imgs):
+            raise errors[0]
+
+        size = next(img.size for img in result_imgs if img is not None)
+
+        return [img if img is not None else get_placeholder_image(size) for img in result_imgs]
     
     except ee.EEException as error:
         log_error(traceback.format_exc())
@@ -133,6 +495,7 @@ def retrieve_feature_images(coords: List[List[List[List[float]]]]) -> List[PIL.I
         )
 
 
+@requires_earth_engine
 def retrieve_feature_biomass_image(coords: List[List[List[List[float]]]], year: int = None) -> PIL.Image:
     """
     Gera uma imagem de satélite com a camada de biomassa de pastagem sobreposta,
@@ -140,41 +503,28 @@ def retrieve_feature_biomass_image(coords: List[List[List[List[float]]]], year:
     
     Args:
         coords: Lista de coordenadas representando o MultiPolygon da fazenda.
+        year (int, optional): Ano da biomassa e do mosaico de fundo. Sem valor, usa o ano mais recente do asset.
         
     Returns:
         PIL.Image: Imagem final mesclada contendo satélite, biomassa, contorno e legenda.
     """
     try:
-        biomass_asset = ee.Image('projects/mapbiomas-public/assets/brazil/lulc/collection10/mapbiomas_brazil_collection10_pasture_biomass_v2')
-        biomass_asset_bands = biomass_asset.bandNames().getInfo()
-
-        max_year = int(biomass_asset_bands[-1].replace("biomass_", ""))
-        min_year = int(biomass_asset_bands[0].replace("biomass_", ""))
+        biomass_metadata = asset_metadata.get('biomass')
 
         if year is None:
-            year = max_year
+            year = biomass_metadata.max_year
 
-        if year < min_year or year > max_year:
-            raise ValueError(f"O ano deve estar entre {min_year} e {max_year}.")
+        biomass_band = biomass_metadata.band(year)
+        biomass_asset = ee.Image(biomass_metadata.asset_id)
         
-        # 1. Geometria e Datas
+        # 1. Geometria
         roi = ee.Geometry.MultiPolygon(coords)
 
-        s_date = ee.Date.fromYMD(year, 1, 1)
-        e_date = s_date.advance(1, 'year')
-
-        # 2. Imagem Base (Sentinel-2)
-        base_collection = (
-            ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED')
-            .filterBounds(roi)
-            .filterDate(s_date, e_date)
-            .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE',10))
-            .median()
-        )
-        base_collection = base_collection.visualize(**{"bands": ["B4", "B3", "B2"], "min": 0, "max": 3000}) 
+        # 2. Imagem Base (mosaico Sentinel-2 do ano)
+        base_collection = retrieve_sentinel_image(coords, year=year)
 
         # 3. Camada de Biomassa (MapBiomas)
-        biomass = biomass_asset.select([year - 2000]).clip(roi)
+        biomass = biomass_asset.select([biomass_band]).clip(roi)
         
         palette_biomass = ['#000033','#9400D3','#FF00FF','#00FFFF','#FFFFFF']
     
@@ -186,7 +536,7 @@ def retrieve_feature_biomass_image(coords: List[List[List[List[float]]]], year:
                 maxPixels=1e13
         )
 
-        stats_dict = stats_biomass_ee.getInfo()
+        stats_dict = get_info(stats_biomass_ee)
 
         # Busca as chaves dinamicamente (para não depender do nome exato da banda)
         min_key = next((k for k in stats_dict if k.endswith('_min')), None)
@@ -211,18 +561,15 @@ def retrieve_feature_biomass_image(coords: List[List[List[List[float]]]], year:
         final_image = final_image.blend(outline_rgb).clip(roi.buffer(256).bounds());
         
         # 8. Geração de URL e Download (Resolução ajustada para 512)
-        url = final_image.getThumbURL({"dimensions": 512,"format": "png"})
-        
-        resposta = requests.get(url, timeout=60)
-        resposta.raise_for_status()
+        content = download_thumbnail(final_image, BIOMASS_IMAGE_DIMENSIONS)
     
         # 9. Conversão PIL
-        img = PIL.Image.open(BytesIO(resposta.content))
+        img = PIL.Image.open(BytesIO(content))
 
         # 10. Inserção da Legenda (Usando os valores que já temos em memória)
         img = add_legend(
             img, 
-            title=f"Biomassa\npasto ({str(2024)})", 
+            title=f"Biomassa\npasto ({year})", 
             vmin=round(float(min_bio_val) * 0.09), # ton->pixel 
             vmax=round(float(max_bio_val) * 0.09), # ton->pixel
             palette=palette_biomass
@@ -262,6 +609,7 @@ def retrieve_feature_biomass_image(coords: List[List[List[List[float]]]], year:
         )
     
 
+@requires_earth_engine
 def retrieve_feature_soil_texture_image(coords: List[List[List[List[float]]]]):
     try:
         PALETTE = {
@@ -275,10 +623,10 @@ def retrieve_feature_soil_texture_image(coords: List[List[List[List[float]]]]):
 
         roi = ee.Geometry.MultiPolygon(coords)
 
-        s2 = retrieve_sentinel_image(roi)
+        s2 = retrieve_sentinel_image(coords)
         
         palette = ['#707070','#a83800','#aa8686','#298289','#fffe73','#d7c5a5']
-        idSoil = 'projects/mapbiomas-public/assets/brazil/soil/collection3/mapbiomas_brazil_collection3_soil_textural_group_v1'
+        idSoil, _ = GEE_ASSETS['soil']
         texture = (
             ee.ImageCollection(idSoil).toBands()
                 .select(['textural_group_000_030_v1_textural_group'])
@@ -308,15 +656,11 @@ def retrieve_feature_soil_texture_image(coords: List[List[List[List[float]]]]):
         final_image = s2.blend(texture.clip(roi))
         final_image = final_image.blend(outline_rgb).clip(roi.buffer(256).bounds());
             
-        # Gerando a url
-        url = final_image.getThumbURL({"dimensions": 256,"format": "png"})
-            
-        # Download
-        resposta = requests.get(url, timeout=60)
-        resposta.raise_for_status()
+        # Gerando a url e fazendo o download
+        content = download_thumbnail(final_image, SOIL_IMAGE_DIMENSIONS)
         
         # Converter para PIL.Image
-        img_pil = PIL.Image.open(BytesIO(resposta.content)) 
+        img_pil = PIL.Image.open(BytesIO(content)) 
         img_pil = add_legend_descriptor(img_pil,"Textura Solo", PALETTE)
 
         return img_pil
@@ -351,158 +695,197 @@ def retrieve_feature_soil_texture_image(coords: List[List[List[List[float]]]]):
         )
     
 
-def query_pasture_statistics(coords: List[List[List[List[float]]]], year: int) -> PropertyStats:
+# Classes de idade da pastagem (anos), de vigor e de uso e cobertura do MapBiomas
+PASTURE_AGE_CLASSES = {'1':'1-10', '2':'10-20', '3':'20-30', '4':'30-40'}
+
+PASTURE_VIGOR_CLASSES = {
+    '1':'Baixo: pastagens com baixo vigor vegetativo e indícios de degradação severa, potencialmente biológica.',
+    '2':'Médio: pastagens com médio vigor vegativo e indícios de degração moderada.',
+    '3':'Alto: pastagens com alto vigor vegetativo.'
+}
+
+LULC_CLASSES = {
+    '3':'Formação Florestal', '4':'Formação Savânica', '5':'Mangue',
+    '6':'Floresta Alagável', '9':'Silvicultura', '11':'Campo Alagado e Área Pantanosa',
+    '12':'Formação Campestre', '15':'Pastagem', '19':'Lavoura Temporária',
+    '20':'Cana', '29':'Afloramento Rochoso', '39':'Soja', '46':'Café',
+    '32':'Apicum', '35':'Dendê', '36':'Lavoura Perene', '40':'Arroz',
+    '41':'Outras Lavouras Temporárias', '47':'Citrus',
+    '48':'Outras Lavouras Perenes', '49':'Restinga Arbórea', '50':'Restinga Herbácea',
+    '62':'Algodão', '21':'Mosaico de Usos', '23':'Praia, Duna e Areal',
+    '24':'Área Urbanizada', '30':'Mineração', '75':'Usina Fotovoltaica (beta)',
+    '25':'Outras Áreas não Vegetadas', '26':"Corpo D'água", '33':'Rio, Lago e Oceano',
+    '31':'Aquicultura', '27':'Não observado'
+}
+
+
+def _classify_pasture_age(age: ee.Image) -> ee.Image:
     """
-    Extração de estatísticas de pastagem (biomassa, vigor, idade e chuva).
+    Agrupa a idade da pastagem nas classes de `PASTURE_AGE_CLASSES` (banda a banda).
+    """
+    age = age.subtract(200)
+    age = age.where(age.eq(-100), 40)
+
+    return (age.where(age.gte(1).And(age.lte(10)), 1)
+               .where(age.gt(10).And(age.lte(20)), 2)
+               .where(age.gt(20).And(age.lte(30)), 3)
+               .where(age.gt(30).And(age.lte(40)), 4))
+
+
+def _build_pasture_stats(year: int, biomass: Optional[float], age: List[dict], vigor: List[dict], lulc: List[dict]) -> PastureStats:
+    """
+    Monta o PastureStats de um ano a partir das reduções já resolvidas.
+
+    Args:
+        year (int): Ano das estatísticas.
+        biomass (Optional[float]): Soma dos pixels de biomassa na área.
+        age (List[dict]): Área (ha) por classe de idade, como {'class', 'sum'}.
+        vigor (List[dict]): Área (ha) por classe de vigor, como {'class', 'sum'}.
+        lulc (List[dict]): Área (ha) por classe de uso e cobertura, como {'class', 'sum'}.
+
+    Returns:
+        PastureStats: Estatísticas de pastagem do ano.
     """
     from app.utils.interfaces.property_stats import Value, BiomassData, AgeData, VigorData, LULCClassData
 
-    try:
-        biomass_asset = ee.Image('projects/mapbiomas-public/assets/brazil/lulc/collection10/mapbiomas_brazil_collection10_pasture_biomass_v2')
-        biomass_asset_bands = biomass_asset.bandNames().getInfo()
+    biomass_data = BiomassData(amount=Value(value=(biomass or 0) * 0.09, unity="tonelada(s) de matéria seca anual"))
 
-        max_year = int(biomass_asset_bands[-1].replace("biomass_", ""))
-        min_year = int(biomass_asset_bands[0].replace("biomass_", ""))
+    age_data_list: List[AgeData] = []
 
-        if year < min_year or year > max_year:
-            raise ValueError(f"O ano deve estar entre {min_year} e {max_year}.")
+    for group in age or []:
+        class_id = str(int(group['class']))
+        class_name = PASTURE_AGE_CLASSES.get(class_id)
 
-        roi = ee.Geometry.MultiPolygon(coords)
+        area_value = round(float(group['sum']))
 
-        # ==================== Query Biomass ====================
-        biomass_asset = ee.Image('projects/mapbiomas-public/assets/brazil/lulc/collection10/mapbiomas_brazil_collection10_pasture_biomass_v2')
-        last_biomass = biomass_asset.select(year - 2000)
-        
-        stats = last_biomass.reduceRegion(
-                    reducer=ee.Reducer.sum(),
-                    geometry=roi,
-                    scale=30,
-                    maxPixels=1e13)
+        age_data = AgeData(age=class_name, amount=Value(value=area_value, unity="hectares (ha)"))
+        age_data_list.append(age_data)
 
-        biomass_data = BiomassData(amount=Value(value=stats.getInfo()[f'biomass_{year}'] * 0.09, unity="tonelada(s) de matéria seca anual"))
+    vigor_data_list: List[VigorData] = []
 
-        # ==================== Query Age ====================
-        AGE_DICT = {'1':'1-10', '2':'10-20', '3':'20-30', '4':'30-40'}
+    for group in vigor or []:
+        class_id = str(int(group['class']))
+        vigor_name = PASTURE_VIGOR_CLASSES.get(class_id)
 
-        age_asset = ee.Image('projects/mapbiomas-public/assets/brazil/lulc/collection10/mapbiomas_brazil_collection10_pasture_age_v2')
-        last_age = age_asset.select(year - 2000)
+        area_value = round(float(group['sum']), 2)
 
-        last_age = last_age.subtract(200)
-        last_age = last_age.where(last_age.eq(-100), 40)
-        last_age = (last_age.where(last_age.gte(1).And(last_age.lte(10)), 1)
-                            .where(last_age.gt(10).And(last_age.lte(20)), 2)
-                            .where(last_age.gt(20).And(last_age.lte(30)), 3)
-                            .where(last_age.gt(30).And(last_age.lte(40)), 4)
-                    ).rename('Anos');
+        vigor_data = VigorData(vigor=vigor_name, amount=Value(value=area_value, unity="hectares (ha)"))
+        vigor_data_list.append(vigor_data)
 
-        areaImg = ee.Image.pixelArea().divide(10000).addBands(last_age)
+    lulc_class_data_list: List[LULCClassData] = []
 
-        stats = areaImg.reduceRegion(
-            reducer=ee.Reducer.sum().group(groupField=1, groupName='class'),
-            geometry=roi,
-            scale=30,
-            maxPixels=1e13
-        )
+    for group in lulc or []:
+        class_id = str(int(group['class']))
+        class_name = LULC_CLASSES.get(class_id)
 
-        groups_info = stats.get('groups').getInfo()
+        area_value = round(float(group['sum']), 2)
 
-        age_data_list: List[AgeData] = []
+        class_data = LULCClassData(lulc_class=class_name, amount=Value(value=area_value, unity="hectares"))
+        lulc_class_data_list.append(class_data)
 
-        if groups_info:
-            for group in groups_info:
-                class_id = str(int(group['class']))
-                class_name = AGE_DICT.get(class_id)
-                
-                area_value = round(float(group['sum']))
-                
-                age_data = AgeData(age=class_name, amount=Value(value=area_value, unity="hectares (ha)"))
-                age_data_list.append(age_data)
+    return PastureStats(
+        biomass=biomass_data,
+        age=age_data_list,
+        vigor=vigor_data_list,
+        lulc_class=lulc_class_data_list,
+        year=year
+        )
 
-        # ==================== Query Vigor ====================
-        VIGOR_DICT = {
-            '1':'Baixo: pastagens com baixo vigor vegetativo e indícios de degradação severa, potencialmente biológica.',
-            '2':'Médio: pastagens com médio vigor vegativo e indícios de degração moderada.',
-            '3':'Alto: pastagens com alto vigor vegetativo.'
-        }
 
-        vigor_asset = ee.Image('projects/mapbiomas-public/assets/brazil/lulc/collection10/mapbiomas_brazil_collection10_pasture_vigor_v3')
-        last_vigor = vigor_asset.select(year - 2000)
+def _query_pasture_statistics_locally(coords: List[List[List[List[float]]]], years: List[int]) -> Dict[int, PastureStats]:
+    """
+    Estatísticas de pastagem dos anos informados calculadas sobre os rasters locais.
+    """
+    try:
+        reductions = get_local_raster_stats().pasture_reductions(coords, years)
 
-        areaImg = ee.Image.pixelArea().divide(10000).addBands(last_vigor)
+        return {year: _build_pasture_stats(year, **reduction) for year, reduction in reductions.items()}
 
-        stats = areaImg.reduceRegion(
-            reducer=ee.Reducer.sum().group(groupField=1, groupName='class'),
-            geometry=roi,
-            scale=30,
-            maxPixels=1e13
+    except ValueError as error:
+        log_error(traceback.format_exc())
+        raise RuntimeError(
+            f"Peça desculpas e informe que houve um erro: {error}\n"
+            "Peça ao usuário que escolha anos dentro do intervalo disponível."
+        )
+    except Exception as error:
+        log_error(traceback.format_exc())
+        raise RuntimeError(
+            f"Peça desculpas e informe que houve um erro inesperado.\n"
+            "Peça ao usuário que tente novamente mais tarde."
         )
 
-        groups_info = stats.get('groups').getInfo()
 
-        vigor_data_list: List[VigorData] = []
+@single_flight
+def query_pasture_statistics(coords: List[List[List[List[float]]]], year: int) -> PastureStats:
+    """
+    Extração de estatísticas de pastagem (biomassa, vigor, idade e uso do solo) pelo backend de `GEE_STATS_BACKEND`.
+    """
+    if GEE_STATS_BACKEND == 'local':
+        return _query_pasture_statistics_locally(coords, years=[year])[year]
 
-        if groups_info:
-            for group in groups_info:
-                class_id = str(int(group['class']))
-                vigor_name = VIGOR_DICT.get(class_id)
-                
-                area_value = round(float(group['sum']), 2)
-                
-                vigor_data = VigorData(vigor=vigor_name, amount=Value(value=area_value, unity="hectares (ha)"))
-                vigor_data_list.append(vigor_data)
+    return _query_pasture_statistics_gee(coords, year)
 
-        # ==================== Query Class ====================
-        CLASSES = {
-            '3':'Formação Florestal', '4':'Formação Savânica', '5':'Mangue',
-            '6':'Floresta Alagável', '9':'Silvicultura', '11':'Campo Alagado e Área Pantanosa',
-            '12':'Formação Campestre', '15':'Pastagem', '19':'Lavoura Temporária',
-            '20':'Cana', '29':'Afloramento Rochoso', '39':'Soja', '46':'Café',
-            '32':'Apicum', '35':'Dendê', '36':'Lavoura Perene', '40':'Arroz',
-            '41':'Outras Lavouras Temporárias', '47':'Citrus',
-            '48':'Outras Lavouras Perenes', '49':'Restinga Arbórea', '50':'Restinga Herbácea',
-            '62':'Algodão', '21':'Mosaico de Usos', '23':'Praia, Duna e Areal',
-            '24':'Área Urbanizada', '30':'Mineração', '75':'Usina Fotovoltaica (beta)',
-            '25':'Outras Áreas não Vegetadas', '26':"Corpo D'água", '33':'Rio, Lago e Oceano',
-            '31':'Aquicultura', '27':'Não observado'
-        }
 
-        class_asset = ee.Image('projects/mapbiomas-public/assets/brazil/lulc/collection10/mapbiomas_brazil_collection10_integration_v2')
-        last_class = class_asset.select(year - 2000)
+def _grouped_area(image: ee.Image, roi: ee.Geometry) -> ee.List:
+    """
+    Área (ha) por classe de uma banda, como lista de {'class', 'sum'} (avaliada no servidor).
+
+    Soma exata do `pixelArea` de cada classe, usada tanto na estatística anual quanto na série
+    temporal para que o mesmo ano tenha as mesmas áreas nas duas ferramentas.
+    """
+    stats = ee.Image.pixelArea().divide(10000).addBands(image).reduceRegion(
+        reducer=ee.Reducer.sum().group(groupField=1, groupName='class'),
+        geometry=roi,
+        scale=30,
+        maxPixels=1e13
+    )
+    return stats.get('groups')
 
-        areaImg = ee.Image.pixelArea().divide(10000).addBands(last_class)
 
-        stats = areaImg.reduceRegion(
-            reducer=ee.Reducer.sum().group(groupField=1, groupName='class'),
-            geometry=roi,
-            scale=30,
-            maxPixels=1e13
-        )
+@requires_earth_engine
+def _query_pasture_statistics_gee(coords: List[List[List[List[float]]]], year: int) -> PastureStats:
+    """
+    Extração de estatísticas de pastagem (biomassa, vigor, idade e uso do solo) no GEE.
+    """
+    try:
+        roi = ee.Geometry.MultiPolygon(coords)
 
-        groups_info = stats.get('groups').getInfo()
+        # ==================== Query Biomass ====================
+        biomass_metadata = asset_metadata.get('biomass')
+        biomass_band = biomass_metadata.band(year)
 
-        lulc_class_data_list: List[LULCClassData] = []
+        biomass = ee.Image(biomass_metadata.asset_id).select(biomass_band).reduceRegion(
+                    reducer=ee.Reducer.sum(),
+                    geometry=roi,
+                    scale=30,
+                    maxPixels=1e13
+                    ).get(biomass_band)
 
-        if groups_info:
-            for group in groups_info:
-                class_id = str(int(group['class']))
-                class_name = CLASSES.get(class_id)
-                
-                area_value = round(float(group['sum']), 2)
-                
-                class_data = LULCClassData(lulc_class=class_name, amount=Value(value=area_value, unity="hectares"))
-                lulc_class_data_list.append(class_data)
+        # ==================== Query Age ====================
+        age_metadata = asset_metadata.get('age')
+        last_age = _classify_pasture_age(ee.Image(age_metadata.asset_id).select(age_metadata.band(year))).rename('Anos')
 
-        # ==================== Final Result ====================
+        # ==================== Query Vigor ====================
+        vigor_metadata = asset_metadata.get('vigor')
+        last_vigor = ee.Image(vigor_metadata.asset_id).select(vigor_metadata.band(year))
 
-        result = PastureStats(
-            biomass=biomass_data,
-            age=age_data_list,
-            vigor=vigor_data_list,
-            lulc_class=lulc_class_data_list,
-            year=year
-            )
+        # ==================== Query Class ====================
+        class_metadata = asset_metadata.get('integration')
+        last_class = ee.Image(class_metadata.asset_id).select(class_metadata.band(year))
+
+        # ==================== Single Request ====================
+        # As quatro reduções seguem em um único ee.Dictionary e são resolvidas em um só getInfo().
+        # O ano já foi validado acima com os metadados em cache (`asset_metadata`).
+        stats = get_info(ee.Dictionary({
+            'biomass': biomass,
+            'age': _grouped_area(last_age, roi),
+            'vigor': _grouped_area(last_vigor, roi),
+            'lulc': _grouped_area(last_class, roi),
+        }))
+
+        # ==================== Final Result ====================
 
-        return result
+        return _build_pasture_stats(year, biomass=stats['biomass'], age=stats['age'], vigor=stats['vigor'], lulc=stats['lulc'])
     
     except ValueError as error:
         log_error(traceback.format_exc())
@@ -534,15 +917,159 @@ def query_pasture_statistics(coords: List[List[List[List[float]]]], year: int) -
             f"Peça desculpas e informe que houve um erro inesperado.\n"
             "Peça ao usuário que tente novamente mais tarde."
         )
+
+@single_flight
+def query_pasture_time_series(coords: List[List[List[List[float]]]], years: List[int]) -> PastureTimeSeries:
+    """
+    Extração das estatísticas de pastagem de vários anos pelo backend de `GEE_STATS_BACKEND`.
+    """
+    if GEE_STATS_BACKEND == 'local':
+        return PastureTimeSeries(series=_query_pasture_statistics_locally(coords, years=sorted(set(years))))
+
+    return _query_pasture_time_series_gee(coords, years)
+
+
+def _build_pasture_series(years: List[int], reductions: Dict[str, Any]) -> PastureTimeSeries:
+    """
+    Monta a série a partir das reduções resolvidas no GEE.
+
+    Args:
+        years (List[int]): Anos da série, em ordem crescente.
+        reductions (Dict[str, Any]): 'biomass' (soma por banda 'biomass_<ano>') e as áreas agrupadas
+            de cada ano em '<age|vigor|lulc>_<ano>'.
+
+    Returns:
+        PastureTimeSeries: Estatísticas de pastagem indexadas pelo ano.
+    """
+    return PastureTimeSeries(series={
+        year: _build_pasture_stats(
+            year,
+            biomass=reductions['biomass'].get(f'biomass_{year}'),
+            age=reductions.get(f'age_{year}') or [],
+            vigor=reductions.get(f'vigor_{year}') or [],
+            lulc=reductions.get(f'lulc_{year}') or []
+        )
+        for year in years
+    })
+
+
+@requires_earth_engine
+def _query_pasture_time_series_gee(coords: List[List[List[List[float]]]], years: List[int]) -> PastureTimeSeries:
+    """
+    Extração das estatísticas de pastagem de vários anos em uma única requisição ao GEE.
+
+    A biomassa dos anos pedidos é somada em uma só redução sobre as bandas empilhadas. As áreas
+    por classe de idade, vigor e uso do solo de cada ano usam a mesma soma agrupada do `pixelArea`
+    de `get_pasture_stats`, e todas as reduções seguem em um único ee.Dictionary (um só getInfo).
+
+    Args:
+        coords: Lista de coordenadas representando o MultiPolygon da fazenda.
+        years (List[int]): Anos da série.
+
+    Returns:
+        PastureTimeSeries: Estatísticas de pastagem indexadas pelo ano.
+    """
+    try:
+        years = sorted(set(years))
+
+        if not years:
+            raise ValueError("Nenhum ano foi informado para a série.")
+
+        roi = ee.Geometry.MultiPolygon(coords)
+
+        def stack(name: str, prefix: str) -> ee.Image:
+            """Bandas dos anos pedidos do asset, renomeadas para '<prefix>_<ano>'."""
+            metadata = asset_metadata.get(name)
+            return ee.Image(metadata.asset_id).select([metadata.band(year) for year in years], [f'{prefix}_{year}' for year in years])
+
+        classes = {
+            'age': _classify_pasture_age(stack('age', 'age')),
+            'vigor': stack('vigor', 'vigor'),
+            'lulc': stack('integration', 'lulc'),
+        }
+
+        reductions = {
+            'biomass': stack('biomass', 'biomass').reduceRegion(
+                reducer=ee.Reducer.sum(),
+                geometry=roi,
+                scale=30,
+                maxPixels=1e13
+            ),
+            **{
+                f'{name}_{year}': _grouped_area(image.select(f'{name}_{year}'), roi)
+                for name, image in classes.items()
+                for year in years
+            }
+        }
+
+        return _build_pasture_series(years, get_info(ee.Dictionary(reductions)))
+
+    except ValueError as error:
+        log_error(traceback.format_exc())
+        raise RuntimeError(
+            f"Peça desculpas e informe que houve um erro: {error}\n"
+            "Peça ao usuário que escolha anos dentro do intervalo disponível."
+        )
+    except ee.EEException as error:
+        log_error(traceback.format_exc())
+        raise RuntimeError(
+            f"Peça desculpas e informe que houve uma falha de processamento.\n"
+            "Peça ao usuário que tente novamente mais tarde."
+        )
+    except requests.exceptions.RequestException as error:
+        log_error(traceback.format_exc())
+        raise RuntimeError(
+            f"Peça desculpas e informe que houve um problema de conexão com o servidor de imagens do satélite.\n"
+            "Peça ao usuário que tente novamente mais tarde."
+        )
+    except Exception as error:
+        log_error(traceback.format_exc())
+        raise RuntimeError(
+            f"Peça desculpas e informe que houve um erro inesperado.\n"
+            "Peça ao usuário que tente novamente mais tarde."
+        )
     
 
-def query_topographic_stats(coords: List[List[List[List[float]]]]):
+@single_flight
+def query_topographic_stats(coords: List[List[List[List[float]]]]) -> TopographicStats:
+    """
+    Altitude e declividade médias do imóvel pelo backend de `GEE_STATS_BACKEND`.
+    """
+    if GEE_STATS_BACKEND == 'local':
+        return _query_topographic_stats_locally(coords)
+
+    return _query_topographic_stats_gee(coords)
+
+
+def _query_topographic_stats_locally(coords: List[List[List[List[float]]]]) -> TopographicStats:
+    """
+    Altitude e declividade médias do imóvel calculadas sobre o DEM local.
+    """
+    from app.utils.interfaces.property_stats import Value
+
+    try:
+        elevation, slope = get_local_raster_stats().topographic_reductions(coords)
+    except ValueError as error:
+        log_error(traceback.format_exc())
+        raise RuntimeError(
+            f"Peça desculpas e informe que houve um erro: {error}\n"
+            "Peça ao usuário que tente novamente mais tarde."
+        )
+
+    return TopographicStats(
+        elevation=Value(value=round(elevation, 2), unity="metros"),
+        slope=Value(value=round(slope, 2), unity="graus")
+    )
+
+
+@requires_earth_engine
+def _query_topographic_stats_gee(coords: List[List[List[List[float]]]]) -> TopographicStats:
     from app.utils.interfaces.property_stats import Value
 
     roi = ee.Geometry.MultiPolygon(coords)
     
     #Buscar a coleção
-    dem_col = ee.ImageCollection("COPERNICUS/DEM/GLO30").filterBounds(roi)
+    dem_col = ee.ImageCollection(GEE_ASSETS['dem'][0]).filterBounds(roi)
     
     #Pegar a projeção de uma imagem original para não perder a escala em metros
     proj = dem_col.first().projection()
@@ -569,8 +1096,8 @@ def query_topographic_stats(coords: List[List[List[List[float]]]]):
     )
 
     #Converter o valor de elevacao e declividade
-    res_elev = statsdem.getInfo().get('DEM', 0)
-    res_slope = statsslope.getInfo().get('slope', 0)
+    res_elev = get_info(statsdem).get('DEM', 0)
+    res_slope = get_info(statsslope).get('slope', 0)
 
     #Retornar os valores de elevação e declividade
     return TopographicStats(
@@ -82,6 +82,25 @@ def get_mosaic(imgs: list[PIL.Image]) -> Image:
 
     return mosaic
 
+def get_placeholder_image(size: tuple[int, int], text: str = "Imagem indisponível") -> Image:
+    """
+    Cria uma imagem cinza com um aviso, usada no lugar de uma miniatura que falhou.
+    """
+    try:
+        font = ImageFont.truetype("assets/fonts/DejaVuSans-Bold.ttf", 14)
+    except:
+        font = ImageFont.load_default()
+
+    placeholder = Image.new("RGB", size, "#d0d0d0")
+
+    draw = ImageDraw.Draw(placeholder)
+    draw.text((size[0] // 2, size[1] // 2), text, font=font, fill="black", anchor="mm")
+
+    # Marca a imagem para que ela não seja guardada em caches
+    placeholder.info['placeholder'] = True
+
+    return placeholder
+
 #Adicionar a legenda no mapa
 def add_legend(img: Image, title: str, vmin: int, vmax: int, palette: list) -> Image:
     """Desenha uma barra de cores contínua na imagem PIL com respiro após o título."""
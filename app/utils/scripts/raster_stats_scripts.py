@@ -0,0 +1,257 @@
+import math
+import shapely
+import threading
+import rasterio
+import numpy as np
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from rasterio.windows import Window
+from rasterio.warp import transform_geom
+
+from app.utils.interfaces.asset_metadata import AssetMetadata
+
+
+# Raio da Terra (m) usado na área dos pixels em graus, o mesmo da esfera do `ee.Image.pixelArea`
+EARTH_RADIUS = 6_378_137
+
+# Classe 0 dos rasters do MapBiomas representa ausência de dado (pixel mascarado no GEE)
+NO_CLASS = 0
+
+# Camadas locais: nome (igual ao de `GEE_ASSETS`) -> arquivo COG dentro do diretório
+RASTER_FILES = {
+    'biomass': 'biomass.tif',
+    'age': 'age.tif',
+    'vigor': 'vigor.tif',
+    'integration': 'integration.tif',
+    'dem': 'dem.tif',
+}
+
+
+def classify_pasture_age(age: np.ndarray) -> np.ndarray:
+    """
+    Agrupa a idade da pastagem nas classes de `PASTURE_AGE_CLASSES` (mesma regra de `_classify_pasture_age`).
+    """
+    age = age.astype(np.int32) - 200
+    age = np.where(age == -100, 40, age)
+
+    classes = age.copy()
+    classes[(age >= 1) & (age <= 10)] = 1
+    classes[(age > 10) & (age <= 20)] = 2
+    classes[(age > 20) & (age <= 30)] = 3
+    classes[(age > 30) & (age <= 40)] = 4
+
+    return classes
+
+
+def grouped_area(values: np.ndarray, area: np.ndarray, valid: np.ndarray) -> List[dict]:
+    """
+    Área (ha) por classe, no mesmo formato da redução agrupada do GEE ({'class', 'sum'}).
+
+    Args:
+        values (np.ndarray): Classes dos pixels.
+        area (np.ndarray): Área (ha) de cada pixel, com o mesmo formato de `values`.
+        valid (np.ndarray): Pixels dentro do imóvel e com dado.
+
+    Returns:
+        List[dict]: Área somada por classe, em ordem crescente de classe.
+    """
+    valid = valid & (values != NO_CLASS)
+
+    if not valid.any():
+        return []
+
+    classes, inverse = np.unique(values[valid], return_inverse=True)
+    sums = np.bincount(inverse, weights=area[valid])
+
+    return [{'class': float(value), 'sum': float(total)} for value, total in zip(classes, sums)]
+
+
+class LocalRasterStats:
+    """
+    Estatísticas de pastagem e topografia calculadas a partir de cópias locais (COG) dos rasters.
+
+    Equivalente local das reduções do GEE: apenas a janela do bbox do imóvel é lida do arquivo,
+    o polígono é rasterizado pelo centro dos pixels e as áreas por classe são somadas de forma
+    vetorizada. Os arquivos de `RASTER_FILES` ficam em `directory`, com uma banda por ano nomeada
+    como no GEE (ex: 'biomass_2024'); o DEM tem uma única banda de altitude em metros.
+
+    Cada arquivo é aberto uma única vez e reaproveitado entre as consultas. Como o handle do GDAL
+    não é seguro entre threads, as leituras de um mesmo arquivo são feitas uma de cada vez.
+
+    Args:
+        directory (Path): Diretório com os arquivos COG.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+        self._metadata: Dict[str, AssetMetadata] = {}
+        self._datasets: Dict[str, Tuple[rasterio.DatasetReader, threading.Lock]] = {}
+        self._lock = threading.Lock()
+
+    def path(self, name: str) -> Path:
+        return self.directory / RASTER_FILES[name]
+
+    def _dataset(self, name: str) -> Tuple[rasterio.DatasetReader, threading.Lock]:
+        """
+        Arquivo aberto da camada (na primeira chamada) e o lock que serializa as suas leituras.
+        """
+        with self._lock:
+            if name not in self._datasets:
+                self._datasets[name] = (rasterio.open(self.path(name)), threading.Lock())
+
+            return self._datasets[name]
+
+    def metadata(self, name: str) -> AssetMetadata:
+        """
+        Bandas, anos e versão do raster local (tag 'version' do arquivo ou, sem ela, a data de modificação).
+        """
+        with self._lock:
+            if name in self._metadata:
+                return self._metadata[name]
+
+        path = self.path(name)
+        dataset, read_lock = self._dataset(name)
+
+        with read_lock:
+            bands = [description or f'b{index}' for index, description in enumerate(dataset.descriptions, start=1)]
+            version = dataset.tags().get('version')
+
+        version = int(version) if version and version.isdigit() else int(path.stat().st_mtime)
+
+        with self._lock:
+            return self._metadata.setdefault(name, AssetMetadata.from_bands(str(path), bands, version=version))
+
+    def version(self, *names: str) -> str:
+        """
+        Identificador combinado das versões dos rasters informados (ex: para chaves de cache de resultados).
+        """
+        return '-'.join(str(self.metadata(name).version) for name in names)
+
+    def _read(self, name: str, coords: List[List[List[List[float]]]], bands: List[str], pad: int = 0) -> Tuple[np.ma.MaskedArray, np.ndarray, np.ndarray, rasterio.Affine, bool]:
+        """
+        Lê a janela do bbox do imóvel (com `pad` pixels de margem) e rasteriza o polígono.
+
+        Returns:
+            Tuple: Bandas lidas (mascaradas onde não há dado), máscara dos pixels dentro do imóvel,
+                área (ha) de cada pixel, transformação da janela e se o raster está em graus.
+        """
+        metadata = self.metadata(name)
+        geometry = {'type': 'MultiPolygon', 'coordinates': coords}
+
+        dataset, read_lock = self._dataset(name)
+
+        with read_lock:
+            geographic = dataset.crs is None or dataset.crs.is_geographic
+
+            if dataset.crs is not None and dataset.crs.to_epsg() != 4326:
+                geometry = transform_geom('EPSG:4326', dataset.crs, geometry)
+
+            polygon = shapely.geometry.shape(geometry)
+            min_x, min_y, max_x, max_y = polygon.bounds
+            transform = dataset.transform
+
+            col_start = max(math.floor((min_x - transform.c) / transform.a) - pad, 0)
+            col_end = min(math.ceil((max_x - transform.c) / transform.a) + pad, dataset.width)
+            row_start = max(math.floor((max_y - transform.f) / transform.e) - pad, 0)
+            row_end = min(math.ceil((min_y - transform.f) / transform.e) + pad, dataset.height)
+
+            if col_end <= col_start or row_end <= row_start:
+                raise ValueError("A área está fora da cobertura dos rasters locais.")
+
+            window = Window(col_start, row_start, col_end - col_start, row_end - row_start)
+            indexes = [metadata.bands.index(band) + 1 for band in bands]
+
+            data = dataset.read(indexes, window=window, masked=True)
+            window_transform = dataset.window_transform(window)
+
+        # Rasterização pelo centro dos pixels (pixel dentro do imóvel se o centro estiver no polígono)
+        rows, cols = data.shape[1:]
+        xs = window_transform.c + (np.arange(cols) + 0.5) * window_transform.a
+        ys = window_transform.f + (np.arange(rows) + 0.5) * window_transform.e
+        inside = shapely.contains_xy(polygon, *np.meshgrid(xs, ys))
+
+        if geographic:
+            # Área de cada linha de pixels na esfera: R² · Δλ · |sen φ1 - sen φ2|
+            tops = np.radians(window_transform.f + np.arange(rows) * window_transform.e)
+            bottoms = np.radians(window_transform.f + (np.arange(rows) + 1) * window_transform.e)
+            row_area = EARTH_RADIUS ** 2 * math.radians(abs(window_transform.a)) * np.abs(np.sin(tops) - np.sin(bottoms))
+            area = np.broadcast_to(row_area[:, None] / 10_000, (rows, cols))
+        else:
+            area = np.full((rows, cols), abs(window_transform.a * window_transform.e) / 10_000)
+
+        return data, inside, area, window_transform, geographic
+
+    def pasture_reductions(self, coords: List[List[List[List[float]]]], years: List[int]) -> Dict[int, dict]:
+        """
+        Soma da biomassa e área (ha) por classe de idade, vigor e uso do solo de cada ano.
+
+        Args:
+            coords: Coordenadas MultiPolygon (padrão GeoJSON) do imóvel.
+            years (List[int]): Anos da análise.
+
+        Returns:
+            Dict[int, dict]: Por ano, {'biomass', 'age', 'vigor', 'lulc'} no formato das reduções do GEE.
+
+        Raises:
+            ValueError: Se algum ano não estiver disponível ou a área estiver fora dos rasters.
+        """
+        layers = {}
+
+        for name in ('biomass', 'age', 'vigor', 'integration'):
+            metadata = self.metadata(name)
+            layers[name] = self._read(name, coords, [metadata.band(year) for year in years])
+
+        def groups(name: str, index: int, classify=lambda values: values) -> List[dict]:
+            data, inside, area, _, _ = layers[name]
+            band = data[index]
+            return grouped_area(classify(band.filled(NO_CLASS)), area, inside & ~np.ma.getmaskarray(band))
+
+        biomass, inside, _, _, _ = layers['biomass']
+        reductions = {}
+
+        for index, year in enumerate(years):
+            valid = inside & ~np.ma.getmaskarray(biomass[index])
+
+            reductions[year] = {
+                'biomass': float(biomass[index].filled(0)[valid].sum()) if valid.any() else None,
+                'age': groups('age', index, classify_pasture_age),
+                'vigor': groups('vigor', index),
+                'lulc': groups('integration', index),
+            }
+
+        return reductions
+
+    def topographic_reductions(self, coords: List[List[List[List[float]]]]) -> Tuple[float, float]:
+        """
+        Altitude média (m) e declividade média (graus) do imóvel.
+
+        A declividade usa diferenças centrais (como `ee.Terrain.slope`) sobre a janela lida com um
+        pixel de margem, para que as bordas do imóvel também tenham vizinhos.
+
+        Raises:
+            ValueError: Se a área estiver fora do raster ou sem dados de altitude.
+        """
+        data, inside, _, window_transform, geographic = self._read('dem', coords, [self.metadata('dem').bands[0]], pad=1)
+        elevation = data[0].astype(np.float64).filled(np.nan)
+        valid = inside & ~np.isnan(elevation)
+
+        if not valid.any():
+            raise ValueError("Não há dados de altitude para a área.")
+
+        if geographic:
+            latitudes = np.radians(window_transform.f + (np.arange(elevation.shape[0]) + 0.5) * window_transform.e)
+            dx = (EARTH_RADIUS * math.radians(abs(window_transform.a)) * np.cos(latitudes))[:, None]
+            dy = EARTH_RADIUS * math.radians(abs(window_transform.e))
+        else:
+            dx, dy = abs(window_transform.a), abs(window_transform.e)
+
+        if min(elevation.shape) > 1:
+            gradient_y, gradient_x = np.gradient(elevation)
+            slope = np.degrees(np.arctan(np.hypot(gradient_x / dx, gradient_y / dy)))
+        else:
+            slope = np.zeros_like(elevation)
+
+        return float(np.nanmean(elevation[valid])), float(np.nanmean(slope[valid]))
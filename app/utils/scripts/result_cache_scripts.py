@@ -0,0 +1,246 @@
+import hashlib
+import shapely
+import numpy as np
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from agno.utils.log import log_warning
+
+from app.utils.scripts.gee_request_scripts import is_unavailable_error
+
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+# Casas decimais das coordenadas na impressão digital da geometria: 1e-6 grau ≈ 0,1 m
+FINGERPRINT_PRECISION = 6
+
+# Valor da coluna `year` para produtos sem dimensão temporal (ex: topografia)
+NO_YEAR = 0
+
+
+def geometry_fingerprint(coords: List[List[List[List[float]]]]) -> str:
+    """
+    Gera um hash canônico da geometria, independente do vértice inicial e da orientação dos anéis.
+
+    Args:
+        coords (List): Coordenadas MultiPolygon (padrão GeoJSON).
+
+    Returns:
+        str: Hash SHA-256 (hexadecimal) da geometria normalizada.
+    """
+    geometry = shapely.geometry.shape({'type': 'MultiPolygon', 'coordinates': coords})
+    geometry = shapely.transform(geometry, lambda points: np.round(points, FINGERPRINT_PRECISION))
+
+    return hashlib.sha256(shapely.to_wkb(shapely.normalize(geometry))).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _ensure_table():
+    from app.database.session import engine
+    from app.database.models import AnalysisResultCache
+
+    AnalysisResultCache.metadata.create_all(bind=engine, tables=[AnalysisResultCache.__table__])
+
+
+def get_cached_result(geometry_hash: str, product: str, year: int, asset_version: str, model: Type[ModelT]) -> Optional[ModelT]:
+    """
+    Busca um resultado de análise já calculado.
+
+    Returns:
+        Optional[ModelT]: Resultado desserializado, ou `None` se ausente ou se o banco estiver indisponível.
+    """
+    from app.database.session import SessionLocal
+    from app.database.models import AnalysisResultCache
+
+    try:
+        _ensure_table()
+
+        with SessionLocal() as db:
+            record = db.get(AnalysisResultCache, (geometry_hash, product, year, asset_version))
+
+            return model.model_validate_json(record.result) if record else None
+    except Exception as e:
+        log_warning(f"Falha ao consultar o cache de resultados ({product}): {e}")
+        return None
+
+
+def get_latest_cached_result(geometry_hash: str, product: str, year: int, model: Type[ModelT]) -> Optional[Tuple[ModelT, str]]:
+    """
+    Busca o resultado mais recente da análise, em qualquer versão dos assets (fallback quando o GEE falha).
+
+    Returns:
+        Optional[Tuple[ModelT, str]]: Resultado desserializado e a data do cálculo (ISO 8601), ou `None` se ausente.
+    """
+    from app.database.session import SessionLocal
+    from app.database.models import AnalysisResultCache
+
+    try:
+        _ensure_table()
+
+        with SessionLocal() as db:
+            record = (
+                db.query(AnalysisResultCache)
+                .filter_by(geometry_hash=geometry_hash, product=product, year=year)
+                .order_by(AnalysisResultCache.timestamp.desc())
+                .first()
+            )
+
+            return (model.model_validate_json(record.result), record.timestamp) if record else None
+    except Exception as e:
+        log_warning(f"Falha ao consultar o cache de resultados ({product}): {e}")
+        return None
+
+
+def stale_notice(timestamp: str) -> str:
+    """
+    Aviso para o agente de que o resultado veio do cache porque o GEE falhou.
+
+    Args:
+        timestamp (str): Data do cálculo (ISO 8601).
+
+    Returns:
+        str: Aviso com a data do cálculo.
+    """
+    calculated_at = datetime.fromisoformat(timestamp).strftime('%d/%m/%Y %H:%M')
+
+    return (
+        f"ATENÇÃO: o serviço de imagens de satélite está instável. Os dados abaixo foram calculados "
+        f"em {calculated_at} e podem estar desatualizados. Informe isso ao usuário.\n"
+    )
+
+
+def store_result(geometry_hash: str, product: str, year: int, asset_version: str, result: BaseModel):
+    """
+    Grava um resultado de análise no cache. Falhas são apenas registradas no log.
+    """
+    from app.database.session import SessionLocal
+    from app.database.models import AnalysisResultCache
+
+    try:
+        _ensure_table()
+
+        with SessionLocal() as db:
+            db.merge(AnalysisResultCache(
+                geometry_hash=geometry_hash,
+                product=product,
+                year=year,
+                asset_version=asset_version,
+                timestamp=datetime.now().isoformat(),
+                result=result.model_dump_json()
+            ))
+            db.commit()
+    except Exception as e:
+        log_warning(f"Falha ao gravar o cache de resultados ({product}): {e}")
+
+
+def cached_analysis(
+    coords: List[List[List[List[float]]]],
+    product: str,
+    asset_version: Callable[[], str],
+    model: Type[ModelT],
+    compute: Callable[[], ModelT],
+    year: int = NO_YEAR
+    ) -> Tuple[ModelT, Optional[str]]:
+    """
+    Retorna o resultado do cache persistente ou o calcula e armazena.
+
+    Os produtos anuais do MapBiomas são imutáveis dentro de uma versão do asset, então a chave
+    (hash da geometria, produto, ano, versão do asset) dispensa expiração. Se a versão ou o cálculo
+    falharem porque o GEE está indisponível (ver `is_unavailable_error`), inclusive sem os metadados em
+    memória, o resultado mais recente de qualquer versão é retornado junto com a data em que foi
+    calculado. Os demais erros (ex: ano fora do asset) são propagados.
+
+    Args:
+        coords (List): Coordenadas MultiPolygon (padrão GeoJSON) usadas na análise.
+        product (str): Nome do produto (ex: 'pasture', 'topography').
+        asset_version (Callable[[], str]): Retorna a versão dos assets usados no cálculo.
+        model (Type[ModelT]): Modelo Pydantic do resultado.
+        compute (Callable[[], ModelT]): Função que calcula o resultado quando ele não está no cache.
+        year (int): Ano da análise (`NO_YEAR` para produtos sem ano).
+
+    Returns:
+        Tuple[ModelT, Optional[str]]: Resultado da análise e, se ele for antigo (fallback), a data do cálculo.
+    """
+    geometry_hash = geometry_fingerprint(coords)
+
+    try:
+        version = asset_version()
+
+        if (cached := get_cached_result(geometry_hash, product, year, version, model)) is not None:
+            return cached, None
+
+        result = compute()
+    except Exception as error:
+        if not is_unavailable_error(error) or (stale := get_latest_cached_result(geometry_hash, product, year, model)) is None:
+            raise
+
+        log_warning(f"Cálculo de '{product}' falhou; servindo o resultado de {stale[1]} do cache.")
+        return stale
+
+    store_result(geometry_hash, product, year, version, result)
+
+    return result, None
+
+
+def cached_yearly_analysis(
+    coords: List[List[List[List[float]]]],
+    product: str,
+    years: List[int],
+    asset_version: Callable[[], str],
+    model: Type[ModelT],
+    compute: Callable[[List[int]], Dict[int, ModelT]]
+    ) -> Tuple[Dict[int, ModelT], Optional[str]]:
+    """
+    Versão anual de `cached_analysis`: cada ano é armazenado separadamente e apenas os anos
+    ausentes do cache são calculados, todos na mesma chamada de `compute`. Se o GEE estiver indisponível,
+    os anos ausentes são servidos com o resultado mais recente de qualquer versão (se houver para todos).
+
+    Args:
+        coords (List): Coordenadas MultiPolygon (padrão GeoJSON) usadas na análise.
+        product (str): Nome do produto (ex: 'pasture_series').
+        years (List[int]): Anos da análise.
+        asset_version (Callable[[], str]): Retorna a versão dos assets usados no cálculo.
+        model (Type[ModelT]): Modelo Pydantic do resultado de cada ano.
+        compute (Callable[[List[int]], Dict[int, ModelT]]): Calcula os anos ausentes de uma só vez.
+
+    Returns:
+        Tuple[Dict[int, ModelT], Optional[str]]: Resultados indexados pelo ano, em ordem crescente, e a
+            data do cálculo mais antigo entre os anos servidos pelo fallback (`None` se não houve fallback).
+    """
+    geometry_hash = geometry_fingerprint(coords)
+    results = {}
+    stale_since = None
+
+    missing = sorted(set(years))
+
+    try:
+        version = asset_version()
+
+        for year in missing:
+            if (cached := get_cached_result(geometry_hash, product, year, version, model)) is not None:
+                results[year] = cached
+
+        missing = [year for year in missing if year not in results]
+        computed = compute(missing) if missing else {}
+    except Exception as error:
+        if not is_unavailable_error(error):
+            raise
+
+        stale = {year: get_latest_cached_result(geometry_hash, product, year, model) for year in missing}
+
+        if not stale or any(value is None for value in stale.values()):
+            raise
+
+        log_warning(f"Cálculo de '{product}' falhou; servindo {len(stale)} ano(s) do cache.")
+        results.update({year: result for year, (result, _) in stale.items()})
+        stale_since = min(timestamp for _, timestamp in stale.values())
+    else:
+        for year, result in computed.items():
+            store_result(geometry_hash, product, year, version, result)
+            results[year] = result
+
+    return dict(sorted(results.items())), stale_since
@@ -0,0 +1,313 @@
+"""
+Mosaicos Sentinel-2 (mediana) reaproveitados entre produtos e usuários.
+
+Os mosaicos exportados são identificados por (célula, período), em uma grade fixa de
+`GEE_SENTINEL_TILE_SIZE` graus. Quando `GEE_SENTINEL_COMPOSITE_ASSET` está configurado e todas as
+células que cobrem o imóvel já foram exportadas para essa ImageCollection (comando `export`,
+executado mensalmente), o mosaico é apenas referenciado: a mediana das cenas foi calculada uma vez
+no GEE e é reaproveitada por todos os imóveis e produtos (RGB, biomassa, solo).
+
+Sem o mosaico exportado, a mediana é calculada a cada pedido sobre as cenas que interceptam o
+próprio imóvel, o menor conjunto de cenas possível.
+
+Uso:
+    python -m app.utils.scripts.sentinel_composite_scripts export --bbox -53.2 -19.4 -45.9 -12.4
+"""
+import ee
+import math
+import time
+import datetime
+import argparse
+import threading
+
+from typing import List, Optional, Set, Tuple
+
+from agno.utils.log import log_warning
+
+from app.utils.scheduler import BACKGROUND
+from app.utils.scripts.gee_request_scripts import gee_scheduler, get_info, start_task
+from app.configs.gee import GEE_METADATA_TTL, GEE_SENTINEL_TILE_SIZE, GEE_SENTINEL_COMPOSITE_ASSET
+
+
+SENTINEL_COLLECTION = 'COPERNICUS/S2_SR_HARMONIZED'
+SENTINEL_BANDS = ['B4', 'B3', 'B2']
+SENTINEL_VISUALIZATION = {"bands": SENTINEL_BANDS, "min": 0, "max": 3000}
+MAX_CLOUDY_PIXEL_PERCENTAGE = 10
+
+# Intervalo de células da grade: (x mínimo, y mínimo, x máximo, y máximo)
+TileRange = Tuple[int, int, int, int]
+
+# Período do mosaico: (mês inicial 'AAAA-MM', quantidade de meses)
+Period = Tuple[str, int]
+
+
+def region_tiles(coords: List[List[List[List[float]]]], tile_size: float = GEE_SENTINEL_TILE_SIZE) -> TileRange:
+    """
+    Calcula o intervalo de células da grade que cobre a geometria.
+
+    Args:
+        coords: Coordenadas MultiPolygon (padrão GeoJSON).
+        tile_size (float): Lado da célula, em graus.
+
+    Returns:
+        TileRange: Índices (x mínimo, y mínimo, x máximo, y máximo) das células.
+    """
+    xs = [point[0] for polygon in coords for ring in polygon for point in ring]
+    ys = [point[1] for polygon in coords for ring in polygon for point in ring]
+
+    return (
+        math.floor(min(xs) / tile_size), math.floor(min(ys) / tile_size),
+        math.floor(max(xs) / tile_size), math.floor(max(ys) / tile_size)
+    )
+
+
+def tile_names(tiles: TileRange) -> List[str]:
+    """
+    Nomes das células do intervalo (ex: '-50_-16'), usados na propriedade 'tile' dos mosaicos exportados.
+    """
+    min_x, min_y, max_x, max_y = tiles
+
+    return [f'{x}_{y}' for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+
+
+def rolling_period(today: Optional[datetime.date] = None) -> Period:
+    """
+    Período dos últimos 12 meses usado na imagem de satélite recente (começa no mês atual do ano anterior).
+    """
+    today = today or datetime.date.today()
+
+    return (f'{today.year - 1}-{today.month:02d}', 12)
+
+
+def year_period(year: int) -> Period:
+    """
+    Período do ano civil, usado como fundo dos mapas anuais (ex: biomassa).
+    """
+    return (f'{year}-01', 12)
+
+
+def period_name(period: Period) -> str:
+    """
+    Identificador do período (ex: '2024-01_12m'), usado na propriedade 'period' dos mosaicos exportados.
+    """
+    start, months = period
+
+    return f'{start}_{months}m'
+
+
+class SentinelCompositeService:
+    """
+    Fornece os mosaicos Sentinel-2 de um imóvel no período, a partir dos mosaicos exportados quando disponíveis.
+
+    Args:
+        tile_size (float): Lado das células da grade, em graus.
+        asset_id (str, optional): ImageCollection com os mosaicos exportados. Sem valor, os mosaicos
+            são sempre montados sobre a coleção original.
+        ttl (float): Tempo (em segundos) até a lista de mosaicos exportados ser consultada novamente.
+    """
+
+    RETRY_INTERVAL = 60
+
+    def __init__(self, tile_size: float, asset_id: Optional[str] = None, ttl: float = GEE_METADATA_TTL):
+        self.tile_size = tile_size
+        self.asset_id = asset_id
+        self.ttl = ttl
+
+        self.exported_hits = 0
+        self.collection_builds = 0
+
+        self._exported: Set[Tuple[str, str]] = set()
+        self._exported_expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def tile_geometry(self, tiles: TileRange) -> ee.Geometry:
+        """
+        Retângulo que cobre o intervalo de células.
+        """
+        min_x, min_y, max_x, max_y = tiles
+
+        return ee.Geometry.Rectangle(
+            [min_x * self.tile_size, min_y * self.tile_size, (max_x + 1) * self.tile_size, (max_y + 1) * self.tile_size],
+            proj=None, geodesic=False
+        )
+
+    def _resolve_exported(self) -> Set[Tuple[str, str]]:
+        """
+        Consulta (em um único getInfo) os pares (célula, período) já exportados.
+        """
+        collection = ee.ImageCollection(self.asset_id)
+        pairs = get_info(collection.aggregate_array('tile').zip(collection.aggregate_array('period')))
+
+        return {(tile, period) for tile, period in pairs}
+
+    def refresh(self, blocking: bool = True):
+        """
+        Consulta a lista de mosaicos exportados se ela estiver expirada.
+
+        Args:
+            blocking (bool): Se `False`, retorna imediatamente quando outra thread já estiver renovando.
+        """
+        if not self._lock.acquire(blocking=blocking):
+            return
+
+        try:
+            if time.monotonic() < self._exported_expires_at:
+                return
+
+            try:
+                self._exported = self._resolve_exported()
+                self._exported_expires_at = time.monotonic() + self.ttl
+            except Exception as error:
+                log_warning(f"Falha ao listar os mosaicos Sentinel-2 exportados; usando a coleção original: {error}")
+                self._exported_expires_at = time.monotonic() + min(self.ttl, self.RETRY_INTERVAL)
+        finally:
+            self._lock.release()
+
+    def exported(self) -> Set[Tuple[str, str]]:
+        """
+        Pares (célula, período) disponíveis no asset de mosaicos exportados.
+
+        Apenas uma thread consulta o GEE na renovação; as demais seguem com a lista anterior
+        (aguardam somente a primeira consulta, quando ainda não há lista).
+        """
+        if not self.asset_id:
+            return set()
+
+        if time.monotonic() >= self._exported_expires_at:
+            self.refresh(blocking=self._exported_expires_at == 0)
+
+        return self._exported
+
+    def composite(self, coords: List[List[List[List[float]]]], period: Period) -> ee.Image:
+        """
+        Retorna o mosaico Sentinel-2 (bandas B4, B3 e B2) que cobre a geometria no período.
+
+        Usa os mosaicos exportados se todas as células da região estiverem disponíveis; senão,
+        monta a mediana sobre a coleção original filtrada pelo próprio imóvel.
+
+        Args:
+            coords: Coordenadas MultiPolygon (padrão GeoJSON).
+            period (Period): Mês inicial e quantidade de meses (ver `rolling_period` e `year_period`).
+
+        Returns:
+            ee.Image: Mediana das cenas com menos de 10% de nuvens.
+        """
+        names = tile_names(region_tiles(coords, self.tile_size))
+        exported = self.exported()
+
+        if exported and all((name, period_name(period)) in exported for name in names):
+            self.exported_hits += 1
+            return self._build_from_exported(names, period)
+
+        self.collection_builds += 1
+        return self._build_from_collection(ee.Geometry.MultiPolygon(coords), period)
+
+    def _build_from_exported(self, names: List[str], period: Period) -> ee.Image:
+        """
+        Mosaico das células já exportadas para o asset configurado.
+        """
+        return (
+            ee.ImageCollection(self.asset_id)
+            .filter(ee.Filter.eq('period', period_name(period)))
+            .filter(ee.Filter.inList('tile', names))
+            .mosaic()
+        )
+
+    def visualize(self, coords: List[List[List[List[float]]]], period: Period) -> ee.Image:
+        """
+        Mosaico da geometria já renderizado em cor verdadeira (RGB).
+        """
+        return self.composite(coords, period).visualize(**SENTINEL_VISUALIZATION)
+
+    def export(self, bbox: Tuple[float, float, float, float], period: Period) -> List[str]:
+        """
+        Inicia a exportação dos mosaicos das células que cobrem o retângulo para o asset configurado.
+
+        Cada célula vira uma imagem com as propriedades 'tile' e 'period'. Células já exportadas no
+        período são ignoradas.
+
+        Args:
+            bbox (Tuple[float, float, float, float]): Longitude e latitude mínimas e máximas da região.
+            period (Period): Mês inicial e quantidade de meses.
+
+        Returns:
+            List[str]: Identificadores das tarefas iniciadas no GEE.
+        """
+        if not self.asset_id:
+            raise ValueError("Configure GEE_SENTINEL_COMPOSITE_ASSET com a ImageCollection de destino.")
+
+        min_x, min_y, max_x, max_y = bbox
+        tiles = region_tiles([[[[min_x, min_y], [max_x, max_y]]]], self.tile_size)
+        exported = self.exported()
+        task_ids = []
+
+        for name in tile_names(tiles):
+            if (name, period_name(period)) in exported:
+                continue
+
+            x, y = (int(value) for value in name.split('_'))
+            region = self.tile_geometry((x, y, x, y))
+            image = self._build_from_collection(region, period).set({'tile': name, 'period': period_name(period)})
+
+            task = ee.batch.Export.image.toAsset(
+                image=image.toUint16(),
+                description=f"s2_{name}_{period_name(period)}",
+                assetId=f"{self.asset_id}/s2_{name}_{period_name(period)}",
+                region=region,
+                scale=10,
+                maxPixels=1e13
+            )
+            task_ids.append(start_task(task))
+
+        return task_ids
+
+    def _build_from_collection(self, region: ee.Geometry, period: Period) -> ee.Image:
+        """
+        Mediana das cenas da coleção original que interceptam a região (imóvel ou célula exportada).
+        """
+        start, months = period
+        s_date = ee.Date(f'{start}-01')
+
+        return (
+            ee.ImageCollection(SENTINEL_COLLECTION)
+            .filterBounds(region)
+            .filterDate(s_date, s_date.advance(months, 'month'))
+            .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', MAX_CLOUDY_PIXEL_PERCENTAGE))
+            .select(SENTINEL_BANDS)
+            .median()
+        )
+
+    def stats(self) -> dict:
+        """
+        Mosaicos servidos a partir do asset exportado e montados sobre a coleção original.
+        """
+        return {'exported_hits': self.exported_hits, 'collection_builds': self.collection_builds}
+
+
+sentinel_composites = SentinelCompositeService(tile_size=GEE_SENTINEL_TILE_SIZE, asset_id=GEE_SENTINEL_COMPOSITE_ASSET)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exportação dos mosaicos Sentinel-2 regionais para o asset configurado.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help="Exporta os mosaicos das células que cobrem a região (executar mensalmente).")
+    export_parser.add_argument('--bbox', type=float, nargs=4, required=True, metavar=('MIN_X', 'MIN_Y', 'MAX_X', 'MAX_Y'))
+    export_parser.add_argument('--start', help="Mês inicial 'AAAA-MM'. Padrão: janela dos últimos 12 meses.")
+    export_parser.add_argument('--months', type=int, default=12)
+    args = parser.parse_args()
+
+    from app.utils.scripts.gee_scripts import initialize_earth_engine
+
+    initialize_earth_engine()
+
+    period = (args.start, args.months) if args.start else rolling_period()
+    # Exportações em lote seguem na fila de segundo plano, sem disputar a cota com os usuários
+    with gee_scheduler.lane(BACKGROUND):
+        task_ids = sentinel_composites.export(tuple(args.bbox), period)
+
+    print(f"✅ {len(task_ids)} exportações iniciadas para o período {period_name(period)}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,496 @@
+"""
+Rotinas offline de preparação da base do CAR (SICAR).
+
+Uso:
+    python -m app.utils.scripts.sicar_dataset_scripts install-extension --directory data/duckdb-extensions
+    python -m app.utils.scripts.sicar_dataset_scripts ingest data/raw/AREA_IMOVEL_GO.shp data/raw/AREA_IMOVEL_MT.gpkg
+    python -m app.utils.scripts.sicar_dataset_scripts build-database
+    python -m app.utils.scripts.sicar_dataset_scripts export-arrow
+    python -m app.utils.scripts.sicar_dataset_scripts grid-index
+"""
+import os
+import re
+import json
+import shutil
+import argparse
+import duckdb
+
+from pathlib import Path
+from typing import Dict, List
+
+from app.configs.sicar import (
+    SICAR_DATASET_PATH,
+    SICAR_DATABASE_PATH,
+    SICAR_TABLE_NAME,
+    SICAR_ARROW_PATH,
+    SICAR_GRID_INDEX_PATH,
+    SICAR_GRID_CELL_SIZE,
+    SICAR_THUMBNAIL_TOLERANCE,
+    SICAR_ANALYSIS_TOLERANCE,
+    METERS_PER_DEGREE,
+    SICAR_ROW_GROUP_SIZE,
+    SICAR_EXTENSION_DIRECTORY
+    )
+from app.database.sicar_session import load_spatial_extension
+
+# Manifesto da ingestão (tamanho e data de modificação de cada arquivo de origem)
+INGEST_MANIFEST_NAME = 'ingest-manifest.json'
+
+# Colunas de bbox gravadas pela ingestão (recalculadas a partir da geometria)
+BBOX_COLUMNS = ('min_x', 'max_x', 'min_y', 'max_y')
+
+
+def _sql_path(path: Path) -> str:
+    """Escapa um caminho para uso literal em SQL (ex: destino do COPY)."""
+    return str(path).replace("'", "''")
+
+
+def _geometry_tiers_sql() -> str:
+    """
+    Colunas WKB com as geometrias simplificadas (`geometry_thumbnail` e `geometry_analysis`).
+
+    `ST_SimplifyPreserveTopology` garante que nenhum vértice se afaste mais que a tolerância
+    do contorno original e que o polígono continue válido.
+    """
+    tiers = (('thumbnail', SICAR_THUMBNAIL_TOLERANCE), ('analysis', SICAR_ANALYSIS_TOLERANCE))
+
+    return ', '.join(
+        f"ST_AsWKB(ST_SimplifyPreserveTopology(geometry, {tolerance / METERS_PER_DEGREE}))::BLOB AS geometry_{tier}"
+        for tier, tolerance in tiers
+    )
+
+
+def install_spatial_extension(directory: Path = SICAR_EXTENSION_DIRECTORY, source: Path = None) -> Path:
+    """
+    Instala a extensão spatial do DuckDB em um diretório local, para uso sem internet.
+
+    Em máquinas sem acesso à rede, informe `source` com o arquivo `spatial.duckdb_extension`
+    (ou `.gz`) baixado previamente para a mesma versão/plataforma do DuckDB.
+
+    Args:
+        directory (Path): Diretório de extensões (o mesmo configurado em SICAR_EXTENSION_DIRECTORY).
+        source (Path, optional): Arquivo local da extensão. Sem valor, baixa do repositório oficial.
+
+    Returns:
+        Path: Caminho do arquivo da extensão instalada.
+    """
+    conn = duckdb.connect(database=':memory:')
+
+    try:
+        if directory:
+            conn.execute(f"SET extension_directory = '{_sql_path(directory)}'")
+
+        conn.execute(f"INSTALL '{_sql_path(source)}'" if source else "INSTALL spatial")
+        conn.execute("LOAD spatial;")
+
+        install_path = conn.execute("SELECT install_path FROM duckdb_extensions() WHERE extension_name = 'spatial'").fetchone()[0]
+    finally:
+        conn.close()
+
+    return Path(install_path)
+
+
+def write_state_partitions(conn: duckdb.DuckDBPyConnection, relation: str, uf: str, dataset_path: Path, row_group_size: int) -> int:
+    """
+    Grava os imóveis de uma UF no layout Hive do dataset (`uf=<UF>/cod_municipio=<IBGE>/`).
+
+    As chaves vêm do próprio código CAR (`GO-5211800-...`), o que permite às consultas por código
+    abrir somente a partição do município. Dentro de cada partição os imóveis seguem a ordem da curva
+    de Hilbert (calculada sobre a extensão da UF), que agrupa vizinhos no mesmo row group e deixa o
+    min/max das colunas de bbox de cada bloco justo para o descarte de row groups e o índice de grade.
+
+    A UF é gravada em um diretório temporário e só então substitui a anterior (inclusive a pasta
+    `<UF>/` do layout antigo, sem partições), para que nenhum imóvel apareça duas vezes no dataset.
+
+    Args:
+        conn (duckdb.DuckDBPyConnection): Conexão com a extensão spatial carregada.
+        relation (str): Tabela ou view com os imóveis (`cod_imovel`, `geometry` e demais atributos).
+        uf (str): Sigla da UF a gravar.
+        dataset_path (Path): Diretório do dataset do CAR.
+        row_group_size (int): Quantidade de linhas por row group.
+
+    Returns:
+        int: Quantidade de imóveis gravados.
+    """
+    dataset_path = Path(dataset_path)
+    dataset_path.mkdir(parents=True, exist_ok=True)
+
+    state_filter = f"upper(split_part(cod_imovel, '-', 1)) = '{uf}'"
+    skipped = {'geometry', 'uf', 'cod_municipio', *BBOX_COLUMNS}
+    attributes = ', '.join(f'"{name}"' for name, *_ in conn.execute(f"DESCRIBE {relation}").fetchall() if name not in skipped)
+
+    min_x, min_y, max_x, max_y = conn.execute(f"""
+        SELECT min(ST_XMin(geometry)), min(ST_YMin(geometry)), max(ST_XMax(geometry)), max(ST_YMax(geometry))
+        FROM {relation}
+        WHERE {state_filter}
+    """).fetchone()
+
+    # Fora do dataset, para que a leitura por `**/*.parquet` nunca veja a gravação em andamento
+    tmp_path = dataset_path.parent / f'.{dataset_path.name}-uf={uf}.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+
+    # O escritor particionado do DuckDB preserva a ordem da consulta dentro de cada partição
+    conn.execute(f"""
+        COPY (
+            SELECT
+                {attributes},
+                split_part(cod_imovel, '-', 2) AS cod_municipio,
+                ST_XMin(geometry)::DOUBLE AS min_x, ST_XMax(geometry)::DOUBLE AS max_x,
+                ST_YMin(geometry)::DOUBLE AS min_y, ST_YMax(geometry)::DOUBLE AS max_y,
+                geometry
+            FROM {relation}
+            WHERE {state_filter}
+            ORDER BY
+                cod_municipio,
+                ST_Hilbert(geometry, {{'min_x': {min_x}, 'min_y': {min_y}, 'max_x': {max_x}, 'max_y': {max_y}}}::BOX_2D)
+        ) TO '{_sql_path(tmp_path)}' (FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE {row_group_size}, PARTITION_BY (cod_municipio))
+    """)
+
+    state_path = dataset_path / f'uf={uf}'
+    old_path = dataset_path.parent / f'.{dataset_path.name}-uf={uf}.old'
+    shutil.rmtree(old_path, ignore_errors=True)
+
+    if state_path.exists():
+        state_path.replace(old_path)
+
+    tmp_path.replace(state_path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    shutil.rmtree(dataset_path / uf, ignore_errors=True)
+
+    return conn.execute("SELECT count(*) FROM read_parquet(?, hive_partitioning = false)", [str(state_path / '**' / '*.parquet')]).fetchone()[0]
+
+
+def _ingest_car_source(conn: duckdb.DuckDBPyConnection, source: Path, dataset_path: Path, row_group_size: int) -> Dict[str, int]:
+    """
+    Converte um arquivo bruto do SICAR nas partições Hive de cada UF presente nele.
+
+    Returns:
+        Dict[str, int]: Quantidade de imóveis gravados por UF.
+    """
+    columns = conn.execute("DESCRIBE SELECT * FROM ST_Read(?)", [str(source)]).fetchall()
+    geometry_column = next(name for name, column_type, *_ in columns if column_type == 'GEOMETRY')
+
+    # Os shapefiles do SICAR variam entre nomes de campo maiúsculos e minúsculos
+    attributes = ', '.join(
+        f'"{name}" AS "{name.lower()}"'
+        for name, *_ in columns
+        if name != geometry_column and name.lower() not in BBOX_COLUMNS
+    )
+
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE car_source AS
+        SELECT {attributes}, ST_MakeValid("{geometry_column}") AS geometry
+        FROM ST_Read(?)
+    """, [str(source)])
+
+    states = [row[0] for row in conn.execute("SELECT DISTINCT upper(split_part(cod_imovel, '-', 1)) FROM car_source").fetchall()]
+    totals = {}
+
+    for uf in states:
+        if not re.fullmatch(r'[A-Z]{2}', uf or ''):
+            print(f"⚠️  Ignorando imóveis com UF inválida ('{uf}') em {source.name}", flush=True)
+            continue
+
+        totals[uf] = write_state_partitions(conn, 'car_source', uf, dataset_path, row_group_size)
+
+    return totals
+
+
+def ingest_car_sources(
+    sources: List[Path],
+    dataset_path: Path = SICAR_DATASET_PATH,
+    row_group_size: int = SICAR_ROW_GROUP_SIZE,
+    force: bool = False
+    ) -> Dict[str, int]:
+    """
+    Converte shapefiles ou GeoPackages brutos do SICAR no dataset GeoParquet usado pela aplicação.
+
+    Cada UF é gravada em `<dataset>/uf=<UF>/cod_municipio=<IBGE>/` (ver `write_state_partitions`),
+    ordenada pela curva de Hilbert dentro de cada partição, com as colunas de bbox (`min_x`..`max_y`)
+    e row groups de `row_group_size` linhas. O escritor Parquet do DuckDB aplica dicionário às colunas
+    de baixa cardinalidade (`municipio`, `ind_status`, ...). `dataset_path` é o próprio diretório
+    configurado em SICAR_DATASET_PATH.
+
+    A atualização é incremental: um manifesto guarda tamanho e data de modificação de cada arquivo
+    de origem, e apenas as UFs de arquivos novos ou alterados são regravadas. Como cada UF é
+    regravada por inteiro, cada arquivo de origem deve conter todos os imóveis das suas UFs
+    (formato dos downloads por estado do SICAR).
+
+    Args:
+        sources (List[Path]): Arquivos de origem (.shp, .gpkg ou outro formato suportado pelo GDAL).
+        dataset_path (Path): Diretório do dataset GeoParquet do CAR.
+        row_group_size (int): Quantidade de linhas por row group.
+        force (bool): Regrava as UFs mesmo que a origem não tenha mudado.
+
+    Returns:
+        Dict[str, int]: Quantidade de imóveis gravados por UF atualizada.
+    """
+    dataset_path = Path(dataset_path)
+    dataset_path.mkdir(parents=True, exist_ok=True)
+
+    manifest_path = dataset_path / INGEST_MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8')) if manifest_path.exists() else {}
+
+    conn = duckdb.connect(database=':memory:')
+    totals = {}
+
+    try:
+        load_spatial_extension(conn)
+
+        for source in map(Path, sources):
+            stat = source.stat()
+            signature = [stat.st_size, stat.st_mtime_ns]
+
+            if not force and manifest.get(str(source.resolve())) == signature:
+                print(f"⏭️  {source.name} sem alterações desde a última ingestão.", flush=True)
+                continue
+
+            totals.update(_ingest_car_source(conn, source, dataset_path, row_group_size))
+
+            manifest[str(source.resolve())] = signature
+            manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    finally:
+        conn.close()
+
+    return totals
+
+
+def build_car_database(dataset_path: Path = SICAR_DATASET_PATH, database_path: Path = SICAR_DATABASE_PATH) -> int:
+    """
+    Carrega o dataset Parquet do CAR em um banco DuckDB persistente e indexado.
+
+    Cria a tabela `car_properties` com um índice RTREE sobre `geometry` (consultas
+    ponto-em-polígono) e um índice ART sobre `cod_imovel` (consultas por código CAR).
+    As geometrias simplificadas de cada tier são pré-calculadas junto da carga.
+    O banco é gerado em um arquivo temporário e só substitui o anterior ao final,
+    para que os workers em execução nunca abram um banco incompleto.
+
+    Args:
+        dataset_path (Path): Diretório com os arquivos Parquet do CAR.
+        database_path (Path): Caminho do arquivo `.duckdb` a ser gerado.
+
+    Returns:
+        int: Quantidade de imóveis carregados.
+    """
+    database_path = Path(database_path)
+    database_path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = database_path.with_suffix('.duckdb.tmp')
+    tmp_path.unlink(missing_ok=True)
+
+    dataset_glob = str(Path(dataset_path) / '**' / '*.parquet')
+
+    conn = duckdb.connect(database=str(tmp_path))
+
+    try:
+        load_spatial_extension(conn)
+
+        # A geometria precisa ser a primeira coluna: o otimizador do DuckDB 1.3
+        # só troca o SEQ_SCAN pelo RTREE_INDEX_SCAN nessa condição.
+        conn.execute(f"""
+            CREATE TABLE {SICAR_TABLE_NAME} AS
+            SELECT geometry, * EXCLUDE(geometry), {_geometry_tiers_sql()}
+            FROM read_parquet(?)
+        """, [dataset_glob])
+
+        conn.execute(f"CREATE INDEX {SICAR_TABLE_NAME}_geometry_idx ON {SICAR_TABLE_NAME} USING RTREE (geometry)")
+        conn.execute(f"CREATE INDEX {SICAR_TABLE_NAME}_cod_imovel_idx ON {SICAR_TABLE_NAME} (cod_imovel)")
+
+        total = conn.execute(f"SELECT count(*) FROM {SICAR_TABLE_NAME}").fetchone()[0]
+
+        conn.execute("CHECKPOINT")
+    finally:
+        conn.close()
+
+    tmp_path.replace(database_path)
+
+    return total
+
+
+def export_car_arrow(dataset_path: Path = SICAR_DATASET_PATH, arrow_path: Path = SICAR_ARROW_PATH) -> int:
+    """
+    Exporta o dataset do CAR para um arquivo Arrow (IPC) com as geometrias em WKB.
+
+    O arquivo é gravado sem compressão para que o backend STRtree possa abri-lo via
+    memory-map, sem copiar as geometrias para objetos Python. Inclui as geometrias
+    simplificadas de cada tier.
+
+    Args:
+        dataset_path (Path): Diretório com os arquivos Parquet do CAR.
+        arrow_path (Path): Caminho do arquivo `.arrow` a ser gerado.
+
+    Returns:
+        int: Quantidade de imóveis exportados.
+    """
+    import pyarrow as pa
+
+    arrow_path = Path(arrow_path)
+    arrow_path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = arrow_path.with_suffix('.arrow.tmp')
+    dataset_glob = str(Path(dataset_path) / '**' / '*.parquet')
+
+    conn = duckdb.connect(database=':memory:')
+    total = 0
+
+    try:
+        load_spatial_extension(conn)
+
+        reader = conn.execute(f"""
+            SELECT * EXCLUDE(geometry), ST_AsWKB(geometry)::BLOB AS geometry, {_geometry_tiers_sql()}
+            FROM read_parquet(?)
+        """, [dataset_glob]).fetch_record_batch()
+
+        with pa.OSFile(str(tmp_path), 'wb') as sink, pa.ipc.new_file(sink, reader.schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+                total += batch.num_rows
+    finally:
+        conn.close()
+
+    tmp_path.replace(arrow_path)
+
+    return total
+
+
+def build_grid_index(dataset_path: Path = SICAR_DATASET_PATH, index_path: Path = SICAR_GRID_INDEX_PATH, cell_size: float = SICAR_GRID_CELL_SIZE) -> int:
+    """
+    Gera o índice de grade (célula -> arquivo/row group) usado nas consultas por coordenada.
+
+    Cada imóvel é atribuído a todas as células de `cell_size` graus cobertas pelo seu bbox
+    (`min_x`..`max_y`). O número da linha no arquivo é convertido no row group correspondente
+    a partir dos metadados do Parquet, e o resultado é agregado em pares únicos por célula.
+    O índice precisa ser regerado sempre que o dataset for alterado.
+
+    Args:
+        dataset_path (Path): Diretório com os arquivos Parquet do CAR.
+        index_path (Path): Caminho do arquivo JSON do índice.
+        cell_size (float): Tamanho da célula em graus (ex: 0.1).
+
+    Returns:
+        int: Quantidade de células não vazias.
+    """
+    dataset_path = Path(dataset_path)
+    index_path = Path(index_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+
+    dataset_glob = str(dataset_path / '**' / '*.parquet')
+    cell_size = float(cell_size)
+
+    conn = duckdb.connect(database=':memory:')
+
+    try:
+        rows = conn.execute(f"""
+            WITH row_groups AS (
+                SELECT DISTINCT file_name, row_group_id, row_group_num_rows
+                FROM parquet_metadata(?)
+            ),
+            row_group_ranges AS (
+                SELECT
+                    file_name,
+                    row_group_id,
+                    sum(row_group_num_rows) OVER (PARTITION BY file_name ORDER BY row_group_id) AS end_row
+                FROM row_groups
+            ),
+            properties AS (
+                SELECT
+                    filename,
+                    file_row_number,
+                    floor(min_x / {cell_size})::BIGINT AS cell_x0,
+                    floor(max_x / {cell_size})::BIGINT AS cell_x1,
+                    floor(min_y / {cell_size})::BIGINT AS cell_y0,
+                    floor(max_y / {cell_size})::BIGINT AS cell_y1
+                FROM read_parquet(?, filename = true, file_row_number = true, hive_partitioning = false)
+            ),
+            cells_x AS (
+                SELECT filename, file_row_number, unnest(range(cell_x0, cell_x1 + 1)) AS cell_x, cell_y0, cell_y1
+                FROM properties
+            ),
+            cells AS (
+                SELECT filename, file_row_number, cell_x, unnest(range(cell_y0, cell_y1 + 1)) AS cell_y
+                FROM cells_x
+            )
+            SELECT DISTINCT cells.cell_x, cells.cell_y, ranges.file_name, ranges.row_group_id
+            FROM cells
+            ASOF JOIN row_group_ranges ranges
+                ON cells.filename = ranges.file_name
+                AND cells.file_row_number < ranges.end_row
+            ORDER BY ALL
+        """, [dataset_glob, dataset_glob]).fetchall()
+    finally:
+        conn.close()
+
+    files: dict[str, int] = {}
+    cells: dict[str, list] = {}
+
+    for cell_x, cell_y, file_name, row_group_id in rows:
+        file_id = files.setdefault(os.path.relpath(file_name, dataset_path), len(files))
+        cells.setdefault(f"{cell_x},{cell_y}", []).append([file_id, row_group_id])
+
+    tmp_path = index_path.with_suffix('.json.tmp')
+
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump({'cell_size': cell_size, 'files': list(files), 'cells': cells}, file, separators=(',', ':'))
+
+    tmp_path.replace(index_path)
+
+    return len(cells)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preparação da base do CAR (SICAR).")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    extension_parser = subparsers.add_parser('install-extension', help="Instala a extensão spatial do DuckDB em um diretório local.")
+    extension_parser.add_argument('--directory', type=Path, default=SICAR_EXTENSION_DIRECTORY)
+    extension_parser.add_argument('--source', type=Path, default=None, help="Arquivo .duckdb_extension baixado previamente.")
+
+    ingest_parser = subparsers.add_parser('ingest', help="Converte shapefiles/GeoPackages do SICAR em GeoParquet particionado por UF e município.")
+    ingest_parser.add_argument('sources', type=Path, nargs='+')
+    ingest_parser.add_argument('--dataset', type=Path, default=SICAR_DATASET_PATH)
+    ingest_parser.add_argument('--row-group-size', type=int, default=SICAR_ROW_GROUP_SIZE)
+    ingest_parser.add_argument('--force', action='store_true', help="Regrava as UFs mesmo sem alterações na origem.")
+
+    build_parser = subparsers.add_parser('build-database', help="Gera o banco DuckDB indexado a partir dos arquivos Parquet.")
+    build_parser.add_argument('--dataset', type=Path, default=SICAR_DATASET_PATH)
+    build_parser.add_argument('--database', type=Path, default=SICAR_DATABASE_PATH)
+
+    arrow_parser = subparsers.add_parser('export-arrow', help="Exporta o arquivo Arrow (WKB) usado pelo backend STRtree.")
+    arrow_parser.add_argument('--dataset', type=Path, default=SICAR_DATASET_PATH)
+    arrow_parser.add_argument('--arrow', type=Path, default=SICAR_ARROW_PATH)
+
+    grid_parser = subparsers.add_parser('grid-index', help="Gera o índice de grade (célula -> row groups) para consultas por coordenada.")
+    grid_parser.add_argument('--dataset', type=Path, default=SICAR_DATASET_PATH)
+    grid_parser.add_argument('--index', type=Path, default=SICAR_GRID_INDEX_PATH)
+    grid_parser.add_argument('--cell-size', type=float, default=SICAR_GRID_CELL_SIZE)
+
+    args = parser.parse_args()
+
+    if args.command == 'install-extension':
+        install_path = install_spatial_extension(directory=args.directory, source=args.source)
+        print(f"✅ Extensão spatial instalada em {install_path}", flush=True)
+
+    elif args.command == 'ingest':
+        totals = ingest_car_sources(sources=args.sources, dataset_path=args.dataset, row_group_size=args.row_group_size, force=args.force)
+
+        for uf, total in sorted(totals.items()):
+            print(f"✅ {total} imóveis de {uf} gravados em {args.dataset / f'uf={uf}'}", flush=True)
+
+        if totals:
+            print("ℹ️  Regere o banco, o arquivo Arrow e o índice de grade para refletir a atualização.", flush=True)
+
+    elif args.command == 'build-database':
+        total = build_car_database(dataset_path=args.dataset, database_path=args.database)
+        print(f"✅ {total} imóveis carregados em {args.database}", flush=True)
+
+    elif args.command == 'export-arrow':
+        total = export_car_arrow(dataset_path=args.dataset, arrow_path=args.arrow)
+        print(f"✅ {total} imóveis exportados em {args.arrow}", flush=True)
+
+    elif args.command == 'grid-index':
+        total = build_grid_index(dataset_path=args.dataset, index_path=args.index, cell_size=args.cell_size)
+        print(f"✅ {total} células indexadas em {args.index}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
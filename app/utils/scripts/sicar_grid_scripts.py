@@ -0,0 +1,63 @@
+import json
+import math
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from pathlib import Path
+from typing import List, Dict
+
+
+class GridTileIndex:
+    """
+    Mapa pré-computado de células de grade (graus) para os row groups do dataset do CAR.
+
+    Gerado offline por `python -m app.utils.scripts.sicar_dataset_scripts grid-index`. Cada imóvel
+    é atribuído a todas as células cobertas pelo seu bbox, de modo que uma consulta por coordenada
+    precisa ler apenas os row groups listados para a célula do ponto.
+    """
+
+    def __init__(self, index_path: Path, dataset_path: Path):
+        with open(index_path, 'r', encoding='utf-8') as file:
+            grid = json.load(file)
+
+        self.cell_size = grid['cell_size']
+        self.files = [str(Path(dataset_path) / name) for name in grid['files']]
+        self.cells = grid['cells']
+
+    def cell(self, latitude: float, longitude: float) -> str:
+        return f"{math.floor(longitude / self.cell_size)},{math.floor(latitude / self.cell_size)}"
+
+    def row_groups(self, latitude: float, longitude: float) -> Dict[str, List[int]]:
+        """
+        Lista os row groups, agrupados por arquivo, que podem conter imóveis sobre o ponto.
+
+        Args:
+            latitude (float): Latitude do ponto de busca (Eixo Y).
+            longitude (float): Longitude do ponto de busca (Eixo X).
+
+        Returns:
+            Dict[str, List[int]]: Caminho do arquivo Parquet -> índices dos row groups.
+        """
+        groups: Dict[str, List[int]] = {}
+
+        for file_id, row_group in self.cells.get(self.cell(latitude, longitude), []):
+            groups.setdefault(self.files[file_id], []).append(row_group)
+
+        return groups
+
+    def read(self, latitude: float, longitude: float) -> pa.Table | None:
+        """
+        Lê somente os row groups da célula do ponto.
+
+        Returns:
+            pa.Table | None: Tabela Arrow com os candidatos (geometria em WKB), ou None se a célula estiver vazia.
+        """
+        tables = [
+            pq.ParquetFile(file).read_row_groups(row_groups)
+            for file, row_groups in self.row_groups(latitude, longitude).items()
+        ]
+
+        if not tables:
+            return None
+
+        return pa.concat_tables(tables, promote_options='default')
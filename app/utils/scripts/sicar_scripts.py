@@ -1,22 +1,145 @@
+import io
 import re
+import csv
 import json
-import duckdb
+import math
+import shapely
 import requests
+import threading
+import numpy as np
+import pyarrow as pa
 
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence, Tuple
+from functools import lru_cache
+
+from app.configs.sicar import (
+    SICAR_DATASET_PATH,
+    SICAR_TABLE_NAME,
+    SICAR_ARROW_PATH,
+    SICAR_DATABASE_PATH,
+    SICAR_BACKEND,
+    SICAR_GRID_INDEX_PATH,
+    SICAR_GRID_CELL_SIZE,
+    SICAR_CACHE_SIZE,
+    SICAR_CACHE_TTL,
+    SICAR_RELOAD_INTERVAL,
+    SICAR_NEAREST_RADIUS,
+    SICAR_NEAREST_LIMIT,
+    METERS_PER_DEGREE
+    )
+from agno.utils.log import log_error, log_info, log_warning
 
+from app.database import sicar_session
+from app.database.sicar_session import sicar_cursor, reset_sicar_connection
 from app.utils.interfaces.property_record import RuralProperty, SpatialFeatures, SicarMetadata
 from app.utils.mock_development import mock_property
+from app.utils.cache import TTLCache
+
+_strtree_lock = threading.Lock()
+
+
+def _get_strtree_index():
+    """
+    Carrega o backend STRtree para consultas por coordenada.
+
+    Gerado por `python -m app.utils.scripts.sicar_dataset_scripts export-arrow`.
+    """
+    # O lock evita que consultas simultâneas construam a árvore mais de uma vez
+    with _strtree_lock:
+        return _load_strtree_index()
+
+
+@lru_cache(maxsize=1)
+def _load_strtree_index():
+    from app.utils.scripts.sicar_strtree_scripts import STRtreePropertyIndex
+
+    return STRtreePropertyIndex(SICAR_ARROW_PATH)
+
+
+@lru_cache(maxsize=1)
+def _get_grid_index():
+    """
+    Carrega o índice de grade (célula -> row groups), se existir.
+
+    Gerado por `python -m app.utils.scripts.sicar_dataset_scripts grid-index`.
+    """
+    if not SICAR_GRID_INDEX_PATH.exists():
+        return None
 
-# =====================================================================
-# Configuração do Banco de Dados (Engine DuckDB)
-# =====================================================================
-conn = duckdb.connect(database=':memory:')
+    from app.utils.scripts.sicar_grid_scripts import GridTileIndex
 
-conn.execute("INSTALL spatial; LOAD spatial;")
-conn.execute("PRAGMA memory_limit='1GB'")
-conn.execute("PRAGMA threads=1")
+    return GridTileIndex(index_path=SICAR_GRID_INDEX_PATH, dataset_path=SICAR_DATASET_PATH)
+
+
+def _dataset_version() -> tuple:
+    """
+    Identifica a versão do dataset pela data de modificação dos artefatos gerados.
+
+    Qualquer reconstrução (banco, Arrow, índice de grade ou partições) invalida o cache de consultas.
+    """
+    paths = (SICAR_DATABASE_PATH, SICAR_ARROW_PATH, SICAR_GRID_INDEX_PATH, SICAR_DATASET_PATH)
+
+    return tuple(path.stat().st_mtime_ns if path.exists() else None for path in paths)
+
+
+def prefetch_sicar_indexes():
+    """
+    Constrói a árvore STRtree em segundo plano (`SICAR_BACKEND=strtree`), para que a primeira consulta
+    por coordenada não pague esse custo. Chamada na inicialização do servidor, nunca no import.
+    """
+    if SICAR_BACKEND != 'strtree':
+        return
+
+    def _prefetch():
+        try:
+            _get_strtree_index()
+        except Exception as error:
+            log_warning(f"Índice STRtree do CAR não carregado na inicialização: {error}")
+
+    threading.Thread(target=_prefetch, name='sicar-strtree', daemon=True).start()
+
+
+def _reload_dataset():
+    """
+    Reabre o banco do CAR e descarta os índices em memória após um novo build do dataset.
+
+    O índice de grade é recarregado no próximo uso e a árvore STRtree volta a ser construída em segundo plano.
+    """
+    reset_sicar_connection()
+    _get_grid_index.cache_clear()
+
+    with _strtree_lock:
+        _load_strtree_index.cache_clear()
+
+    prefetch_sicar_indexes()
+
+    log_info("Nova versão do dataset do CAR detectada; banco e índices reabertos.")
+
+
+def _copy_properties(properties: list) -> list:
+    """
+    Cópias independentes dos imóveis (ou pares imóvel/distância), para que quem recebe um resultado
+    do cache possa alterá-lo sem afetar os demais chamadores.
+    """
+    return [
+        (item[0].model_copy(deep=True), item[1]) if isinstance(item, tuple) else item.model_copy(deep=True)
+        for item in properties
+    ]
+
+
+# Cache das consultas por código CAR e por coordenada (arredondada para ~1 m).
+property_cache = TTLCache(
+    maxsize=SICAR_CACHE_SIZE,
+    ttl=SICAR_CACHE_TTL,
+    version=_dataset_version,
+    version_interval=SICAR_RELOAD_INTERVAL,
+    on_version_change=_reload_dataset,
+    copy=_copy_properties
+    )
+
+# Casas decimais das coordenadas na chave do cache: 1e-5 grau ≈ 1,1 m.
+COORDINATE_CACHE_PRECISION = 5
 
 
 def _map_feature_to_property_record(feature: json) -> Dict:
@@ -51,27 +174,66 @@ def _map_feature_to_property_record(feature: json) -> Dict:
     )
 
 
-def _map_row_to_property_record(row: dict) -> Dict:
+# Tiers de geometria simplificada pré-calculados pelo build do dataset (colunas `geometry_<tier>`)
+GEOMETRY_TIERS = ('analysis', 'thumbnail')
+
+
+def _decode_wkb_coordinates(geometries: pa.Array) -> List[List[List[List[List[float]]]]]:
+    """
+    Decodifica um lote de geometrias WKB direto para coordenadas no padrão GeoJSON (MultiPolygon).
+
+    Usa `shapely.to_ragged_array`, que entrega as coordenadas de todo o lote em um único array
+    NumPy acompanhado dos offsets de anéis e polígonos, sem serialização intermediária em texto.
+    Polígonos simples são promovidos a MultiPolygon de uma parte.
+
+    Args:
+        geometries (pa.Array): Coluna Arrow com as geometrias em WKB.
+
+    Returns:
+        List: Coordenadas MultiPolygon de cada geometria, na mesma ordem do lote.
+    """
+    if len(geometries) == 0:
+        return []
+
+    geometry_type, coords, offsets = shapely.to_ragged_array(shapely.from_wkb(geometries.to_numpy(zero_copy_only=False)))
+
+    coords = coords.tolist()
+    ring_offsets, polygon_offsets = offsets[0].tolist(), offsets[1].tolist()
+
+    if geometry_type == shapely.GeometryType.POLYGON:
+        part_offsets = list(range(len(polygon_offsets)))
+    else:
+        part_offsets = offsets[2].tolist()
+
+    rings = [coords[start:end] for start, end in zip(ring_offsets, ring_offsets[1:])]
+    polygons = [rings[start:end] for start, end in zip(polygon_offsets, polygon_offsets[1:])]
+
+    return [polygons[start:end] for start, end in zip(part_offsets, part_offsets[1:])]
+
+
+def _map_row_to_property_record(row: dict, coordinates: List[List[List[List[float]]]], tiers: Dict[str, List] = None) -> RuralProperty:
     """
     Mapeia uma linha do banco de dados para a estrutura aninhada RuralProperty.
     
     Recebe um dicionário achatado representando a linha retornada pelo DuckDB e 
-    converte a geometria extraída em uma lista de coordenadas padrão GeoJSON.
+    as coordenadas já decodificadas da geometria.
 
     Args:
-        row (dict): Dicionário contendo os dados do imóvel, incluindo a chave 'geometry'.
+        row (dict): Dicionário contendo os atributos do imóvel.
+        coordinates (List): Coordenadas MultiPolygon (padrão GeoJSON) do imóvel.
+        tiers (Dict[str, List], optional): Coordenadas simplificadas por tier ('analysis', 'thumbnail').
 
     Returns:
-        Dict: Entidade tipada contendo os dados do imóvel divididos entre AreaProperties e SICARProperties.
+        RuralProperty: Entidade tipada contendo os dados do imóvel divididos entre AreaProperties e SICARProperties.
     """
-    geom_geojson = json.loads(row['geometry'])
-
     return RuralProperty(
         car_code=row.get('cod_imovel', ''),
         spatial_features=SpatialFeatures(
             total_area=row.get('num_area', 0.0),
             municipality=row.get('municipio', ''),
-            coordinates=[geom_geojson.get('coordinates', [])]
+            coordinates=coordinates,
+            analysis_coordinates=(tiers or {}).get('analysis'),
+            thumbnail_coordinates=(tiers or {}).get('thumbnail')
         ),
         sicar_metadata=SicarMetadata(
             tipo=row.get('ind_tipo', ''),
@@ -81,6 +243,68 @@ def _map_row_to_property_record(row: dict) -> Dict:
         )
     )
 
+
+def _map_batches_to_property_records(batches) -> List[RuralProperty]:
+    """
+    Mapeia lotes Arrow (atributos + geometria em WKB) para a lista de RuralProperty.
+
+    Args:
+        batches: Iterável de `pa.RecordBatch` ou uma `pa.Table`.
+
+    Returns:
+        List[RuralProperty]: Imóveis mapeados, na ordem dos lotes.
+    """
+    if isinstance(batches, pa.Table):
+        batches = batches.to_batches()
+
+    result = []
+
+    for batch in batches:
+        coordinates = _decode_wkb_coordinates(batch.column('geometry'))
+
+        # Geometrias simplificadas existem apenas no banco/Arrow gerados pelo build do dataset
+        tier_columns = {tier: f'geometry_{tier}' for tier in GEOMETRY_TIERS if f'geometry_{tier}' in batch.schema.names}
+        tiers = {tier: _decode_wkb_coordinates(batch.column(column)) for tier, column in tier_columns.items()}
+
+        rows = batch.drop_columns(['geometry', *tier_columns.values()]).to_pylist()
+
+        for index, (row, coords) in enumerate(zip(rows, coordinates)):
+            result.append(_map_row_to_property_record(row, coords, {tier: values[index] for tier, values in tiers.items()}))
+
+    return result
+
+
+def _car_partition_files(car_codes: List[str]) -> Optional[List[str]]:
+    """
+    Resolve os arquivos Parquet que podem conter os códigos CAR informados.
+
+    O código CAR carrega a UF e o código IBGE do município (ex: `GO-5211800-...`), que são
+    as chaves do particionamento Hive do dataset (`uf=GO/cod_municipio=5211800/`). Assim,
+    apenas os arquivos das partições correspondentes precisam ser abertos.
+
+    Args:
+        car_codes (List[str]): Lista de códigos CAR normalizados.
+
+    Returns:
+        Optional[List[str]]: Caminhos dos arquivos das partições encontradas (lista vazia se nenhuma
+            existir, ou seja, nenhum dos códigos está no dataset). `None` se o dataset não estiver particionado.
+    """
+    if not any(SICAR_DATASET_PATH.glob('uf=*')):
+        return None
+
+    files = set()
+
+    for car_code in car_codes:
+        match = re.match(r"^([A-Z]{2})-(\d{7})-", car_code, flags=re.IGNORECASE)
+        if not match:
+            continue
+
+        uf, cod_municipio = match.group(1).upper(), match.group(2)
+        partition_path = SICAR_DATASET_PATH / f'uf={uf}' / f'cod_municipio={cod_municipio}'
+        files.update(str(file) for file in partition_path.glob('*.parquet'))
+
+    return sorted(files)
+
 # SC-4205100-9CF52298DA9740D4968BF6E2BE14E740, SC-4205100-11D656C565D04D43885AF2EC82EBA308, SC-4205100-71D333DF8E6B4824B19D77781C713B8D
 #@mock_property
 #def fetch_property_by_car_remote(car: str) -> List[Dict] | None:
@@ -123,7 +347,8 @@ def fetch_property_by_car_locally(car_codes: List[str]) -> List[RuralProperty]:
     """
     Busca as informações de imóveis rurais utilizando uma lista de códigos únicos do CAR.
 
-    Lê diretamente de arquivos Parquet particionados utilizando o DuckDB.
+    Consulta a tabela indexada do CAR (índice ART sobre `cod_imovel`) no DuckDB. Sem o banco
+    indexado, lê apenas as partições (UF/município) derivadas dos próprios códigos.
 
     Args:
         car_codes (List[str]): Lista de códigos string de registro dos imóveis no CAR.
@@ -135,10 +360,21 @@ def fetch_property_by_car_locally(car_codes: List[str]) -> List[RuralProperty]:
     if not car_codes:
         return None
 
-    cursor = conn.cursor()
-    
+    cache_key = ('car', tuple(sorted(car_codes)))
+
+    if (cached := property_cache.get(cache_key)) is not None:
+        return cached
+
     try:
-        dataset_path = str(Path.cwd() / 'data' / 'car-br-dataset' / '**' / '*.parquet')
+        source, params = SICAR_TABLE_NAME, []
+
+        if not sicar_session.USE_INDEXED_DATABASE and (partition_files := _car_partition_files(car_codes)) is not None:
+            # Dataset particionado sem a partição dos códigos: nenhum deles existe, sem varrer o dataset
+            if not partition_files:
+                property_cache.set(cache_key, [])
+                return []
+
+            source, params = "read_parquet(?, hive_partitioning = false)", [partition_files]
 
         # Cria a string de placeholders ex: "?, ?, ?" dependendo do tamanho da lista
         placeholders = ', '.join(['?'] * len(car_codes))
@@ -146,28 +382,20 @@ def fetch_property_by_car_locally(car_codes: List[str]) -> List[RuralProperty]:
         query = f"""
             SELECT *
                 EXCLUDE(geometry),
-                ST_AsGeoJSON(geometry) AS geometry
-            FROM read_parquet(?)
+                ST_AsWKB(geometry)::BLOB AS geometry
+            FROM {source}
             WHERE cod_imovel IN ({placeholders})
         """
         
-        # Junta o path do dataset com os códigos da lista para passar como parâmetros
-        params = [dataset_path] + car_codes
-        
-        df = cursor.execute(query, params).fetchdf()
-        
-        if df.empty:
-            return []
-        
-        records_dicts = df.to_dict('records')
-        result = [_map_row_to_property_record(row) for row in records_dicts]
+        with sicar_cursor() as cursor:
+            reader = cursor.execute(query, params + car_codes).fetch_record_batch()
+            result = _map_batches_to_property_records(reader)
+
+        property_cache.set(cache_key, result)
         
     except Exception as e:
-        # É recomendável pelo menos logar o erro caso 'result = None' oculte o problema
-        print(f"Erro ao buscar imóveis: {e}") 
+        log_error(f"Erro ao buscar imóveis: {e}")
         result = []
-    finally:
-        cursor.close()
         
     return result
 
@@ -221,8 +449,9 @@ def fetch_property_by_coordinates_locally(latitude: float, longitude: float) ->
     """
     Realiza busca geoespacial de imóveis rurais a partir de um ponto (Lat/Lon).
 
-    Utiliza Predicate Pushdown (checagem de min/max bounds) antes de 
-    aplicar funções geométricas pesadas para otimizar a leitura do Parquet.
+    Utiliza o índice RTREE da tabela do CAR para selecionar os candidatos. Sem o banco
+    indexado, o índice de grade limita a leitura aos row groups da célula do ponto e a
+    checagem de min/max bounds segue fazendo o Predicate Pushdown sobre eles.
 
     Args:
         latitude (float): Latitude do ponto de busca (Eixo Y).
@@ -231,39 +460,379 @@ def fetch_property_by_coordinates_locally(latitude: float, longitude: float) ->
     Returns:
         list[Dict]: Lista de imóveis que interceptam a coordenada fornecida.
     """
-    cursor = conn.cursor()
-    
-    try:
-        dataset_path = str(Path.cwd() / 'data' / 'car-br-dataset' / '**' / '*.parquet')
-        
-        query = """
-            SELECT *
-                EXCLUDE(geometry),
-                ST_AsGeoJSON(geometry) AS geometry
-            FROM read_parquet(?)
-            WHERE 
-                ? BETWEEN min_x AND max_x 
-                AND ? BETWEEN min_y AND max_y
-                AND ST_Intersects(geometry, ST_Point(?, ?))
-        """
-        
-        df = cursor.execute(query, [
-            dataset_path, 
-            longitude, latitude, 
-            longitude, latitude
-        ]).fetchdf()
-        
-        if df.empty:
+    cache_key = ('coordinates', round(latitude, COORDINATE_CACHE_PRECISION), round(longitude, COORDINATE_CACHE_PRECISION))
+
+    if (cached := property_cache.get(cache_key)) is not None:
+        return cached
+
+    if SICAR_BACKEND == 'strtree':
+        try:
+            result = _fetch_property_by_coordinates_strtree(latitude=latitude, longitude=longitude)
+        except Exception as e:
+            log_error(f"Erro ao buscar imóveis na árvore STRtree: {e}")
             return []
+
+        property_cache.set(cache_key, result)
+        return result
+
+    try:
+        with sicar_cursor() as cursor:
+            source, geometry, wkb = SICAR_TABLE_NAME, 'geometry', 'ST_AsWKB(geometry)::BLOB'
+
+            if not sicar_session.USE_INDEXED_DATABASE and (grid_index := _get_grid_index()) is not None:
+                candidates = grid_index.read(latitude=latitude, longitude=longitude)
+
+                if candidates is None:
+                    return []
+
+                # Os row groups lidos via Arrow trazem a geometria em WKB
+                cursor.register('grid_candidates', candidates)
+                source, geometry, wkb = 'grid_candidates', 'ST_GeomFromWKB(geometry)', 'geometry'
+
+            query = f"""
+                SELECT *
+                    EXCLUDE(geometry),
+                    {wkb} AS geometry
+                FROM {source}
+                WHERE 
+                    ? BETWEEN min_x AND max_x 
+                    AND ? BETWEEN min_y AND max_y
+                    AND ST_Intersects({geometry}, ST_Point(?, ?))
+            """
+
+            try:
+                reader = cursor.execute(query, [
+                    longitude, latitude, 
+                    longitude, latitude
+                ]).fetch_record_batch()
+
+                result = _map_batches_to_property_records(reader)
+            finally:
+                if source == 'grid_candidates':
+                    cursor.unregister('grid_candidates')
+
+        property_cache.set(cache_key, result)
             
-        records_dicts = df.to_dict('records')
-        result = [_map_row_to_property_record(row) for row in records_dicts] 
-            
-    except Exception:
+    except Exception as e:
+        log_error(f"Erro ao buscar imóveis: {e}")
         result = []
-    finally:
-        cursor.close()
+
+    return result
+
+
+def _rank_by_distance(table: pa.Table, latitude: float, longitude: float, radius: float, limit: int) -> List[Tuple[RuralProperty, float]]:
+    """
+    Ordena os candidatos pela distância (em metros) entre o ponto e o contorno de cada imóvel.
+
+    As coordenadas são projetadas em um plano local (equiretangular) centrado no ponto, o que
+    mantém o erro desprezível nas distâncias de poucos quilômetros usadas nesta busca.
+    """
+    if table.num_rows == 0:
+        return []
+
+    geometries = shapely.from_wkb(table.column('geometry').to_numpy(zero_copy_only=False))
+    scale = np.array([METERS_PER_DEGREE * np.cos(np.radians(latitude)), METERS_PER_DEGREE])
+
+    projected = shapely.transform(geometries, lambda coords: (coords - [longitude, latitude]) * scale)
+    distances = shapely.distance(projected, shapely.Point(0, 0))
+
+    order = [int(index) for index in np.argsort(distances, kind='stable') if distances[index] <= radius][:limit]
+    properties = _map_batches_to_property_records(table.take(pa.array(order, type=pa.int64())))
+
+    return [(prop, round(float(distances[index]), 1)) for prop, index in zip(properties, order)]
+
+
+def fetch_nearest_properties_locally(
+    latitude: float,
+    longitude: float,
+    radius: float = SICAR_NEAREST_RADIUS,
+    limit: int = SICAR_NEAREST_LIMIT
+    ) -> List[Tuple[RuralProperty, float]]:
+    """
+    Busca os imóveis mais próximos de um ponto dentro de um raio (KNN).
+
+    Usada quando o ponto não cai em nenhum polígono (ex: estrada ou divisa). O índice espacial
+    (RTREE no DuckDB ou STRtree) seleciona os imóveis cujo bbox intercepta o quadrado do raio,
+    e apenas esses candidatos têm a distância exata calculada.
+
+    Args:
+        latitude (float): Latitude do ponto de busca (Eixo Y).
+        longitude (float): Longitude do ponto de busca (Eixo X).
+        radius (float): Raio máximo de busca, em metros.
+        limit (int): Quantidade máxima de imóveis retornados.
+
+    Returns:
+        List[Tuple[RuralProperty, float]]: Imóveis e suas distâncias (em metros), do mais próximo ao mais distante.
+    """
+    cache_key = ('nearest', round(latitude, COORDINATE_CACHE_PRECISION), round(longitude, COORDINATE_CACHE_PRECISION), radius, limit)
+
+    if (cached := property_cache.get(cache_key)) is not None:
+        return cached
+
+    delta_y = radius / METERS_PER_DEGREE
+    delta_x = delta_y / max(np.cos(np.radians(latitude)), 1e-6)
+    min_x, min_y, max_x, max_y = longitude - delta_x, latitude - delta_y, longitude + delta_x, latitude + delta_y
+
+    try:
+        if SICAR_BACKEND == 'strtree':
+            strtree_index = _get_strtree_index()
+            candidates = strtree_index.rows(strtree_index.query_bbox(min_x, min_y, max_x, max_y))
+        else:
+            query = f"""
+                SELECT *
+                    EXCLUDE(geometry),
+                    ST_AsWKB(geometry)::BLOB AS geometry
+                FROM {SICAR_TABLE_NAME}
+                WHERE
+                    ST_Intersects(geometry, ST_MakeEnvelope(?, ?, ?, ?))
+                    AND max_x >= ? AND min_x <= ?
+                    AND max_y >= ? AND min_y <= ?
+            """
+
+            with sicar_cursor() as cursor:
+                candidates = cursor.execute(query, [
+                    min_x, min_y, max_x, max_y,
+                    min_x, max_x,
+                    min_y, max_y
+                ]).fetch_arrow_table()
+
+        result = _rank_by_distance(candidates, latitude=latitude, longitude=longitude, radius=radius, limit=limit)
+
+    except Exception as e:
+        log_error(f"Erro ao buscar imóveis próximos: {e}")
+        return []
+
+    property_cache.set(cache_key, result)
+
+    return result
+
+
+def fetch_properties_by_car_bulk(car_codes: List[str]) -> Dict[str, RuralProperty]:
+    """
+    Resolve uma lista de códigos CAR com uma única consulta.
+
+    Os códigos ainda fora do cache são registrados como tabela temporária (Arrow) e unidos
+    à tabela do CAR; o DuckDB empurra o filtro da junção para o índice ART de `cod_imovel`.
+
+    Args:
+        car_codes (List[str]): Lista de códigos CAR normalizados.
+
+    Returns:
+        Dict[str, RuralProperty]: Imóveis encontrados indexados pelo código CAR. Códigos não encontrados ficam de fora.
+    """
+    result, missing = {}, []
+
+    for car_code in dict.fromkeys(car_codes):
+        cached = property_cache.get(('car', (car_code,)))
+
+        if cached is None:
+            missing.append(car_code)
+        elif cached:
+            result[car_code] = cached[0]
+
+    if not missing:
+        return result
+
+    try:
+        source, params = SICAR_TABLE_NAME, []
+        partition_files = None if sicar_session.USE_INDEXED_DATABASE else _car_partition_files(missing)
+
+        if partition_files is not None:
+            source, params = "read_parquet(?, hive_partitioning = false)", [partition_files]
+
+        query = f"""
+            SELECT p.*
+                EXCLUDE(geometry),
+                ST_AsWKB(p.geometry)::BLOB AS geometry
+            FROM bulk_car_codes b
+            JOIN {source} p USING (cod_imovel)
+        """
+
+        if partition_files == []:
+            # Dataset particionado sem a partição de nenhum dos códigos: nenhum deles existe
+            properties = []
+        else:
+            with sicar_cursor() as cursor:
+                cursor.register('bulk_car_codes', pa.table({'cod_imovel': missing}))
+
+                try:
+                    properties = _map_batches_to_property_records(cursor.execute(query, params).fetch_record_batch())
+                finally:
+                    cursor.unregister('bulk_car_codes')
+
+    except Exception as e:
+        log_error(f"Erro ao buscar imóveis em lote: {e}")
         return result
+
+    found = {prop.car_code: prop for prop in properties}
+
+    for car_code in missing:
+        property_cache.set(('car', (car_code,)), [found[car_code]] if car_code in found else [])
+
+    result.update(found)
+
+    return result
+
+
+def fetch_properties_by_coordinates_bulk(coordinates: List[Tuple[float, float]]) -> List[List[RuralProperty]]:
+    """
+    Realiza a busca ponto-em-polígono de vários pontos com uma única consulta.
+
+    Os pontos ainda fora do cache são registrados como tabela temporária (Arrow) e unidos à
+    tabela do CAR por `ST_Intersects` (junção espacial do DuckDB). Os pontos são agrupados nas
+    células de `SICAR_GRID_CELL_SIZE` graus e cada célula tem a sua parte da consulta (UNION ALL),
+    restrita pelas colunas min/max de bbox ao retângulo dos seus pontos: pontos espalhados por
+    vários estados não viram uma leitura da tabela inteira.
+
+    Args:
+        coordinates (List[Tuple[float, float]]): Pares (latitude, longitude).
+
+    Returns:
+        List[List[RuralProperty]]: Imóveis que interceptam cada ponto, na mesma ordem da entrada.
+    """
+    keys = [('coordinates', round(lat, COORDINATE_CACHE_PRECISION), round(lon, COORDINATE_CACHE_PRECISION)) for lat, lon in coordinates]
+    result = [property_cache.get(key) for key in keys]
+    pending = [index for index, cached in enumerate(result) if cached is None]
+
+    result = [cached if cached is not None else [] for cached in result]
+
+    if not pending:
+        return result
+
+    cells: Dict[Tuple[int, int], List[int]] = {}
+
+    for index in pending:
+        latitude, longitude = coordinates[index]
+        cells.setdefault((math.floor(longitude / SICAR_GRID_CELL_SIZE), math.floor(latitude / SICAR_GRID_CELL_SIZE)), []).append(index)
+
+    point_ids, cell_ids, latitudes, longitudes = [], [], [], []
+    subqueries, params = [], []
+
+    for cell_id, indexes in enumerate(cells.values()):
+        cell_latitudes = [coordinates[index][0] for index in indexes]
+        cell_longitudes = [coordinates[index][1] for index in indexes]
+
+        point_ids += indexes
+        cell_ids += [cell_id] * len(indexes)
+        latitudes += cell_latitudes
+        longitudes += cell_longitudes
+
+        subqueries.append(f"""
+            SELECT b.point_id, p.*
+                EXCLUDE(geometry),
+                ST_AsWKB(p.geometry)::BLOB AS geometry
+            FROM bulk_points b
+            JOIN {SICAR_TABLE_NAME} p
+                ON ST_Intersects(p.geometry, ST_Point(b.longitude, b.latitude))
+            WHERE
+                b.cell_id = ?
+                AND p.max_x >= ? AND p.min_x <= ?
+                AND p.max_y >= ? AND p.min_y <= ?
+        """)
+        params += [cell_id, min(cell_longitudes), max(cell_longitudes), min(cell_latitudes), max(cell_latitudes)]
+
+    try:
+        with sicar_cursor() as cursor:
+            cursor.register('bulk_points', pa.table({'point_id': point_ids, 'cell_id': cell_ids, 'latitude': latitudes, 'longitude': longitudes}))
+
+            try:
+                table = cursor.execute(" UNION ALL ".join(subqueries), params).fetch_arrow_table()
+            finally:
+                cursor.unregister('bulk_points')
+
+    except Exception as e:
+        log_error(f"Erro ao buscar imóveis em lote: {e}")
+        return result
+
+    properties = _map_batches_to_property_records(table)
+
+    for point_id, prop in zip(table.column('point_id').to_pylist(), properties):
+        result[point_id].append(prop)
+
+    for index in pending:
+        property_cache.set(keys[index], result[index])
+
+    return result
+
+
+# Retângulo (longitude e latitude mínimas e máximas) que envolve o território coberto pelo CAR, com folga
+BRAZIL_BOUNDS = (-74.5, -34.5, -28.5, 5.5)
+
+
+def parse_coordinate(pair: Sequence) -> Optional[Tuple[float, float]]:
+    """
+    Converte um par [latitude, longitude] e confere se o ponto está no território coberto pelo CAR.
+
+    Args:
+        pair (Sequence): Latitude e longitude, como números ou textos (vírgula decimal aceita).
+
+    Returns:
+        Optional[Tuple[float, float]]: Par (latitude, longitude), ou `None` se malformado ou fora do
+            Brasil (ex: par invertido [longitude, latitude]).
+    """
+    try:
+        latitude, longitude = (float(str(value).strip().replace(',', '.')) for value in pair)
+    except (TypeError, ValueError):
+        return None
+
+    min_x, min_y, max_x, max_y = BRAZIL_BOUNDS
+
+    if not (min_y <= latitude <= max_y and min_x <= longitude <= max_x):
+        return None
+
+    return latitude, longitude
+
+
+def parse_bulk_csv(content: bytes | str) -> Tuple[List[str], List[Tuple[float, float]], int]:
+    """
+    Extrai códigos CAR e pares de coordenadas de um arquivo CSV.
+
+    Aceita as colunas `car` (ou `cod_imovel`, `car_code`) e `latitude`/`longitude` (ou `lat`/`lon`),
+    separadas por vírgula, ponto e vírgula ou tabulação. Com `;` como separador, a vírgula decimal
+    também é aceita.
+
+    Args:
+        content (bytes | str): Conteúdo do arquivo CSV.
+
+    Returns:
+        Tuple: Códigos CAR, coordenadas (latitude, longitude) e a quantidade de linhas inválidas
+            (sem dados, com coordenadas malformadas ou fora do Brasil).
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+
+    header = content.split('\n', 1)[0]
+    delimiter = next((char for char in (';', '\t') if char in header), ',')
+
+    car_codes, coordinates, invalid = [], [], 0
+
+    for row in csv.DictReader(io.StringIO(content), delimiter=delimiter):
+        row = {str(key).strip().lower(): (value or '').strip() for key, value in row.items()}
+
+        car_code = row.get('car') or row.get('cod_imovel') or row.get('car_code')
+        latitude, longitude = row.get('latitude') or row.get('lat'), row.get('longitude') or row.get('lon')
+
+        if car_code:
+            car_codes.append(car_code)
+        elif latitude and longitude and (coordinate := parse_coordinate((latitude, longitude))) is not None:
+            coordinates.append(coordinate)
+        else:
+            invalid += 1
+
+    return car_codes, coordinates, invalid
+
+
+def _fetch_property_by_coordinates_strtree(latitude: float, longitude: float) -> List[RuralProperty]:
+    """
+    Busca ponto-em-polígono pelo backend STRtree (`SICAR_BACKEND=strtree`).
+
+    A árvore seleciona os candidatos pelo bbox e o teste geométrico exato é aplicado
+    somente sobre eles, sem passar pelo DuckDB.
+    """
+    strtree_index = _get_strtree_index()
+    rows = strtree_index.rows(strtree_index.query(latitude=latitude, longitude=longitude))
+
+    return _map_batches_to_property_records(rows)
     
 
 def fetch_coordinates_by_url(url: str) -> tuple[float | None, float | None]:
@@ -0,0 +1,73 @@
+import shapely
+import pyarrow as pa
+
+from pathlib import Path
+from typing import List
+
+
+class STRtreePropertyIndex:
+    """
+    Índice em memória para consultas ponto-em-polígono sobre os imóveis do CAR.
+
+    Apenas os retângulos envolventes (bbox) dos imóveis ficam na STRtree. As geometrias
+    completas permanecem em WKB dentro do arquivo Arrow memory-mapped e só são decodificadas
+    para os poucos candidatos retornados pela árvore.
+    """
+
+    def __init__(self, arrow_path: Path):
+        source = pa.memory_map(str(arrow_path), 'r')
+        self.table = pa.ipc.open_file(source).read_all()
+
+        bounds = [self.table.column(name).cast(pa.float64()).to_numpy() for name in ('min_x', 'min_y', 'max_x', 'max_y')]
+        self.tree = shapely.STRtree(shapely.box(*bounds))
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def query(self, latitude: float, longitude: float) -> List[int]:
+        """
+        Retorna os índices das linhas cujos polígonos interceptam o ponto informado.
+
+        Args:
+            latitude (float): Latitude do ponto de busca (Eixo Y).
+            longitude (float): Longitude do ponto de busca (Eixo X).
+
+        Returns:
+            List[int]: Índices das linhas da tabela Arrow.
+        """
+        candidates = self.tree.query(shapely.Point(longitude, latitude))
+
+        if len(candidates) == 0:
+            return []
+
+        geometries = shapely.from_wkb(self.table.column('geometry').take(candidates).to_pylist())
+        hits = shapely.intersects_xy(geometries, longitude, latitude)
+
+        return [int(index) for index in candidates[hits]]
+
+    def query_bbox(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[int]:
+        """
+        Retorna os índices das linhas cujo bbox intercepta o retângulo informado.
+
+        Args:
+            min_x (float): Longitude mínima do retângulo.
+            min_y (float): Latitude mínima do retângulo.
+            max_x (float): Longitude máxima do retângulo.
+            max_y (float): Latitude máxima do retângulo.
+
+        Returns:
+            List[int]: Índices das linhas da tabela Arrow.
+        """
+        return [int(index) for index in self.tree.query(shapely.box(min_x, min_y, max_x, max_y))]
+
+    def rows(self, indices: List[int]) -> pa.Table:
+        """
+        Seleciona as linhas no mesmo formato retornado pelo DuckDB (geometria em WKB).
+
+        Args:
+            indices (List[int]): Índices das linhas da tabela Arrow.
+
+        Returns:
+            pa.Table: Linhas com os atributos do imóvel e a coluna 'geometry' em WKB.
+        """
+        return self.table.take(pa.array(indices, type=pa.int64()))
@@ -0,0 +1,190 @@
+"""
+Benchmark das consultas do CAR: latência (p50/p95/p99) e pico de RSS por backend.
+
+Para cada escala (múltiplo de `--base-size`), gera o dataset sintético (já particionado, como na
+ingestão) e os artefatos (banco indexado, Arrow e índice de grade) e mede cada cenário em um
+processo separado: a configuração do CAR é lida no import e o pico de RSS é por processo.
+
+Uso:
+    python -m tests.benchmarks.sicar_lookup_benchmark --base-size 10000 --scales 1 10 100 --samples 500
+"""
+import os
+import sys
+import json
+import time
+import duckdb
+import argparse
+import resource
+import tempfile
+import statistics
+import subprocess
+
+from pathlib import Path
+
+from app.database.sicar_session import load_spatial_extension
+from tests.benchmarks.synthetic_car_dataset import generate_car_dataset
+
+
+# Cenário -> (tipo de consulta, variáveis de ambiente com caminhos relativos ao diretório da escala)
+SCENARIOS = {
+    'coordenada/duckdb': ('coordinates', {'SICAR_BACKEND': 'duckdb'}),
+    'coordenada/strtree': ('coordinates', {'SICAR_BACKEND': 'strtree'}),
+    'coordenada/parquet+grade': ('coordinates', {'SICAR_DATABASE_PATH': 'ausente.duckdb', 'SICAR_GRID_INDEX_PATH': 'car-br-grid.json'}),
+    'car/duckdb': ('car', {}),
+    'car/parquet-particionado': ('car', {'SICAR_DATABASE_PATH': 'ausente.duckdb'}),
+}
+
+BASE_ENVIRONMENT = {
+    'SICAR_DATASET_PATH': 'car-br-dataset',
+    'SICAR_DATABASE_PATH': 'car-br.duckdb',
+    'SICAR_ARROW_PATH': 'car-br.arrow',
+    'SICAR_GRID_INDEX_PATH': 'ausente.json',
+}
+
+
+def _percentile_summary(latencies: list[float]) -> dict:
+    quantiles = statistics.quantiles(latencies, n=100)
+
+    return {'p50': quantiles[49], 'p95': quantiles[94], 'p99': quantiles[98]}
+
+
+def _peak_rss_mb() -> float:
+    """
+    Pico de memória residente do processo.
+
+    No Linux usa o VmHWM, já que o `ru_maxrss` de um processo filho herda o pico do pai (fork).
+    """
+    status_path = Path('/proc/self/status')
+
+    if status_path.exists():
+        for line in status_path.read_text().splitlines():
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_worker(lookup: str, samples_path: Path):
+    """Executa as consultas no processo atual e imprime o resultado em JSON."""
+    from app.utils.scripts import sicar_scripts
+
+    samples = json.loads(samples_path.read_text())
+
+    if lookup == 'coordinates':
+        calls = [lambda point=point: sicar_scripts.fetch_property_by_coordinates_locally(latitude=point[0], longitude=point[1]) for point in samples['points']]
+    else:
+        calls = [lambda code=code: sicar_scripts.fetch_property_by_car_locally(car_codes=[code]) for code in samples['car_codes']]
+
+    # A primeira consulta inclui a abertura do banco, a extensão spatial e a carga dos índices
+    start = time.perf_counter()
+    calls[0]()
+    startup_ms = (time.perf_counter() - start) * 1000
+
+    latencies, hits = [], 0
+
+    for call in calls[1:]:
+        start = time.perf_counter()
+        hits += bool(call())
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    print(json.dumps({
+        'startup_ms': startup_ms,
+        'hit_rate': hits / len(latencies),
+        'peak_rss_mb': _peak_rss_mb(),
+        **_percentile_summary(latencies)
+    }), flush=True)
+
+
+def _prepare_scale(workdir: Path, properties: int, samples: int) -> dict:
+    """Gera o dataset e os artefatos de uma escala. Retorna o tempo de cada etapa (s)."""
+    from app.utils.scripts.sicar_dataset_scripts import build_car_database, export_car_arrow, build_grid_index
+
+    dataset_path = workdir / 'car-br-dataset'
+    steps = {
+        'dataset': lambda: generate_car_dataset(output_path=dataset_path, properties=properties),
+        'banco': lambda: build_car_database(dataset_path=dataset_path, database_path=workdir / 'car-br.duckdb'),
+        'arrow': lambda: export_car_arrow(dataset_path=dataset_path, arrow_path=workdir / 'car-br.arrow'),
+        'grade': lambda: build_grid_index(dataset_path=dataset_path, index_path=workdir / 'car-br-grid.json'),
+    }
+
+    timings = {}
+
+    for name, step in steps.items():
+        start = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - start
+
+    # 90% dos pontos caem dentro de um imóvel (ST_PointOnSurface) e 10% em locais aleatórios
+    conn = duckdb.connect(database=':memory:')
+    load_spatial_extension(conn)
+
+    rows = conn.execute(f"""
+        SELECT cod_imovel, ST_Y(ST_PointOnSurface(geometry)), ST_X(ST_PointOnSurface(geometry))
+        FROM read_parquet(?)
+        USING SAMPLE {samples} ROWS (reservoir, 42)
+    """, [str(dataset_path / '**' / '*.parquet')]).fetchall()
+
+    conn.execute("SELECT setseed(0.42)")
+    misses = conn.execute(f"SELECT -20 + random() * 15, -60 + random() * 20 FROM range({max(samples // 10, 1)})").fetchall()
+    conn.close()
+
+    (workdir / 'samples.json').write_text(json.dumps({
+        'car_codes': [row[0] for row in rows],
+        'points': [[row[1], row[2]] for row in rows[:samples - len(misses)]] + [list(point) for point in misses],
+    }))
+
+    return timings
+
+
+def _run_scenario(workdir: Path, lookup: str, overrides: dict) -> dict:
+    environment = {key: value for key, value in os.environ.items() if key != 'APP_ENV'}
+    environment.update({key: str(workdir / value) for key, value in {**BASE_ENVIRONMENT, **overrides}.items() if key != 'SICAR_BACKEND'})
+    environment.update({'SICAR_BACKEND': overrides.get('SICAR_BACKEND', 'duckdb'), 'SICAR_CACHE_SIZE': '0'})
+
+    completed = subprocess.run(
+        [sys.executable, '-m', 'tests.benchmarks.sicar_lookup_benchmark', '--worker', lookup, '--samples-file', str(workdir / 'samples.json')],
+        env=environment, capture_output=True, text=True, check=True
+    )
+
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das consultas do CAR em múltiplas escalas.")
+    parser.add_argument('--base-size', type=int, default=10_000, help="Quantidade de imóveis na escala 1x.")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--samples', type=int, default=500)
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--workdir', type=Path, default=None, help="Mantém os artefatos gerados neste diretório.")
+    parser.add_argument('--worker', choices=['coordinates', 'car'], help=argparse.SUPPRESS)
+    parser.add_argument('--samples-file', type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return _run_worker(args.worker, args.samples_file)
+
+    with tempfile.TemporaryDirectory(prefix='car-benchmark-') as tmp_dir:
+        root = args.workdir or Path(tmp_dir)
+
+        for scale in args.scales:
+            properties = args.base_size * scale
+            workdir = root / f'{scale}x'
+            workdir.mkdir(parents=True, exist_ok=True)
+
+            timings = _prepare_scale(workdir, properties=properties, samples=args.samples)
+            print(f"\n== {scale}x ({properties} imóveis) | preparo: " + ", ".join(f"{name} {seconds:.1f} s" for name, seconds in timings.items()), flush=True)
+
+            for name in args.scenarios:
+                lookup, overrides = SCENARIOS[name]
+                result = _run_scenario(workdir, lookup, overrides)
+
+                print(
+                    f"{name:>26}: início {result['startup_ms']:8.1f} ms | "
+                    f"p50 {result['p50']:7.3f} ms | p95 {result['p95']:7.3f} ms | p99 {result['p99']:7.3f} ms | "
+                    f"acertos {result['hit_rate']:4.0%} | pico RSS {result['peak_rss_mb']:7.1f} MB",
+                    flush=True
+                )
+
+
+if __name__ == "__main__":
+    main()
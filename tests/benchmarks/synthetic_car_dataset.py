@@ -0,0 +1,142 @@
+"""
+Gerador de um dataset sintético do CAR no mesmo formato do dataset real.
+
+Gera imóveis com polígonos irregulares (parte deles multipolígonos) e os grava no layout da
+ingestão (`uf=<UF>/cod_municipio=<IBGE>/`, via `write_state_partitions`), com as colunas de bbox
+`min_x`..`max_y`.
+
+Uso:
+    python -m tests.benchmarks.synthetic_car_dataset --output /tmp/car-synthetic --properties 10000
+"""
+import argparse
+import duckdb
+import shapely
+import numpy as np
+import pyarrow as pa
+
+from pathlib import Path
+
+from app.configs.sicar import SICAR_ROW_GROUP_SIZE
+from app.database.sicar_session import load_spatial_extension
+from app.utils.scripts.sicar_dataset_scripts import write_state_partitions
+
+
+# UF -> (código IBGE da UF, extensão aproximada em graus: min_x, min_y, max_x, max_y)
+STATES = {
+    'GO': (52, (-53.2, -19.4, -45.9, -12.4)),
+    'MT': (51, (-61.6, -18.0, -50.2, -7.4)),
+    'MS': (50, (-58.1, -24.0, -50.9, -17.2)),
+    'BA': (29, (-46.6, -18.3, -37.4, -8.6)),
+    'PA': (15, (-58.8, -9.8, -46.1, 2.5)),
+}
+
+MUNICIPALITIES_PER_STATE = 50
+
+# Metros por grau (aproximação usada só para dimensionar os polígonos)
+METERS_PER_DEGREE = 111_320
+
+
+def _random_polygon(rng: np.random.Generator, center_x: float, center_y: float, radius: float) -> shapely.Polygon:
+    """Polígono estrelado irregular, com 12 a 200 vértices, em torno do centro."""
+    vertices = int(rng.integers(12, 200))
+    angles = (np.arange(vertices) + rng.uniform(0, 0.9, vertices)) * 2 * np.pi / vertices
+    radii = radius * rng.uniform(0.6, 1.0, vertices)
+
+    return shapely.Polygon(np.column_stack([center_x + radii * np.cos(angles), center_y + radii * np.sin(angles)]))
+
+
+def _random_geometry(rng: np.random.Generator, center_x: float, center_y: float, area_ha: float):
+    """Imóvel com área próxima de `area_ha`; cerca de 10% deles têm de 2 a 3 glebas."""
+    radius = np.sqrt(area_ha * 10_000 / np.pi) / METERS_PER_DEGREE
+
+    if rng.random() >= 0.1:
+        return _random_polygon(rng, center_x, center_y, radius)
+
+    # Glebas alinhadas em uma direção aleatória, espaçadas o bastante para não se sobreporem
+    parts = int(rng.integers(2, 4))
+    direction = rng.uniform(0, 2 * np.pi)
+    step_x, step_y = 3 * radius * np.cos(direction), 3 * radius * np.sin(direction)
+
+    return shapely.MultiPolygon([
+        _random_polygon(rng, center_x + part * step_x, center_y + part * step_y, radius / parts)
+        for part in range(parts)
+    ])
+
+
+def generate_car_dataset(output_path: Path, properties: int, seed: int = 42) -> int:
+    """
+    Gera o dataset sintético distribuindo os imóveis entre as UFs de `STATES`.
+
+    Args:
+        output_path (Path): Diretório de destino (equivalente ao SICAR_DATASET_PATH).
+        properties (int): Quantidade total de imóveis.
+        seed (int): Semente do gerador aleatório.
+
+    Returns:
+        int: Quantidade de imóveis gravados.
+    """
+    rng = np.random.default_rng(seed)
+    output_path = Path(output_path)
+
+    conn = duckdb.connect(database=':memory:')
+    load_spatial_extension(conn)
+
+    total = 0
+
+    try:
+        for index, (uf, (state_code, (min_x, min_y, max_x, max_y))) in enumerate(STATES.items()):
+            count = properties // len(STATES) + (1 if index < properties % len(STATES) else 0)
+
+            if count == 0:
+                continue
+
+            # Áreas com distribuição log-normal (mediana ~50 ha, cauda de grandes fazendas)
+            areas = np.clip(rng.lognormal(mean=np.log(50), sigma=1.2, size=count), 1, 20_000)
+            centers_x = rng.uniform(min_x, max_x, count)
+            centers_y = rng.uniform(min_y, max_y, count)
+            municipalities = rng.integers(0, MUNICIPALITIES_PER_STATE, count)
+
+            geometries = [_random_geometry(rng, x, y, area) for x, y, area in zip(centers_x, centers_y, areas)]
+            bounds = shapely.bounds(geometries)
+
+            table = pa.table({
+                'cod_imovel': [f"{uf}-{state_code}{municipality:05d}-{rng.bytes(16).hex().upper()}" for municipality in municipalities],
+                'num_area': np.round(areas, 4),
+                'municipio': [f"Município {state_code}{municipality:05d}" for municipality in municipalities],
+                'ind_tipo': rng.choice(['IRU', 'AST', 'PCT'], count, p=[0.9, 0.07, 0.03]),
+                'ind_status': rng.choice(['AT', 'PE', 'SU', 'CA'], count, p=[0.7, 0.2, 0.07, 0.03]),
+                'dat_atuali': ['26/02/2021'] * count,
+                'dat_criaca': ['26/02/2021'] * count,
+                'min_x': bounds[:, 0], 'max_x': bounds[:, 2],
+                'min_y': bounds[:, 1], 'max_y': bounds[:, 3],
+                'geometry': shapely.to_wkb(geometries),
+            })
+
+            conn.register('synthetic_properties', table)
+            conn.execute("""
+                CREATE OR REPLACE TEMP TABLE synthetic_state AS
+                SELECT * EXCLUDE(geometry), ST_GeomFromWKB(geometry) AS geometry
+                FROM synthetic_properties
+            """)
+            conn.unregister('synthetic_properties')
+
+            total += write_state_partitions(conn, 'synthetic_state', uf, output_path, SICAR_ROW_GROUP_SIZE)
+    finally:
+        conn.close()
+
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um dataset sintético do CAR (GeoParquet particionado por UF e município).")
+    parser.add_argument('--output', type=Path, required=True)
+    parser.add_argument('--properties', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    total = generate_car_dataset(output_path=args.output, properties=args.properties, seed=args.seed)
+    print(f"✅ {total} imóveis sintéticos gravados em {args.output}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import duckdb
+
+from tests.benchmarks.synthetic_car_dataset import generate_car_dataset, STATES
+
+
+def test_generate_car_dataset_writes_state_partitions_with_bbox(tmp_path):
+    """Testa se o gerador grava as partições de UF com bbox coerente e geometrias válidas."""
+    total = generate_car_dataset(output_path=tmp_path, properties=50)
+
+    assert total == 50
+    assert {path.parent.parent.name for path in tmp_path.glob('*/*/*.parquet')} == {f'uf={uf}' for uf in STATES}
+
+    conn = duckdb.connect()
+    conn.execute("LOAD spatial;")
+    row = conn.execute(f"""
+        SELECT
+            count(*),
+            bool_and(ST_IsValid(geometry)),
+            bool_and(abs(ST_XMin(geometry) - min_x) < 1e-9 AND abs(ST_YMax(geometry) - max_y) < 1e-9)
+        FROM read_parquet('{tmp_path / '**' / '*.parquet'}')
+    """).fetchone()
+    conn.close()
+
+    assert row == (50, True, True)
@@ -0,0 +1,110 @@
+"""
+Gerador de rasters sintéticos (COG) no formato esperado pelo backend local de estatísticas.
+
+Gera os arquivos de `RASTER_FILES` (biomassa, idade, vigor, uso do solo e DEM) em EPSG:4326 com
+pixels de ~30 m, uma banda por ano nomeada como no GEE (ex: 'biomass_2024') e padrões conhecidos,
+para que os resultados possam ser conferidos:
+
+- biomassa: constante em cada ano (`year - 1900`);
+- idade: metade oeste com 5 anos (205, classe 1) e metade leste com 40 anos ou mais (100, classe 4);
+- vigor: metade norte alto (3) e metade sul baixo (1);
+- uso do solo: pastagem (15), com uma faixa de rio (33) nos 10% ao sul;
+- DEM: plano inclinado para leste com declividade de `DEM_SLOPE` (m/m) a partir de `DEM_BASE` metros.
+
+Uso:
+    python -m tests.benchmarks.synthetic_rasters --output /tmp/rasters
+"""
+import math
+import argparse
+import rasterio
+import numpy as np
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from rasterio.transform import from_origin
+
+from app.utils.scripts.raster_stats_scripts import RASTER_FILES, EARTH_RADIUS
+
+
+# Resolução dos rasters do MapBiomas (1 arco-segundo, ~30 m)
+RESOLUTION = 1 / 3600
+
+DEM_BASE = 500.0
+DEM_SLOPE = 0.1
+
+
+def _write(path: Path, bands: Dict[str, np.ndarray], transform, nodata):
+    first = next(iter(bands.values()))
+
+    with rasterio.open(
+        path, 'w', driver='COG', width=first.shape[1], height=first.shape[0], count=len(bands),
+        dtype=first.dtype, crs='EPSG:4326', transform=transform, nodata=nodata, compress='deflate'
+    ) as dataset:
+        for index, (name, values) in enumerate(bands.items(), start=1):
+            dataset.write(values, index)
+            dataset.set_band_description(index, name)
+
+        dataset.update_tags(version='1')
+
+
+def generate_rasters(output_path: Path, bounds: Tuple[float, float, float, float], years: List[int]) -> Dict[str, Path]:
+    """
+    Gera os rasters sintéticos cobrindo o retângulo informado.
+
+    Args:
+        output_path (Path): Diretório de destino (equivalente ao GEE_LOCAL_RASTER_PATH).
+        bounds (Tuple[float, float, float, float]): Longitude e latitude mínimas e máximas.
+        years (List[int]): Anos das bandas de biomassa, idade, vigor e uso do solo.
+
+    Returns:
+        Dict[str, Path]: Caminho de cada raster, indexado pelo nome da camada.
+    """
+    output_path = Path(output_path)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    min_x, min_y, max_x, max_y = bounds
+    width = math.ceil((max_x - min_x) / RESOLUTION)
+    height = math.ceil((max_y - min_y) / RESOLUTION)
+    transform = from_origin(min_x, max_y, RESOLUTION, RESOLUTION)
+
+    columns = np.broadcast_to(np.arange(width), (height, width))
+    rows = np.broadcast_to(np.arange(height)[:, None], (height, width))
+
+    age = np.where(columns < width // 2, 205, 100).astype(np.int16)
+    vigor = np.where(rows < height // 2, 3, 1).astype(np.int16)
+    lulc = np.where(rows >= height * 0.9, 33, 15).astype(np.int16)
+
+    layers = {
+        'biomass': {f'biomass_{year}': np.full((height, width), year - 1900, dtype=np.int16) for year in years},
+        'age': {f'age_{year}': age for year in years},
+        'vigor': {f'vigor_{year}': vigor for year in years},
+        'integration': {f'classification_{year}': lulc for year in years},
+    }
+
+    for name, bands in layers.items():
+        _write(output_path / RASTER_FILES[name], bands, transform, nodata=0)
+
+    # Distância (m) de cada coluna até a borda oeste, na latitude de cada linha
+    latitudes = np.radians(max_y - (np.arange(height) + 0.5) * RESOLUTION)
+    east = (columns + 0.5) * EARTH_RADIUS * math.radians(RESOLUTION) * np.cos(latitudes)[:, None]
+    dem = (DEM_BASE + DEM_SLOPE * east).astype(np.float32)
+
+    _write(output_path / RASTER_FILES['dem'], {'DEM': dem}, transform, nodata=-9999)
+
+    return {name: output_path / file_name for name, file_name in RASTER_FILES.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera rasters sintéticos (COG) para o backend local de estatísticas.")
+    parser.add_argument('--output', type=Path, required=True)
+    parser.add_argument('--bounds', type=float, nargs=4, default=[-49.6, -16.6, -49.5, -16.5], metavar=('MIN_X', 'MIN_Y', 'MAX_X', 'MAX_Y'))
+    parser.add_argument('--years', type=int, nargs='+', default=list(range(2020, 2025)))
+    args = parser.parse_args()
+
+    paths = generate_rasters(output_path=args.output, bounds=tuple(args.bounds), years=args.years)
+    print(f"✅ {len(paths)} rasters sintéticos gravados em {args.output}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
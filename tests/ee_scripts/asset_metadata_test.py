@@ -0,0 +1,46 @@
+import pytest
+
+from app.utils.interfaces.asset_metadata import AssetMetadata
+from app.utils.scripts.gee_scripts import AssetMetadataRegistry
+
+
+class StaticRegistry(AssetMetadataRegistry):
+    """Registro que devolve metadados fixos no lugar da consulta ao GEE."""
+
+    def __init__(self, ttl: float):
+        super().__init__({'biomass': ('biomass-asset', False)}, ttl=ttl)
+        self.resolutions = 0
+        self.fail = False
+
+    def _resolve(self):
+        if self.fail:
+            raise RuntimeError("GEE indisponível")
+
+        self.resolutions += 1
+        return {'biomass': AssetMetadata.from_bands('biomass-asset', [f'biomass_{year}' for year in range(2000, 2025)])}
+
+
+def test_asset_metadata_maps_years_to_bands():
+    """Testa a identificação dos anos pelo sufixo das bandas e a validação do intervalo."""
+    metadata = AssetMetadata.from_bands('asset', ['biomass_2000', 'biomass_2001', 'biomass_2024'])
+
+    assert (metadata.min_year, metadata.max_year) == (2000, 2024)
+    assert metadata.band(2001) == 'biomass_2001'
+
+    with pytest.raises(ValueError, match="entre 2000 e 2024"):
+        metadata.band(2025)
+
+
+def test_asset_metadata_registry_resolves_once_and_keeps_stale_on_failure():
+    """Testa que os metadados são consultados uma vez por TTL e mantidos se a renovação falhar."""
+    registry = StaticRegistry(ttl=60)
+
+    assert registry.get('biomass').max_year == 2024
+    assert registry.get('biomass').min_year == 2000
+    assert registry.resolutions == 1
+
+    registry.ttl = -1
+    registry._expires_at = 0
+    registry.fail = True
+
+    assert registry.get('biomass').max_year == 2024
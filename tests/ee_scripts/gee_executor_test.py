@@ -0,0 +1,84 @@
+import time
+import asyncio
+import inspect
+import pytest
+
+from types import SimpleNamespace
+
+from app.hooks.tool_hooks import avalidate_selected_property_hook
+from app.tools.property_analyst_tools import property_analyst_toolkit, PROPERTY_ANALYST_TOOLS
+from app.utils.scheduler import RequestScheduler, BACKGROUND, INTERACTIVE
+from app.utils.scripts.gee_scripts import run_in_gee_executor
+
+
+def test_gee_executor_keeps_event_loop_responsive_and_times_out():
+    """Testa se a chamada bloqueante roda fora do event loop e se o timeout é convertido em erro para o LLM."""
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        result = await run_in_gee_executor(time.sleep, 0.2)
+
+        with pytest.raises(RuntimeError, match="demorou mais que o esperado"):
+            await run_in_gee_executor(time.sleep, 1, timeout=0.05)
+
+        task.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(scenario())
+
+    assert result is None
+    assert ticks >= 10
+
+
+def test_gee_executor_keeps_the_scheduler_lane_of_the_caller():
+    """Testa se a chamada submetida dentro de `lane(BACKGROUND)` consome a cota pela fila de segundo plano."""
+    scheduler = RequestScheduler(rate=10, burst=5)
+
+    async def scenario():
+        with scheduler.lane(BACKGROUND):
+            await run_in_gee_executor(scheduler.acquire)
+
+        await run_in_gee_executor(scheduler.acquire)
+
+    asyncio.run(scenario())
+
+    assert scheduler.stats()['granted'] == {INTERACTIVE: 1, BACKGROUND: 1}
+
+
+def test_toolkit_registers_async_variants_guarded_by_the_async_hook():
+    """Testa se cada ferramenta de análise tem a variante assíncrona, com o hook assíncrono de validação."""
+    sync_functions = property_analyst_toolkit.get_functions()
+    async_functions = property_analyst_toolkit.get_async_functions()
+
+    assert list(async_functions) == [sync_tool.name for sync_tool in PROPERTY_ANALYST_TOOLS]
+
+    for name, function in async_functions.items():
+        assert inspect.iscoroutinefunction(function.entrypoint)
+        assert not inspect.iscoroutinefunction(sync_functions[name].entrypoint)
+        assert function.tool_hooks == [avalidate_selected_property_hook]
+
+
+def test_async_hook_blocks_the_call_without_a_selected_property():
+    """Testa se o hook assíncrono só aguarda a ferramenta quando há uma propriedade cadastrada."""
+    calls = []
+
+    async def analysis(car_codes):
+        calls.append(car_codes)
+        return 'ok'
+
+    async def scenario(session_state):
+        run_context = SimpleNamespace(session_state=session_state)
+        return await avalidate_selected_property_hook(run_context, analysis, {'car_codes': ['GO-1']})
+
+    assert "não há uma propriedade selecionada" in asyncio.run(scenario({}))
+    assert calls == []
+
+    assert asyncio.run(scenario({'registered_properties': []})) == 'ok'
+    assert calls == [['GO-1']]
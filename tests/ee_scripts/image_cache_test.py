@@ -0,0 +1,38 @@
+import PIL.Image
+import pytest
+
+from app.utils.cache import DiskLRUCache
+from app.utils.scripts import gee_scripts
+from app.utils.scripts.gee_scripts import retrieve_cached_png
+
+
+COORDS = [[[[-49.0, -15.0], [-48.9, -15.0], [-48.9, -14.9], [-49.0, -14.9], [-49.0, -15.0]]]]
+
+
+def _unavailable():
+    raise RuntimeError("GEE indisponível")
+
+
+def test_cached_png_rerenders_on_version_bump_and_survives_gee_outage(tmp_path, monkeypatch):
+    """Testa que o PNG em disco é encontrado sem consultar o GEE e só é renderizado de novo quando a versão muda."""
+    monkeypatch.setattr(gee_scripts, 'image_cache', DiskLRUCache(tmp_path, max_bytes=1024 * 1024, suffix='.png'))
+    renders = []
+
+    def render(color):
+        return lambda: renders.append(color) or PIL.Image.new('RGB', (4, 4), color)
+
+    def fetch(version, color):
+        return retrieve_cached_png(COORDS, 'biomass', period=2024, dimensions=4, render=render(color), version=version)
+
+    first = fetch(lambda: '1', 'red')
+    assert fetch(lambda: '1', 'blue') == first
+    assert fetch(_unavailable, 'blue') == first
+    assert renders == ['red']
+
+    updated = fetch(lambda: '2', 'green')
+    assert updated != first
+    assert fetch(_unavailable, 'blue') == updated
+    assert renders == ['red', 'green']
+
+    with pytest.raises(RuntimeError, match="GEE indisponível"):
+        retrieve_cached_png(COORDS, 'biomass', period=2023, dimensions=4, render=render('blue'), version=_unavailable)
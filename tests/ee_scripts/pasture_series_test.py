@@ -0,0 +1,20 @@
+from app.utils.scripts.gee_scripts import _build_pasture_series, _build_pasture_stats
+
+
+def test_build_pasture_series_matches_single_year_stats():
+    """Testa se cada ano da série é montado exatamente como a estatística anual com as mesmas reduções."""
+    reductions = {
+        'biomass': {'biomass_2020': 1000.0, 'biomass_2024': 2000.0},
+        'age_2020': [{'class': 1.0, 'sum': 12.4}],
+        'vigor_2020': [{'class': 3.0, 'sum': 12.4}],
+        'lulc_2020': [{'class': 15.0, 'sum': 10.0}, {'class': 33.0, 'sum': 2.4}],
+        'age_2024': None,
+    }
+
+    series = _build_pasture_series([2020, 2024], reductions).series
+
+    assert list(series) == [2020, 2024]
+    assert series[2020] == _build_pasture_stats(2020, biomass=1000.0, age=reductions['age_2020'], vigor=reductions['vigor_2020'], lulc=reductions['lulc_2020'])
+    assert series[2020].lulc_class[1].amount.value == 2.4
+    assert series[2024].biomass.amount.value == 2000.0 * 0.09
+    assert series[2024].age == [] and series[2024].lulc_class == []
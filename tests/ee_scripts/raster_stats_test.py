@@ -0,0 +1,65 @@
+import math
+import rasterio
+
+import pytest
+
+from pathlib import Path
+
+from app.utils.scripts.raster_stats_scripts import LocalRasterStats, EARTH_RADIUS
+from tests.benchmarks.synthetic_rasters import generate_rasters, DEM_BASE, DEM_SLOPE
+
+
+# Imóvel quadrado no centro dos rasters, metade em cada classe de idade e de vigor
+FARM = [[[[-49.58, -16.58], [-49.52, -16.58], [-49.52, -16.52], [-49.58, -16.52], [-49.58, -16.58]]]]
+
+
+@pytest.fixture(scope='module')
+def raster_stats(tmp_path_factory) -> LocalRasterStats:
+    directory = tmp_path_factory.mktemp('rasters')
+    generate_rasters(directory, bounds=(-49.6, -16.6, -49.5, -16.5), years=[2023, 2024])
+
+    return LocalRasterStats(directory)
+
+
+def test_pasture_reductions_match_synthetic_layers(raster_stats):
+    """Testa a soma da biomassa e as áreas por classe contra os padrões conhecidos dos rasters sintéticos."""
+    expected_area = EARTH_RADIUS ** 2 * math.radians(0.06) * (math.sin(math.radians(-16.52)) - math.sin(math.radians(-16.58))) / 10_000
+
+    reductions = raster_stats.pasture_reductions(FARM, years=[2023, 2024])
+    lulc = reductions[2024]['lulc']
+    age = {group['class']: group['sum'] for group in reductions[2024]['age']}
+    vigor = {group['class']: group['sum'] for group in reductions[2024]['vigor']}
+
+    assert [group['class'] for group in lulc] == [15.0]
+    assert lulc[0]['sum'] == pytest.approx(expected_area, rel=0.01)
+    assert age[1.0] == pytest.approx(expected_area / 2, rel=0.02) and age[4.0] == pytest.approx(expected_area / 2, rel=0.02)
+    assert vigor[1.0] == pytest.approx(vigor[3.0], rel=0.02)
+
+    # Biomassa constante por ano: a soma é o valor do pixel vezes a quantidade de pixels
+    assert reductions[2023]['biomass'] / 123 == pytest.approx(reductions[2024]['biomass'] / 124)
+
+    with pytest.raises(ValueError, match="entre 2023 e 2024"):
+        raster_stats.pasture_reductions(FARM, years=[2020])
+
+
+def test_topographic_reductions_recover_plane_slope(raster_stats):
+    """Testa se a declividade média do plano sintético é recuperada e a altitude fica no centro do imóvel."""
+    elevation, slope = raster_stats.topographic_reductions(FARM)
+
+    center_east = EARTH_RADIUS * math.radians(-49.55 + 49.6) * math.cos(math.radians(-16.55))
+
+    assert slope == pytest.approx(math.degrees(math.atan(DEM_SLOPE)), abs=0.05)
+    assert elevation == pytest.approx(DEM_BASE + DEM_SLOPE * center_east, abs=5)
+
+
+def test_rasters_are_opened_once_per_layer(raster_stats, monkeypatch):
+    """Testa se os arquivos abertos são reaproveitados entre as consultas, em vez de reabertos a cada pedido."""
+    opened = []
+    original_open = rasterio.open
+    monkeypatch.setattr(rasterio, 'open', lambda path, *args, **kwargs: opened.append(Path(path).name) or original_open(path, *args, **kwargs))
+
+    stats = LocalRasterStats(raster_stats.directory)
+    stats.pasture_reductions(FARM, years=[2024])
+    stats.pasture_reductions(FARM, years=[2023])
+
+    assert sorted(opened) == ['age.tif', 'biomass.tif', 'integration.tif', 'vigor.tif']
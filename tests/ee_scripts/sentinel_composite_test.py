@@ -0,0 +1,80 @@
+import datetime
+import threading
+
+from app.utils.scripts.sentinel_composite_scripts import SentinelCompositeService, region_tiles, rolling_period, tile_names
+
+
+class StaticCompositeService(SentinelCompositeService):
+    """Serviço que registra a origem dos mosaicos no lugar das chamadas ao GEE."""
+
+    def __init__(self, exported):
+        super().__init__(tile_size=1.0, asset_id='users/teste/s2')
+        self.static_exported = exported
+        self.built = []
+
+    def _resolve_exported(self):
+        return self.static_exported
+
+    def _build_from_exported(self, names, period):
+        self.built.append(('exported', names, period))
+        return object()
+
+    def _build_from_collection(self, region, period):
+        self.built.append(('collection', region, period))
+        return object()
+
+
+FARM = [[[[-49.8, -16.7], [-49.6, -16.7], [-49.6, -16.5], [-49.8, -16.7]]]]
+
+
+def test_region_tiles_cover_geometry_on_fixed_grid():
+    """Testa se imóveis na mesma célula compartilham a região e se a região cobre todas as glebas."""
+    neighbour = [[[[-49.3, -16.2], [-49.2, -16.2], [-49.2, -16.1], [-49.3, -16.2]]]]
+    split = FARM + [[[[-48.5, -15.5], [-48.4, -15.5], [-48.4, -15.4], [-48.5, -15.5]]]]
+
+    assert region_tiles(FARM) == region_tiles(neighbour) == (-50, -17, -50, -17)
+    assert tile_names(region_tiles(split)) == ['-50_-17', '-50_-16', '-49_-17', '-49_-16']
+    assert rolling_period(datetime.date(2026, 3, 15)) == ('2025-03', 12)
+
+
+def test_composite_uses_exported_mosaic_only_when_every_tile_is_available(monkeypatch):
+    """Testa o uso do mosaico exportado da região e, sem ele, a mediana filtrada pelo próprio imóvel."""
+    monkeypatch.setattr('ee.Geometry.MultiPolygon', lambda coords: ('roi', coords))
+
+    service = StaticCompositeService(exported={('-50_-17', '2024-01_12m')})
+
+    service.composite(FARM, ('2024-01', 12))
+    service.composite(FARM, ('2025-03', 12))
+
+    assert service.built == [
+        ('exported', ['-50_-17'], ('2024-01', 12)),
+        ('collection', ('roi', FARM), ('2025-03', 12)),
+    ]
+    assert service.stats() == {'exported_hits': 1, 'collection_builds': 1}
+
+
+def test_exported_list_refresh_does_not_block_other_readers():
+    """Testa que, durante a renovação lenta da lista, as demais chamadas seguem com a lista anterior."""
+    service = StaticCompositeService(exported={('-50_-17', '2024-01_12m')})
+    assert service.exported() == {('-50_-17', '2024-01_12m')}
+
+    started, release = threading.Event(), threading.Event()
+
+    def slow_resolve():
+        started.set()
+        release.wait(5)
+        return {('-50_-17', '2025-03_12m')}
+
+    service._resolve_exported = slow_resolve
+    service._exported_expires_at = 1.0
+
+    refresher = threading.Thread(target=service.exported)
+    refresher.start()
+    started.wait(5)
+
+    assert service.exported() == {('-50_-17', '2024-01_12m')}
+
+    release.set()
+    refresher.join()
+
+    assert service.exported() == {('-50_-17', '2025-03_12m')}
@@ -0,0 +1,31 @@
+import duckdb
+import pytest
+
+
+@pytest.fixture
+def car_dataset(tmp_path):
+    """Gera um dataset Parquet mínimo com dois imóveis quadrados no padrão do CAR."""
+    dataset_path = tmp_path / 'car-br-dataset' / 'GO'
+    dataset_path.mkdir(parents=True)
+
+    conn = duckdb.connect()
+    conn.execute("INSTALL spatial; LOAD spatial;")
+    conn.execute(f"""
+        COPY (
+            SELECT
+                'GO-5211800-' || lpad(i::VARCHAR, 32, '0') AS cod_imovel,
+                10.0 AS num_area,
+                'Jaraguá' AS municipio,
+                'IRU' AS ind_tipo,
+                'AT' AS ind_status,
+                '26/02/2021' AS dat_atuali,
+                '26/02/2021' AS dat_criaca,
+                (-49.0 + i)::DOUBLE AS min_x, (-48.9 + i)::DOUBLE AS max_x,
+                -15.0::DOUBLE AS min_y, -14.9::DOUBLE AS max_y,
+                ST_MakeEnvelope(-49.0 + i, -15.0, -48.9 + i, -14.9) AS geometry
+            FROM range(2) t(i)
+        ) TO '{dataset_path / 'part-0.parquet'}' (FORMAT PARQUET)
+    """)
+    conn.close()
+
+    return tmp_path / 'car-br-dataset'
@@ -0,0 +1,47 @@
+from app.database import sicar_session
+from app.utils.scripts import sicar_scripts
+from app.utils.scripts.sicar_scripts import parse_bulk_csv, parse_coordinate
+from app.utils.scripts.sicar_dataset_scripts import build_car_database
+
+
+def test_parse_bulk_csv_reads_codes_and_coordinates():
+    """Testa a leitura de códigos CAR e coordenadas (vírgula decimal com separador ';')."""
+    content = (
+        "﻿CAR;Latitude;Longitude\n"
+        "GO-5211800-E85CBBBF7DA34628BCA06B78357D39F6;;\n"
+        ";-15,82994;-49,43353\n"
+        ";abc;-49,1\n"
+        ";-49,43353;-15,82994\n"
+    ).encode('utf-8')
+
+    car_codes, coordinates, invalid = parse_bulk_csv(content)
+
+    assert car_codes == ['GO-5211800-E85CBBBF7DA34628BCA06B78357D39F6']
+    assert coordinates == [(-15.82994, -49.43353)]
+    assert invalid == 2
+
+
+
+def test_parse_coordinate_rejects_malformed_and_swapped_pairs():
+    """Testa a conversão dos pares informados pelo agente e a recusa de pares malformados ou invertidos."""
+    assert parse_coordinate([-15.82994, -49.43353]) == (-15.82994, -49.43353)
+    assert parse_coordinate(['-15,82994', '-49.43353']) == (-15.82994, -49.43353)
+    assert parse_coordinate([-49.43353, -15.82994]) is None
+    assert parse_coordinate([-15.82994]) is None
+    assert parse_coordinate(['abc', -49.4]) is None
+
+def test_fetch_properties_by_coordinates_bulk_queries_each_cell(car_dataset, tmp_path, monkeypatch):
+    """Testa a busca em lote de pontos em células distintas, incluindo um ponto fora de qualquer imóvel."""
+    database_path = tmp_path / 'car-br.duckdb'
+    build_car_database(dataset_path=car_dataset, database_path=database_path)
+
+    monkeypatch.setattr(sicar_session, 'SICAR_DATABASE_PATH', database_path)
+    sicar_session.reset_sicar_connection()
+    sicar_scripts.property_cache.clear()
+
+    try:
+        result = sicar_scripts.fetch_properties_by_coordinates_bulk([(-14.95, -47.95), (0.0, 0.0), (-14.95, -48.95)])
+    finally:
+        sicar_session.reset_sicar_connection()
+
+    assert [[prop.car_code[-1] for prop in properties] for properties in result] == [['1'], [], ['0']]
@@ -0,0 +1,118 @@
+import duckdb
+import shutil
+
+from app.utils.scripts.sicar_dataset_scripts import build_car_database, build_grid_index, ingest_car_sources
+from app.database import sicar_session
+from app.utils.scripts import sicar_scripts
+from app.utils.scripts.sicar_grid_scripts import GridTileIndex
+
+
+def test_build_car_database_creates_indexed_table(car_dataset, tmp_path):
+    """Testa se o banco persistente é criado com os índices RTREE e ART."""
+    database_path = tmp_path / 'car-br.duckdb'
+
+    total = build_car_database(dataset_path=car_dataset, database_path=database_path)
+
+    assert total == 2
+    assert database_path.exists()
+
+    conn = duckdb.connect(str(database_path), read_only=True)
+    conn.execute("LOAD spatial;")
+    indexes = {row[0] for row in conn.execute("SELECT index_name FROM duckdb_indexes()").fetchall()}
+
+    assert 'car_properties_geometry_idx' in indexes
+    assert 'car_properties_cod_imovel_idx' in indexes
+
+    columns = {row[0] for row in conn.execute("DESCRIBE car_properties").fetchall()}
+    assert {'geometry_analysis', 'geometry_thumbnail'} <= columns
+
+    plan = conn.execute("EXPLAIN SELECT cod_imovel FROM car_properties WHERE ST_Intersects(geometry, ST_Point(-48.95, -14.95))").fetchall()[0][1]
+    assert 'RTREE_INDEX_SCAN' in plan
+
+    conn.close()
+
+
+def test_grid_index_maps_cell_to_row_groups(car_dataset, tmp_path):
+    """Testa se a célula do ponto aponta para o row group do imóvel e células vazias não leem nada."""
+    index_path = tmp_path / 'car-br-grid.json'
+
+    total = build_grid_index(dataset_path=car_dataset, index_path=index_path, cell_size=0.1)
+    grid_index = GridTileIndex(index_path=index_path, dataset_path=car_dataset)
+
+    assert total > 0
+    assert grid_index.row_groups(latitude=-14.95, longitude=-48.95) == {str(car_dataset / 'GO' / 'part-0.parquet'): [0]}
+    assert grid_index.read(latitude=0.0, longitude=0.0) is None
+
+
+def test_ingest_car_sources_writes_state_partitions(car_dataset, tmp_path):
+    """Testa a conversão de um GeoPackage bruto nas partições de UF e município, sem duplicar o layout antigo."""
+    source_path = tmp_path / 'AREA_IMOVEL_GO.gpkg'
+    output_path = tmp_path / 'car-br-ingested'
+
+    conn = duckdb.connect()
+    conn.execute("LOAD spatial;")
+    conn.execute(f"""
+        COPY (SELECT * EXCLUDE(min_x, max_x, min_y, max_y) REPLACE (num_area::DOUBLE AS num_area) FROM read_parquet('{car_dataset / 'GO' / 'part-0.parquet'}'))
+        TO '{source_path}' (FORMAT GDAL, DRIVER 'GPKG')
+    """)
+
+    # Pasta do layout antigo (sem partições), substituída pela ingestão da UF
+    (output_path / 'GO').mkdir(parents=True)
+    shutil.copy(car_dataset / 'GO' / 'part-0.parquet', output_path / 'GO' / 'part-0.parquet')
+
+    assert ingest_car_sources(sources=[source_path], dataset_path=output_path) == {'GO': 2}
+    assert ingest_car_sources(sources=[source_path], dataset_path=output_path) == {}
+
+    assert [path.relative_to(output_path).parts[:2] for path in output_path.glob('**/*.parquet')] == [('uf=GO', 'cod_municipio=5211800')]
+
+    row = conn.execute(f"SELECT count(*), min(min_x), max(max_x), any_value(uf) FROM read_parquet('{output_path / '**' / '*.parquet'}')").fetchone()
+    conn.close()
+
+    assert row == (2, -49.0, -47.9, 'GO')
+
+
+def test_car_partition_files_skips_scan_for_missing_partition(car_dataset, tmp_path, monkeypatch):
+    """Testa que, no dataset particionado, um código sem partição resolve para nenhum arquivo (e não para a varredura completa)."""
+    partitioned_path = tmp_path / 'car-br-partitioned'
+    (partitioned_path / 'uf=GO' / 'cod_municipio=5211800').mkdir(parents=True)
+    shutil.copy(car_dataset / 'GO' / 'part-0.parquet', partitioned_path / 'uf=GO' / 'cod_municipio=5211800' / 'data_0.parquet')
+
+    monkeypatch.setattr(sicar_scripts, 'SICAR_DATASET_PATH', partitioned_path)
+
+    assert sicar_scripts._car_partition_files(['GO-5211800-' + '0' * 32]) == [str(partitioned_path / 'uf=GO' / 'cod_municipio=5211800' / 'data_0.parquet')]
+    assert sicar_scripts._car_partition_files(['MT-5100102-' + '0' * 32]) == []
+
+    # Dataset sem partições: cabe ao chamador consultar a view completa
+    monkeypatch.setattr(sicar_scripts, 'SICAR_DATASET_PATH', car_dataset)
+
+    assert sicar_scripts._car_partition_files(['MT-5100102-' + '0' * 32]) is None
+
+
+def test_reset_sicar_connection_reopens_rebuilt_database(car_dataset, tmp_path, monkeypatch):
+    """Testa que, após um novo build, a conexão reaberta enxerga o banco novo (e não a instância antiga do DuckDB)."""
+    database_path = tmp_path / 'car-br.duckdb'
+    build_car_database(dataset_path=car_dataset, database_path=database_path)
+
+    monkeypatch.setattr(sicar_session, 'SICAR_DATABASE_PATH', database_path)
+    sicar_session.reset_sicar_connection()
+
+    count = "SELECT count(*) FROM car_properties"
+
+    with sicar_session.sicar_cursor() as cursor:
+        assert cursor.execute(count).fetchone()[0] == 2
+
+    single_path = tmp_path / 'car-br-single' / 'GO'
+    single_path.mkdir(parents=True)
+
+    conn = duckdb.connect()
+    conn.execute("LOAD spatial;")
+    conn.execute(f"COPY (SELECT * FROM read_parquet('{car_dataset / 'GO' / 'part-0.parquet'}') LIMIT 1) TO '{single_path / 'part-0.parquet'}' (FORMAT PARQUET)")
+    conn.close()
+
+    build_car_database(dataset_path=single_path.parent, database_path=database_path)
+    sicar_session.reset_sicar_connection()
+
+    with sicar_session.sicar_cursor() as cursor:
+        assert cursor.execute(count).fetchone()[0] == 1
+
+    sicar_session.reset_sicar_connection()
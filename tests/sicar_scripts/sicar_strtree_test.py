@@ -0,0 +1,32 @@
+from app.utils.scripts.sicar_dataset_scripts import export_car_arrow
+from app.utils.scripts.sicar_strtree_scripts import STRtreePropertyIndex
+
+
+def test_strtree_index_returns_only_containing_property(car_dataset, tmp_path):
+    """Testa se o backend STRtree aplica o teste exato sobre os candidatos do bbox."""
+    arrow_path = tmp_path / 'car-br.arrow'
+    export_car_arrow(dataset_path=car_dataset, arrow_path=arrow_path)
+
+    strtree_index = STRtreePropertyIndex(arrow_path)
+
+    assert len(strtree_index) == 2
+
+    rows = strtree_index.rows(strtree_index.query(latitude=-14.95, longitude=-47.95))
+
+    assert rows.column('cod_imovel').to_pylist() == ['GO-5211800-' + '1'.zfill(32)]
+
+    assert strtree_index.query(latitude=0.0, longitude=0.0) == []
+
+
+def test_strtree_index_bbox_query_selects_nearby_candidates(car_dataset, tmp_path):
+    """Testa a seleção por bbox usada na busca dos imóveis mais próximos."""
+    arrow_path = tmp_path / 'car-br.arrow'
+    export_car_arrow(dataset_path=car_dataset, arrow_path=arrow_path)
+
+    strtree_index = STRtreePropertyIndex(arrow_path)
+
+    indices = strtree_index.query_bbox(min_x=-48.91, min_y=-14.9, max_x=-48.89, max_y=-14.88)
+
+    assert strtree_index.rows(indices).column('cod_imovel').to_pylist() == ['GO-5211800-' + '0'.zfill(32)]
+
+    assert strtree_index.rows([]).num_rows == 0
@@ -0,0 +1,103 @@
+import time
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from app.utils.cache import DiskLRUCache, SingleFlight, TTLCache
+
+
+def test_ttl_cache_counts_hits_and_evicts_least_recent():
+    """Testa os contadores de acerto/falha e o descarte LRU ao atingir o limite."""
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 2, 'hit_rate': 0.5}
+
+
+def test_ttl_cache_expires_and_invalidates_on_version_change():
+    """Testa a expiração por TTL e a invalidação quando a versão dos dados muda."""
+    version = [1]
+    cache = TTLCache(maxsize=10, ttl=60, version=lambda: version[0])
+
+    cache.set('a', 1)
+    version[0] = 2
+    assert cache.get('a') is None
+
+    expired = TTLCache(maxsize=10, ttl=-1)
+    expired.set('a', 1)
+    assert expired.get('a') is None
+
+
+def test_ttl_cache_throttles_version_checks_and_copies_values():
+    """Testa que a versão é consultada no máximo uma vez por intervalo, o aviso de troca e a cópia dos valores."""
+    version, checks, changes = [1], [], []
+
+    def current_version():
+        checks.append(1)
+        return version[0]
+
+    cache = TTLCache(maxsize=10, ttl=60, version=current_version, version_interval=60, on_version_change=lambda: changes.append(1), copy=list)
+
+    cache.set('a', [1])
+    cache.get('a').append(2)
+    version[0] = 2
+
+    assert cache.get('a') == [1]
+    assert len(checks) == 1 and changes == []
+
+    cache._next_version_check = 0
+
+    assert cache.get('a') is None
+    assert changes == [1]
+
+
+def test_single_flight_shares_in_flight_execution():
+    """Testa se chamadas concorrentes com a mesma chave compartilham uma única execução."""
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(flights.do, 'key', compute)
+        started.wait(timeout=5)
+
+        followers = [pool.submit(flights.do, 'key', compute) for _ in range(3)]
+        while flights.stats()['shared'] < 3:
+            time.sleep(0.01)
+
+        release.set()
+        results = [leader.result()] + [follower.result() for follower in followers]
+
+    assert results == [42] * 4
+    assert len(calls) == 1
+    assert flights.stats() == {'executions': 1, 'shared': 3, 'in_flight': 0}
+
+
+def test_disk_lru_cache_evicts_by_size_and_survives_restart(tmp_path):
+    """Testa o descarte LRU pelo tamanho total e a reabertura do índice a partir do diretório."""
+    cache = DiskLRUCache(tmp_path, max_bytes=10, suffix='.png')
+
+    cache.set('a', b'aaaa')
+    cache.set('b', b'bbbb')
+    assert cache.get('a') == b'aaaa'
+
+    cache.set('c', b'cccc')
+
+    assert cache.get('b') is None
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'entries': 2, 'size_bytes': 8, 'hit_rate': 0.5}
+
+    reopened = DiskLRUCache(tmp_path, max_bytes=10, suffix='.png')
+    assert reopened.get('c') == b'cccc'
+    assert reopened.stats()['size_bytes'] == 8
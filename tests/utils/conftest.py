@@ -0,0 +1,23 @@
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def result_cache_db(tmp_path, monkeypatch):
+    """Aponta o cache de resultados para um banco SQLite temporário."""
+    monkeypatch.setenv('DATABASE_TYPE', 'sqlite')
+    monkeypatch.chdir(tmp_path)
+
+    from app.database import session
+    from app.utils.scripts import result_cache_scripts
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    monkeypatch.setattr(session, 'engine', engine)
+    monkeypatch.setattr(session, 'SessionLocal', sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    result_cache_scripts._ensure_table.cache_clear()
+
+    yield engine
+
+    result_cache_scripts._ensure_table.cache_clear()
@@ -0,0 +1,31 @@
+from app.utils.interfaces.property_record import GeometryTier, RuralProperty, SpatialFeatures
+
+
+# Quadrado de ~1,1 km de lado com vértices colineares a cada ~110 m nas bordas
+EDGE = [[-49.0 + i * 0.001, -15.0] for i in range(10)] + [[-48.99, -15.0 + i * 0.001] for i in range(10)]
+SQUARE = [[EDGE + [[-48.99, -14.99], [-49.0, -14.99], [-49.0, -15.0]]]]
+
+
+def _property(**tiers) -> RuralProperty:
+    return RuralProperty(
+        car_code='GO-5211800-E85CBBBF7DA34628BCA06B78357D39F6',
+        spatial_features=SpatialFeatures(total_area=121.0, coordinates=SQUARE, **tiers)
+    )
+
+
+def test_get_coords_regenerates_tiers_left_out_of_the_session_state():
+    """Testa que os tiers simplificados não vão para o model_dump e são recalculados a partir da geometria original."""
+    thumbnail = [[[[-49.0, -15.0], [-48.99, -15.0], [-48.99, -14.99], [-49.0, -15.0]]]]
+    dumped = _property(thumbnail_coordinates=thumbnail).model_dump()
+
+    assert set(dumped['spatial_features']) == {'total_area', 'municipality', 'coordinates'}
+
+    restored = RuralProperty(**dumped)
+    analysis = restored.get_coords(GeometryTier.ANALYSIS)
+
+    assert restored.get_coords() == SQUARE
+    assert analysis == [[[[-49.0, -15.0], [-48.99, -15.0], [-48.99, -14.99], [-49.0, -14.99], [-49.0, -15.0]]]]
+    assert restored.get_coords(GeometryTier.ANALYSIS) is analysis
+
+    # Tier já presente no objeto (ex: vindo do banco do CAR) é usado sem recalcular
+    assert _property(thumbnail_coordinates=thumbnail).get_coords(GeometryTier.THUMBNAIL) == thumbnail
@@ -0,0 +1,68 @@
+import pytest
+
+from app.utils.resilience import CircuitBreaker, CircuitOpenError, call_with_retry
+
+
+def test_call_with_retry_repeats_only_transient_errors():
+    """Testa se erros transitórios são repetidos e os demais são propagados na primeira tentativa."""
+    calls = []
+
+    def flaky():
+        calls.append(1)
+
+        if len(calls) < 3:
+            raise ConnectionError("429")
+
+        return 'ok'
+
+    assert call_with_retry(flaky, is_transient=lambda error: isinstance(error, ConnectionError), attempts=3, base_delay=0) == 'ok'
+    assert len(calls) == 3
+
+    with pytest.raises(ValueError):
+        call_with_retry(lambda: calls.append(1) or int('x'), is_transient=lambda error: False, attempts=3, base_delay=0)
+
+    assert len(calls) == 4
+
+
+def test_circuit_breaker_opens_and_probes_after_reset_timeout():
+    """Testa a abertura após falhas consecutivas, a recusa imediata e a chamada de teste (meio-aberto)."""
+    breaker = CircuitBreaker('teste', failure_threshold=1, reset_timeout=0)
+    failing = lambda: (_ for _ in ()).throw(TimeoutError())
+
+    with pytest.raises(TimeoutError):
+        call_with_retry(failing, is_transient=lambda error: True, attempts=2, base_delay=0, breaker=breaker)
+
+    assert breaker.state == 'open'
+
+    # Com reset_timeout=0 a próxima chamada é o teste; enquanto ele está em andamento as demais são recusadas
+    breaker.before_call()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+
+    assert breaker.stats() == {'state': 'closed', 'failures': 0, 'openings': 1, 'rejected': 1}
+
+
+def test_circuit_breaker_counts_calls_and_ignores_non_transient_errors():
+    """Testa que cada chamada conta uma falha (não cada tentativa) e que erros não transitórios não alteram o disjuntor."""
+    breaker = CircuitBreaker('teste', failure_threshold=2, reset_timeout=60)
+    failing = lambda: (_ for _ in ()).throw(ConnectionError())
+    is_transient = lambda error: isinstance(error, ConnectionError)
+
+    with pytest.raises(ConnectionError):
+        call_with_retry(failing, is_transient=is_transient, attempts=3, base_delay=0, breaker=breaker)
+
+    assert breaker.stats()['failures'] == 1
+
+    # Ex: cota local esgotada no agendador, sem contato com o serviço
+    with pytest.raises(TimeoutError):
+        call_with_retry(lambda: (_ for _ in ()).throw(TimeoutError()), is_transient=is_transient, breaker=breaker)
+
+    assert breaker.stats() == {'state': 'closed', 'failures': 1, 'openings': 0, 'rejected': 0}
+
+    with pytest.raises(ConnectionError):
+        call_with_retry(failing, is_transient=is_transient, attempts=3, base_delay=0, breaker=breaker)
+
+    assert breaker.state == 'open'
@@ -0,0 +1,144 @@
+import pytest
+
+from datetime import datetime
+from pydantic import BaseModel
+from sqlalchemy import text
+
+from app.utils.resilience import CircuitOpenError
+from app.utils.scripts.gee_scripts import AssetMetadataRegistry
+from app.utils.scripts.result_cache_scripts import cached_analysis, cached_yearly_analysis, geometry_fingerprint, stale_notice
+
+
+COORDS = [[[[-49.0, -15.0], [-48.9, -15.0], [-48.9, -14.9], [-49.0, -14.9], [-49.0, -15.0]]]]
+
+
+class Area(BaseModel):
+    hectares: float
+
+
+class UnavailableRegistry(AssetMetadataRegistry):
+    """Registro sem metadados em memória e com o GEE fora do ar."""
+
+    def __init__(self):
+        super().__init__({'biomass': ('biomass-asset', False)}, ttl=60)
+
+    def _resolve(self):
+        raise CircuitOpenError("O serviço Google Earth Engine está temporariamente indisponível.")
+
+
+def test_geometry_fingerprint_ignores_start_vertex_and_orientation():
+    """Testa se a mesma geometria gera o mesmo hash com outro vértice inicial ou sentido dos anéis."""
+    ring = [[-49.0, -15.0], [-48.9, -15.0], [-48.9, -14.9], [-49.0, -14.9], [-49.0, -15.0]]
+    rotated = ring[2:-1] + ring[:3]
+    reversed_ring = ring[::-1]
+
+    fingerprint = geometry_fingerprint([[ring]])
+
+    assert geometry_fingerprint([[rotated]]) == fingerprint
+    assert geometry_fingerprint([[reversed_ring]]) == fingerprint
+    assert geometry_fingerprint([[[[x + 0.001, y] for x, y in ring]]]) != fingerprint
+
+
+def _fail(*args):
+    raise CircuitOpenError("O serviço Google Earth Engine está temporariamente indisponível.")
+
+
+def test_cached_analysis_stores_misses_serves_hits_and_recomputes_on_version_bump(result_cache_db):
+    """Testa o ciclo no SQLite: falha que grava, acerto sem recalcular, nova versão e fallback com aviso."""
+    compute_calls = []
+
+    def compute(hectares):
+        return lambda: compute_calls.append(hectares) or Area(hectares=hectares)
+
+    assert cached_analysis(COORDS, 'area', asset_version=lambda: '1', model=Area, compute=compute(10)) == (Area(hectares=10), None)
+    assert cached_analysis(COORDS, 'area', asset_version=lambda: '1', model=Area, compute=compute(99)) == (Area(hectares=10), None)
+    assert cached_analysis(COORDS, 'area', asset_version=lambda: '2', model=Area, compute=compute(20)) == (Area(hectares=20), None)
+    assert compute_calls == [10, 20]
+
+    with result_cache_db.connect() as conn:
+        versions = conn.execute(text("SELECT asset_version FROM analysis_result_cache ORDER BY asset_version")).scalars().all()
+
+    assert versions == ['1', '2']
+
+    result, stale_since = cached_analysis(COORDS, 'area', asset_version=lambda: '3', model=Area, compute=_fail)
+
+    assert result == Area(hectares=20)
+    assert datetime.fromisoformat(stale_since).strftime('%d/%m/%Y %H:%M') in stale_notice(stale_since)
+    assert stale_notice(stale_since).startswith("ATENÇÃO")
+
+    with pytest.raises(CircuitOpenError):
+        cached_analysis(COORDS, 'other_product', asset_version=lambda: '3', model=Area, compute=_fail)
+
+    def out_of_range():
+        raise ValueError("O ano deve estar entre 2000 e 2024.")
+
+    # Erro da própria consulta não é mascarado com o resultado de outra versão
+    with pytest.raises(ValueError):
+        cached_analysis(COORDS, 'area', asset_version=lambda: '3', model=Area, compute=out_of_range)
+
+
+def test_cached_analysis_serves_stale_result_when_metadata_is_cold_and_gee_is_down(result_cache_db):
+    """Testa o fallback quando a própria versão dos assets não pode ser resolvida (metadados frios e GEE fora do ar)."""
+    cached_analysis(COORDS, 'area', asset_version=lambda: '1', model=Area, compute=lambda: Area(hectares=10))
+
+    registry = UnavailableRegistry()
+    compute_calls = []
+
+    result, stale_since = cached_analysis(
+        COORDS, 'area',
+        asset_version=lambda: registry.version('biomass'),
+        model=Area,
+        compute=lambda: compute_calls.append(1) or Area(hectares=20)
+    )
+
+    assert result == Area(hectares=10)
+    assert stale_since is not None
+    assert compute_calls == []
+
+
+def test_cached_yearly_analysis_computes_only_missing_years(result_cache_db):
+    """Testa que a série reaproveita os anos já calculados e calcula os demais de uma só vez."""
+    requested = []
+
+    def compute(years):
+        requested.append(years)
+        return {year: Area(hectares=year - 2000) for year in years}
+
+    cached_yearly_analysis(COORDS, 'area_series', years=[2020, 2021], asset_version=lambda: '1', model=Area, compute=compute)
+    series, stale_since = cached_yearly_analysis(COORDS, 'area_series', years=[2022, 2020, 2021], asset_version=lambda: '1', model=Area, compute=compute)
+
+    assert requested == [[2020, 2021], [2022]]
+    assert series == {2020: Area(hectares=20), 2021: Area(hectares=21), 2022: Area(hectares=22)}
+    assert list(series) == [2020, 2021, 2022]
+    assert stale_since is None
+
+
+def test_cached_yearly_analysis_serves_stale_years_only_when_all_are_cached(result_cache_db):
+    """Testa o fallback da série: anos já calculados em outra versão são servidos; um ano sem cache propaga o erro."""
+    compute = lambda years: {year: Area(hectares=year - 2000) for year in years}
+    cached_yearly_analysis(COORDS, 'area_series', years=[2020, 2021], asset_version=lambda: '1', model=Area, compute=compute)
+
+    series, stale_since = cached_yearly_analysis(COORDS, 'area_series', years=[2020, 2021], asset_version=lambda: '2', model=Area, compute=_fail)
+
+    assert series == {2020: Area(hectares=20), 2021: Area(hectares=21)}
+    assert stale_since is not None
+
+    with pytest.raises(CircuitOpenError):
+        cached_yearly_analysis(COORDS, 'area_series', years=[2021, 2022], asset_version=lambda: '2', model=Area, compute=_fail)
+
+
+def test_yearly_and_single_year_analyses_share_the_same_rows(result_cache_db):
+    """Testa que a série reaproveita o ano calculado pela análise anual do mesmo produto, e vice-versa."""
+    requested = []
+
+    def compute(years):
+        requested.append(years)
+        return {year: Area(hectares=year - 2000) for year in years}
+
+    cached_analysis(COORDS, 'area', year=2020, asset_version=lambda: '1', model=Area, compute=lambda: Area(hectares=20))
+    cached_yearly_analysis(COORDS, 'area', years=[2020, 2021], asset_version=lambda: '1', model=Area, compute=compute)
+
+    result, _ = cached_analysis(COORDS, 'area', year=2021, asset_version=lambda: '1', model=Area, compute=_fail)
+
+    assert requested == [[2021]]
+    assert result == Area(hectares=21)
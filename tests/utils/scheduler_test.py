@@ -0,0 +1,48 @@
+import time
+import threading
+
+import pytest
+
+from app.utils.scheduler import RequestScheduler, BACKGROUND
+
+
+def test_interactive_requests_are_served_before_background():
+    """Testa se, com a cota esgotada, a fila interativa é atendida antes da de segundo plano."""
+    scheduler = RequestScheduler(rate=20, burst=1, reserve=0)
+    scheduler.acquire()
+    order = []
+
+    def request(lane: str):
+        with scheduler.lane(lane):
+            scheduler.acquire(timeout=5)
+        order.append(lane)
+
+    background = threading.Thread(target=request, args=(BACKGROUND,))
+    background.start()
+
+    while scheduler.stats()['queued'][BACKGROUND] == 0:
+        time.sleep(0.001)
+
+    interactive = threading.Thread(target=request, args=('interactive',))
+    interactive.start()
+
+    background.join()
+    interactive.join()
+
+    stats = scheduler.stats()
+
+    assert order == ['interactive', BACKGROUND]
+    assert stats['granted'] == {'interactive': 2, BACKGROUND: 1}
+    assert stats['max_queued'][BACKGROUND] == 1
+
+
+def test_acquire_times_out_when_quota_is_exhausted():
+    """Testa o tempo limite de espera e o contador de requisições recusadas."""
+    scheduler = RequestScheduler(rate=0.1, burst=1)
+    scheduler.acquire()
+
+    with pytest.raises(TimeoutError):
+        scheduler.acquire(timeout=0.05)
+
+    assert scheduler.stats()['timeouts']['interactive'] == 1
+    assert scheduler.stats()['queued']['interactive'] == 0